@@ -1,25 +1,101 @@
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 
 # -------------------------------
 # INTERNAL MODULE IMPORTS
 # -------------------------------
 from modules.data_fetcher import (
-    get_cik_from_ticker,
-    get_company_xbrl,
+    VALUATION_TAGS,
+    get_company_facts,
     extract_series
 )
+from modules.instrumentation import Trace, profilers, span, timed
+from modules.ticker_index import get_ticker_index
 
 from modules.company_classifier import classify_company
 
 # FCFF / Operating-company modules
 from modules.base_year import get_base_year_operating_data
 from modules.fcff_projection import project_fcff
-from modules.dcf import dcf_valuation
+from modules.dcf import dcf_sensitivities, dcf_valuation
 from modules.wacc import calculate_wacc
 from modules.net_debt import get_net_debt
 from modules.equity import get_share_count
+from modules.market_data import get_market_data
+from modules.reverse_dcf import SOLVE_FOR, implied_parameter
+
+from components.performance import performance_component
+
+
+# -------------------------------
+# CACHING LAYER
+# -------------------------------
+# Resources: one shared instance per server process, never copied
+@st.cache_resource(show_spinner=False)
+def load_ticker_index():
+    return get_ticker_index()
+
+
+@timed
+def load_facts(cik: str):
+    # Read-only FactIndex shared by all sessions through the byte-bounded
+    # process-wide fact cache (modules.fact_cache), which also coalesces
+    # concurrent loads; the SEC disk cache underneath decides when the
+    # filing itself is re-downloaded
+    with st.spinner("Loading SEC 10-K facts..."):
+        return get_company_facts(cik, tags=VALUATION_TAGS)
+
+
+# Data: keyed by CIK + latest 10-K accession, so a new filing invalidates them
+@timed
+@st.cache_data(show_spinner=False)
+def load_company_type(cik: str, accession: str, _facts) -> str:
+    return classify_company(_facts, extract_series)
+
+
+@timed
+@st.cache_data(show_spinner=False)
+def load_base_year(cik: str, accession: str, _facts) -> dict:
+    return get_base_year_operating_data(_facts, extract_series)
+
+
+@timed
+@st.cache_data(show_spinner=False)
+def load_capital_structure(cik: str, accession: str, _facts) -> tuple:
+    return get_net_debt(_facts, extract_series), get_share_count(_facts, extract_series)
+
+
+@timed
+@st.cache_data(ttl=3600, show_spinner="Fetching market data...")
+def load_wacc(ticker: str) -> dict:
+    return calculate_wacc(ticker)
+
+
+@timed
+@st.cache_data(ttl=3600, show_spinner=False)
+def load_price(ticker: str):
+    return get_market_data().get_quote(ticker)["price"]
+
+
+# Pure compute: memoised on the assumptions themselves
+@timed
+@st.cache_data(show_spinner=False, max_entries=256)
+def load_projection(
+    base_revenue: float,
+    operating_margin: float,
+    tax_rate: float,
+    growth_rates: tuple,
+    sales_to_capital: float,
+):
+    return project_fcff(
+        base_revenue=base_revenue,
+        operating_margin=operating_margin,
+        tax_rate=tax_rate,
+        growth_rates=list(growth_rates),
+        sales_to_capital=sales_to_capital
+    )
 
 
 # -------------------------------
@@ -50,17 +126,33 @@ ticker = st.text_input(
 
 run_button = st.button("🚀 Run Valuation")
 
+profiler = st.sidebar.selectbox("⏱️ Profile valuation runs", ["Off"] + profilers())
+
+# Remember the valued ticker so assumption widgets below can rerun the
+# script without the button, recomputing only the uncached stages
+if run_button:
+    st.session_state["valued_ticker"] = ticker
+
 # -------------------------------
 # MAIN EXECUTION
 # -------------------------------
-if run_button:
+if st.session_state.get("valued_ticker") == ticker:
+
+    # Every stage below is timed into this trace (modules.instrumentation)
+    perf = Trace("valuation", profile=None if profiler == "Off" else profiler, ticker=ticker)
+    perf.start()
 
     try:
         # ---------------------------
         # LOAD SEC DATA
         # ---------------------------
-        cik = get_cik_from_ticker(ticker)
-        xbrl = get_company_xbrl(cik)
+        with span("cik_lookup"):
+            cik = load_ticker_index().cik(ticker)
+        if cik is None:
+            raise ValueError(f"CIK not found for ticker: {ticker}")
+
+        xbrl = load_facts(cik)
+        accession = xbrl.latest_accession()
 
         st.subheader("📁 SEC Filing Metadata")
         st.json({
@@ -73,7 +165,7 @@ if run_button:
         # ---------------------------
         # CLASSIFY COMPANY
         # ---------------------------
-        company_type = classify_company(xbrl, extract_series)
+        company_type = load_company_type(cik, accession, xbrl)
 
         st.subheader("🏷️ Company Classification")
         st.info(f"Detected Company Type: **{company_type}**")
@@ -106,10 +198,7 @@ if run_button:
         # ---------------------------
         # BASE-YEAR ECONOMICS
         # ---------------------------
-        base = get_base_year_operating_data(
-            xbrl,
-            extract_series
-        )
+        base = load_base_year(cik, accession, xbrl)
 
         st.subheader("📘 Base-Year Operating Economics (Latest 10-K)")
 
@@ -152,11 +241,11 @@ if run_button:
         # ---------------------------
         # FCFF PROJECTION
         # ---------------------------
-        projections = project_fcff(
+        projections = load_projection(
             base_revenue=base["revenue"],
             operating_margin=base["operating_margin"],
             tax_rate=base["tax_rate"],
-            growth_rates=growth_rates,
+            growth_rates=tuple(growth_rates),
             sales_to_capital=sales_to_capital
         )
 
@@ -176,7 +265,7 @@ if run_button:
         # ---------------------------
         # COST OF CAPITAL
         # ---------------------------
-        wacc_data = calculate_wacc(ticker)
+        wacc_data = load_wacc(ticker)
         wacc = wacc_data["WACC"]
 
         st.subheader("📐 Cost of Capital")
@@ -210,22 +299,22 @@ if run_button:
         # ---------------------------
         # DCF VALUATION
         # ---------------------------
+        net_debt, shares = load_capital_structure(cik, accession, xbrl)
+
         valuation = dcf_valuation(
-            fcff_projection=projections,
+            fcff_df=projections,
             wacc=wacc,
-            terminal_growth=terminal_growth
+            terminal_growth=terminal_growth,
+            net_debt=net_debt,
+            shares_outstanding=shares
         )
 
-        enterprise_value = valuation["enterprise_value"]
-
         # ---------------------------
         # EQUITY VALUE
         # ---------------------------
-        net_debt = get_net_debt(xbrl, extract_series)
-        shares = get_share_count(xbrl)
-
-        equity_value = enterprise_value - net_debt
-        fair_value = equity_value / shares if shares > 0 else None
+        enterprise_value = valuation["EnterpriseValue"]
+        equity_value = valuation["EquityValue"]
+        fair_value = valuation["FairValuePerShare"] if shares > 0 else None
 
         st.subheader("📈 Valuation Summary")
 
@@ -237,6 +326,82 @@ if run_button:
             f"${fair_value:,.2f}" if fair_value else "N/A"
         )
 
+        # ---------------------------
+        # REVERSE DCF
+        # ---------------------------
+        price = load_price(ticker)
+
+        if price and shares > 0:
+            assumptions = {
+                "base_revenue": base["revenue"],
+                "operating_margin": base["operating_margin"],
+                "tax_rate": base["tax_rate"],
+                "sales_to_capital": sales_to_capital,
+                "growth": [growth_rates],
+                "wacc": wacc,
+                "terminal_growth": terminal_growth,
+                "net_debt": net_debt,
+                "shares_outstanding": shares,
+            }
+            implied = {
+                solve_for: implied_parameter(solve_for, price, assumptions)["implied"][0]
+                for solve_for in SOLVE_FOR
+            }
+
+            st.subheader("🔁 What the Market Price Implies")
+            st.caption(
+                f"Each value alone reconciles the DCF with the current price of "
+                f"${price:,.2f}, holding the other assumptions above fixed."
+            )
+
+            c1, c2, c3 = st.columns(3)
+            for col, (solve_for, label) in zip(
+                (c1, c2, c3),
+                [("growth", "Revenue Growth (5y, constant)"), ("wacc", "WACC"),
+                 ("terminal_growth", "Terminal Growth")]
+            ):
+                value = implied[solve_for]
+                col.metric(f"Implied {label}", "N/A" if np.isnan(value) else f"{value:.2%}")
+
+        # ---------------------------
+        # SENSITIVITIES (TORNADO)
+        # ---------------------------
+        if shares > 0:
+            d_value = dcf_sensitivities(
+                base_revenue=base["revenue"],
+                operating_margin=base["operating_margin"],
+                tax_rate=base["tax_rate"],
+                growth_rates=[growth_rates],
+                sales_to_capital=sales_to_capital,
+                wacc=wacc,
+                terminal_growth=terminal_growth,
+                net_debt=net_debt,
+                shares_outstanding=shares
+            )["dFairValuePerShare"]
+
+            bumps = [
+                ("Revenue Growth (all years)", "+1pp", "growth_rates", 0.01),
+                ("Operating Margin", "+1pp", "operating_margin", 0.01),
+                ("Tax Rate", "+1pp", "tax_rate", 0.01),
+                ("Sales-to-Capital", "+0.1x", "sales_to_capital", 0.1),
+                ("WACC", "+1pp", "wacc", 0.01),
+                ("Terminal Growth", "+0.5pp", "terminal_growth", 0.005),
+            ]
+            tornado = pd.DataFrame(
+                [
+                    (label, change, float(np.sum(d_value[name])) * size)
+                    for label, change, name, size in bumps
+                ],
+                columns=["Input", "Change", "Δ Fair Value per Share ($)"]
+            )
+            tornado = tornado.iloc[
+                (-tornado["Δ Fair Value per Share ($)"].abs()).argsort()
+            ]
+
+            st.subheader("🌪️ What Moves the Value")
+            st.dataframe(tornado, hide_index=True, use_container_width=True)
+            st.caption("First-order estimates from the DCF's closed-form sensitivities.")
+
         # ---------------------------
         # NOTES
         # ---------------------------
@@ -250,3 +415,7 @@ if run_button:
 
     except Exception as e:
         st.exception(e)
+
+    finally:
+        perf.stop()
+        performance_component(perf)
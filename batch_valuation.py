@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+DCF VALUATION MODEL - BATCH UNIVERSE RUNNER
+Prof. V. Ravichandran | The Mountain Path - World of Finance
+
+Headless version of the app.py FCFF workflow for many tickers at once.
+
+Market data for the whole list comes from one bulk quote request (per
+ticker if that fails) and companyfacts documents are downloaded into the
+SEC disk cache on a small thread pool in the main process. Parsing (only
+the valuation tags), XBRL extraction, WACC and the DCF run on a process
+pool; filers in the local fact store are loaded there too. Every finished
+ticker is appended to a checkpoint file, so an interrupted run picks up
+where it stopped.
+
+Usage:
+    python batch_valuation.py sp500.txt --workers 8
+    python batch_valuation.py AAPL MSFT NVDA --wacc 0.09 --name megacaps
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT))
+
+from modules.base_year import get_base_year_operating_data
+from modules.company_classifier import classify_company
+from modules.data_fetcher import (
+    SEC_XBRL_URL,
+    VALUATION_TAGS,
+    extract_series,
+    get_cik_from_ticker,
+    get_company_facts,
+    in_fact_store,
+)
+from modules.dcf import dcf_valuation
+from modules.equity import get_share_count
+from modules.fact_index import FactIndex
+from modules.fcff_projection import project_fcff
+from modules.market_data import StaticMarketData, get_market_data
+from modules.net_debt import get_net_debt
+from modules.sec_cache import SEC_HEADERS, get_sec_cache
+from modules.wacc import calculate_wacc
+from modules.xbrl_parser import load_selected_facts
+
+
+REPORTS_DIR = ROOT / "reports"
+
+DEFAULT_GROWTH_RATES = [0.10, 0.10, 0.10, 0.08, 0.08]
+
+RESULT_COLUMNS = [
+    "ticker", "cik", "status", "company_type", "fiscal_year",
+    "revenue", "operating_margin", "tax_rate", "wacc", "terminal_growth",
+    "enterprise_value", "net_debt", "equity_value", "shares",
+    "fair_value_per_share", "error",
+]
+
+# Statuses that do not need to be recomputed on resume
+FINAL_STATUSES = ("ok", "skipped")
+
+
+# -------------------------------------------------
+# INPUT
+# -------------------------------------------------
+def read_tickers(sources: list) -> list:
+    """
+    Tickers from arguments; an argument naming a file is read one ticker
+    per line (first CSV column, '#' comments and blank lines ignored)
+    """
+    tickers = []
+    for source in sources:
+        path = Path(source)
+        if path.is_file():
+            for line in path.read_text().splitlines():
+                line = line.split("#")[0].split(",")[0].strip()
+                if line and line.lower() != "ticker":
+                    tickers.append(line.upper())
+        else:
+            tickers.append(source.upper())
+
+    # Preserve order, drop duplicates
+    return list(dict.fromkeys(tickers))
+
+
+# -------------------------------------------------
+# STAGE 1: I/O (MAIN PROCESS, THREADS)
+# -------------------------------------------------
+def fetch_inputs(ticker: str, quote: dict = None, fetch_quote: bool = False) -> dict:
+    """
+    Resolve the CIK and download companyfacts into the SEC disk cache
+    (unless the filer is served from the local fact store); with
+    ``fetch_quote`` the market quote is requested for this ticker alone
+
+    Nothing is parsed here: "path" is the cached document, left for the
+    worker process.
+    """
+    cik = get_cik_from_ticker(ticker)
+
+    path = None
+    if not in_fact_store(cik):
+        try:
+            path = str(get_sec_cache().get_path(SEC_XBRL_URL.format(cik=cik), headers=SEC_HEADERS))
+        except ValueError:
+            pass        # too large to cache: the worker downloads it itself
+    if fetch_quote:
+        quote = get_market_data().get_quote(ticker)
+
+    return {
+        "cik": cik,
+        "path": path,
+        "quote": quote,
+    }
+
+
+# -------------------------------------------------
+# STAGE 2: VALUE (WORKER PROCESSES)
+# -------------------------------------------------
+def load_facts(fetched: dict) -> FactIndex:
+    """
+    Parse the valuation tags out of the downloaded companyfacts document,
+    or load them through get_company_facts (fact store, or a blob evicted
+    since the download)
+    """
+    if fetched["path"] is not None:
+        try:
+            return FactIndex.from_companyfacts(load_selected_facts(fetched["path"], VALUATION_TAGS))
+        except FileNotFoundError:
+            pass
+    return get_company_facts(fetched["cik"], tags=VALUATION_TAGS)
+
+
+def value_ticker(ticker: str, fetched: dict, assumptions: dict, wacc: float = None) -> dict:
+    """
+    Run the FCFF valuation for one ticker (executed in a worker process)
+    """
+    row = {"ticker": ticker, "cik": fetched["cik"]}
+
+    xbrl = load_facts(fetched)
+
+    company_type = classify_company(xbrl, extract_series)
+    row["company_type"] = company_type
+
+    if company_type == "Financial":
+        row["status"] = "skipped"
+        row["error"] = "Financial institution: FCFF not applicable"
+        return row
+
+    base = get_base_year_operating_data(xbrl, extract_series)
+
+    net_debt = get_net_debt(xbrl, extract_series)
+    shares = get_share_count(xbrl, extract_series)
+
+    if wacc is None:
+        # Bulk quotes carry price and beta; market cap comes from SEC shares
+        wacc = calculate_wacc(
+            ticker,
+            provider=StaticMarketData({ticker: fetched["quote"] or {}}),
+            shares_outstanding=shares
+        )["WACC"]
+    row["wacc"] = wacc
+
+    projections = project_fcff(
+        base_revenue=base["revenue"],
+        operating_margin=base["operating_margin"],
+        tax_rate=base["tax_rate"],
+        growth_rates=assumptions["growth_rates"],
+        sales_to_capital=assumptions["sales_to_capital"],
+        as_frame=False
+    )
+
+    valuation = dcf_valuation(
+        projections,
+        wacc=wacc,
+        terminal_growth=assumptions["terminal_growth"],
+        net_debt=net_debt,
+        shares_outstanding=shares
+    )
+
+    row.update({
+        "status": "ok",
+        "fiscal_year": base["year"],
+        "revenue": base["revenue"],
+        "operating_margin": base["operating_margin"],
+        "tax_rate": base["tax_rate"],
+        "terminal_growth": assumptions["terminal_growth"],
+        "enterprise_value": float(valuation["EnterpriseValue"]),
+        "net_debt": net_debt,
+        "equity_value": float(valuation["EquityValue"]),
+        "shares": shares,
+        "fair_value_per_share": float(valuation["FairValuePerShare"]),
+    })
+    return row
+
+
+def _error_row(ticker: str, exc: BaseException, cik=None) -> dict:
+    return {
+        "ticker": ticker,
+        "cik": cik,
+        "status": "error",
+        "error": f"{type(exc).__name__}: {exc}",
+    }
+
+
+# -------------------------------------------------
+# CHECKPOINTS & OUTPUT
+# -------------------------------------------------
+def load_checkpoint(path: Path) -> dict:
+    """
+    Latest checkpointed row per ticker
+    """
+    done = {}
+    if path.exists():
+        for line in path.read_text().splitlines():
+            try:
+                row = json.loads(line)
+            except ValueError:
+                continue        # torn final line from an interrupted run
+            done[row["ticker"]] = row
+    return done
+
+
+def write_results(path: Path, tickers: list, rows: dict) -> None:
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_COLUMNS, extrasaction="ignore")
+        writer.writeheader()
+        for ticker in tickers:
+            if ticker in rows:
+                writer.writerow(rows[ticker])
+
+
+# -------------------------------------------------
+# RUNNER
+# -------------------------------------------------
+def run_batch(
+    tickers: list,
+    name: str = "universe",
+    workers: int = None,
+    fetch_threads: int = 4,
+    wacc: float = None,
+    assumptions: dict = None,
+    restart: bool = False,
+) -> Path:
+    """
+    Value ``tickers`` and write reports/<name>_valuations.csv
+    """
+    assumptions = assumptions or {
+        "growth_rates": DEFAULT_GROWTH_RATES,
+        "sales_to_capital": 2.5,
+        "terminal_growth": 0.03,
+    }
+
+    REPORTS_DIR.mkdir(exist_ok=True)
+    checkpoint_path = REPORTS_DIR / f"{name}_checkpoint.jsonl"
+    results_path = REPORTS_DIR / f"{name}_valuations.csv"
+
+    if restart and checkpoint_path.exists():
+        checkpoint_path.unlink()
+
+    rows = load_checkpoint(checkpoint_path)
+    pending = [t for t in tickers if rows.get(t, {}).get("status") not in FINAL_STATUSES]
+
+    print(f"{len(tickers)} tickers, {len(tickers) - len(pending)} already done, {len(pending)} to value")
+    started = time.time()
+
+    with open(checkpoint_path, "a") as checkpoint, \
+            ThreadPoolExecutor(fetch_threads) as io_pool, \
+            ProcessPoolExecutor(workers) as cpu_pool:
+
+        completed = []
+
+        def record(row: dict) -> None:
+            rows[row["ticker"]] = row
+            completed.append(row["ticker"])
+            checkpoint.write(json.dumps(row) + "\n")
+            checkpoint.flush()
+            detail = f"${row['fair_value_per_share']:,.2f}" if row["status"] == "ok" else row.get("error", "")
+            print(f"  [{len(completed):>5}/{len(pending)}] {row['ticker']:<8} {row['status']:<8} {detail}")
+
+        quotes = {}
+        per_ticker_quotes = False
+        if wacc is None and pending:
+            # One bulk request for the whole universe instead of one per ticker
+            try:
+                quotes = get_market_data().get_quotes(pending)
+            except Exception as e:
+                # Fall back to one request per ticker, so a failure only
+                # costs the tickers it affects
+                print(f"Bulk quote request failed ({type(e).__name__}: {e}); fetching quotes per ticker")
+                per_ticker_quotes = True
+
+        fetches = {
+            io_pool.submit(fetch_inputs, t, quotes.get(t), per_ticker_quotes): t
+            for t in pending
+        }
+        valuations = {}
+
+        for future in as_completed(fetches):
+            ticker = fetches[future]
+            try:
+                fetched = future.result()
+            except Exception as e:
+                record(_error_row(ticker, e))
+                continue
+            valuations[cpu_pool.submit(value_ticker, ticker, fetched, assumptions, wacc)] = (ticker, fetched)
+
+        for future in as_completed(valuations):
+            ticker, fetched = valuations[future]
+            try:
+                record(future.result())
+            except Exception as e:
+                record(_error_row(ticker, e, cik=fetched["cik"]))
+
+    write_results(results_path, tickers, rows)
+
+    n_ok = sum(1 for t in tickers if rows.get(t, {}).get("status") == "ok")
+    print(f"\n{n_ok}/{len(tickers)} valued in {time.time() - started:,.1f}s -> {results_path}")
+    return results_path
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Batch FCFF valuation of many tickers")
+    parser.add_argument("tickers", nargs="+", help="Tickers, or files with one ticker per line")
+    parser.add_argument("--name", default="universe", help="Run name for the report/checkpoint files")
+    parser.add_argument("--workers", type=int, default=None, help="Valuation processes (default: CPU count)")
+    parser.add_argument("--fetch-threads", type=int, default=4, help="Concurrent SEC downloads")
+    parser.add_argument("--wacc", type=float, default=None, help="Fixed WACC for every ticker (skips market data)")
+    parser.add_argument("--growth", type=float, nargs=5, default=DEFAULT_GROWTH_RATES, metavar="G",
+                        help="Five revenue growth rates")
+    parser.add_argument("--sales-to-capital", type=float, default=2.5)
+    parser.add_argument("--terminal-growth", type=float, default=0.03)
+    parser.add_argument("--restart", action="store_true", help="Ignore any existing checkpoint")
+    args = parser.parse_args(argv)
+
+    tickers = read_tickers(args.tickers)
+    if not tickers:
+        parser.error("no tickers given")
+
+    run_batch(
+        tickers,
+        name=args.name,
+        workers=args.workers,
+        fetch_threads=args.fetch_threads,
+        wacc=args.wacc,
+        assumptions={
+            "growth_rates": args.growth,
+            "sales_to_capital": args.sales_to_capital,
+            "terminal_growth": args.terminal_growth,
+        },
+        restart=args.restart,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,9 @@
+"""
+Performance benchmarks for the valuation pipeline.
+
+    python -m benchmarks.run              # hot-path timings vs. baseline
+    python -m benchmarks.fetch_load       # fetch pipeline vs. local EDGAR stand-in
+    python -m benchmarks.edgar_standin    # serve EDGAR fixtures locally
+
+See benchmarks.fixtures for the synthetic companyfacts documents.
+"""
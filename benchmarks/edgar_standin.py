@@ -0,0 +1,314 @@
+"""
+Local stand-in for the SEC EDGAR endpoints the fetch pipeline uses.
+
+    python -m benchmarks.edgar_standin fixtures/ --generate 500
+    python -m benchmarks.edgar_standin fixtures/ --latency-ms 40 --error-rate 0.02 --rate-limit 10
+
+Serves, from a fixture directory:
+
+    /files/company_tickers.json                  company_tickers.json
+    /api/xbrl/companyfacts/CIK##########.json    companyfacts/CIK##########.json
+    /submissions/CIK##########.json              submissions/CIK##########.json
+
+with configurable latency (base plus an exponential tail), a random 503
+error rate and SEC-style 429 throttling above a request rate. ETag /
+If-None-Match revalidation is honoured, and /__stats reports counters.
+Point the app at it with SEC_BASE_URL=http://127.0.0.1:<port>.
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+
+_ROUTES = [
+    (re.compile(r"^/files/company_tickers\.json$"), lambda m: "company_tickers.json"),
+    (re.compile(r"^/api/xbrl/companyfacts/(CIK\d{10}\.json)$"), lambda m: f"companyfacts/{m.group(1)}"),
+    (re.compile(r"^/submissions/(CIK\d{10}\.json)$"), lambda m: f"submissions/{m.group(1)}"),
+]
+
+# Share of generated filers per fixture size (benchmarks.fixtures.SIZES)
+_SIZE_MIX = ["small_cap"] * 10 + ["mid_cap"] * 6 + ["large_cap"] * 3 + ["mega_filer"]
+
+
+# -------------------------------------------------
+# SERVER
+# -------------------------------------------------
+class EdgarStandIn:
+    """
+    Threaded HTTP server imitating sec.gov / data.sec.gov
+
+    ``rate_limit`` (requests per second, None for unlimited) is enforced
+    with a token bucket; requests over it get 429 with Retry-After: 1,
+    like EDGAR's fair-access throttle. Latency and errors are drawn from a
+    seeded generator so runs are repeatable.
+    """
+
+    def __init__(
+        self,
+        fixture_dir,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit: float = None,
+        require_user_agent: bool = True,
+        seed: int = 0,
+    ):
+        self.fixture_dir = Path(fixture_dir)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.require_user_agent = require_user_agent
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._bodies = {}           # relative path -> (body, etag)
+        self._tokens = rate_limit or 0.0
+        self._refilled = time.monotonic()
+        self._stats = {"requests": 0, "bytes": 0, "status": {}}
+
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return json.loads(json.dumps(self._stats))
+
+    # ---------------------------------------------
+    # REQUEST HANDLING
+    # ---------------------------------------------
+    def _respond(self, path: str, headers) -> tuple:
+        """
+        (status, headers, body) for one GET
+        """
+        if path == "/__stats":
+            return 200, {"Content-Type": "application/json"}, json.dumps(self.stats()).encode()
+
+        with self._lock:
+            delay = self.latency_ms
+            if self.jitter_ms:
+                delay += self._rng.expovariate(1 / self.jitter_ms)
+            failed = self._rng.random() < self.error_rate
+            throttled = not self._take_token()
+
+        time.sleep(delay / 1000)
+
+        if self.require_user_agent and not headers.get("User-Agent"):
+            return 403, {}, b"Undeclared automated tool"
+        if throttled:
+            return 429, {"Retry-After": "1"}, b"Request rate threshold exceeded"
+        if failed:
+            return 503, {}, b"Service unavailable"
+
+        for pattern, target in _ROUTES:
+            m = pattern.match(path)
+            if m:
+                loaded = self._load(target(m))
+                break
+        else:
+            loaded = None
+
+        if loaded is None:
+            return 404, {}, b"Not found"
+
+        body, etag = loaded
+        if headers.get("If-None-Match") == etag:
+            return 304, {"ETag": etag}, b""
+        return 200, {"Content-Type": "application/json", "ETag": etag}, body
+
+    def _take_token(self) -> bool:
+        if not self.rate_limit:
+            return True
+        now = time.monotonic()
+        self._tokens = min(self.rate_limit, self._tokens + (now - self._refilled) * self.rate_limit)
+        self._refilled = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    def _load(self, relative: str):
+        with self._lock:
+            if relative in self._bodies:
+                return self._bodies[relative]
+        path = self.fixture_dir / relative
+        if not path.is_file():
+            return None
+        body = path.read_bytes()
+        loaded = (body, f'"{hashlib.sha1(body).hexdigest()}"')
+        with self._lock:
+            self._bodies[relative] = loaded
+        return loaded
+
+    def _record(self, status: int, n_bytes: int) -> None:
+        with self._lock:
+            self._stats["requests"] += 1
+            self._stats["bytes"] += n_bytes
+            key = str(status)
+            self._stats["status"][key] = self._stats["status"].get(key, 0) + 1
+
+    def _handler(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                path = self.path.split("?")[0]
+                status, headers, body = standin._respond(path, self.headers)
+                if path != "/__stats":
+                    standin._record(status, len(body))
+
+                self.send_response(status)
+                for k, v in headers.items():
+                    self.send_header(k, v)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+# -------------------------------------------------
+# FIXTURES
+# -------------------------------------------------
+def generate_fixtures(fixture_dir, n_companies: int, seed: int = 0) -> list:
+    """
+    Write a synthetic universe of ``n_companies`` filers (tickers SYN0001,
+    ...) with companyfacts and submissions documents; returns the tickers
+    """
+    # Imported lazily: fixtures import modules.data_fetcher, which reads
+    # SEC_BASE_URL at import time
+    from benchmarks.fixtures import make_companyfacts
+
+    fixture_dir = Path(fixture_dir)
+    (fixture_dir / "companyfacts").mkdir(parents=True, exist_ok=True)
+    (fixture_dir / "submissions").mkdir(parents=True, exist_ok=True)
+
+    tickers = {}
+    for i in range(n_companies):
+        cik = 900_000 + i
+        ticker = f"SYN{i + 1:04d}"
+        size = _SIZE_MIX[i % len(_SIZE_MIX)]
+        facts = make_companyfacts(size, seed=seed * 100_000 + i, cik=cik)
+
+        name = f"CIK{cik:010d}.json"
+        (fixture_dir / "companyfacts" / name).write_text(json.dumps(facts))
+        (fixture_dir / "submissions" / name).write_text(json.dumps(_submissions(facts, ticker)))
+        tickers[str(i)] = {"cik_str": cik, "ticker": ticker, "title": facts["entityName"]}
+
+    (fixture_dir / "company_tickers.json").write_text(json.dumps(tickers))
+    return [t["ticker"] for t in tickers.values()]
+
+
+def _submissions(facts: dict, ticker: str) -> dict:
+    """
+    Submissions document listing every filing behind ``facts``, newest first
+    """
+    filings = {}
+    for tag in facts["facts"]["us-gaap"].values():
+        for items in tag["units"].values():
+            for item in items:
+                if "frame" in item:
+                    filings[item["accn"]] = (item["filed"], item["form"], item["end"])
+
+    recent = sorted(filings.items(), key=lambda kv: kv[1][0], reverse=True)
+    return {
+        "cik": str(facts["cik"]),
+        "name": facts["entityName"],
+        "tickers": [ticker],
+        "filings": {
+            "recent": {
+                "accessionNumber": [accn for accn, _ in recent],
+                "filingDate": [f[0] for _, f in recent],
+                "form": [f[1] for _, f in recent],
+                "reportDate": [f[2] for _, f in recent],
+                "isXBRL": [1] * len(recent),
+            },
+            "files": [],
+        },
+    }
+
+
+# -------------------------------------------------
+# COMMAND LINE
+# -------------------------------------------------
+def add_server_arguments(parser) -> None:
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Base latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Mean of the exponential latency tail")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered 503")
+    parser.add_argument("--rate-limit", type=float, default=None, help="Requests/second before 429s")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Serve SEC EDGAR fixtures locally")
+    parser.add_argument("fixture_dir", help="Directory with company_tickers.json, companyfacts/, submissions/")
+    parser.add_argument("--generate", type=int, default=None, metavar="N", help="First write N synthetic filers")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_server_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if args.generate:
+        tickers = generate_fixtures(args.fixture_dir, args.generate, seed=args.seed)
+        print(f"Generated {len(tickers)} filers in {args.fixture_dir}")
+
+    server = EdgarStandIn(
+        args.fixture_dir,
+        host=args.host,
+        port=args.port,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        seed=args.seed,
+    )
+    print(f"Serving {args.fixture_dir} on {server.url}  (export SEC_BASE_URL={server.url})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""
+End-to-end load test of the SEC fetch pipeline against the local stand-in.
+
+    python -m benchmarks.fetch_load --companies 200 --concurrency 8
+    python -m benchmarks.fetch_load --latency-ms 40 --jitter-ms 20 --error-rate 0.02 --rate-limit 10
+
+Starts benchmarks.edgar_standin on a free port over a synthetic (or given)
+fixture universe, points the app at it through SEC_BASE_URL with an empty
+temporary SEC cache and fact store, then resolves and fetches every ticker
+the way the app does (get_cik_from_ticker + get_company_facts with
+VALUATION_TAGS). Reports throughput, per-ticker latency percentiles and
+the status codes the server handed out.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from benchmarks.edgar_standin import EdgarStandIn, add_server_arguments, generate_fixtures
+
+
+ROOT = Path(__file__).resolve().parent.parent
+REPORTS_DIR = ROOT / "reports"
+
+
+def percentiles(samples: list, points=(50, 90, 95, 99)) -> dict:
+    ordered = sorted(samples)
+    if not ordered:
+        return {}
+    result = {f"p{p}": ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))] for p in points}
+    result["max"] = ordered[-1]
+    result["mean"] = statistics.fmean(ordered)
+    return result
+
+
+def run_load(tickers: list, concurrency: int) -> dict:
+    """
+    Fetch every ticker through the pipeline; modules are imported here so
+    they pick up the SEC_* environment set by main()
+    """
+    from modules.data_fetcher import VALUATION_TAGS, get_cik_from_ticker, get_company_facts
+    from modules.ticker_index import get_ticker_index
+
+    started = time.perf_counter()
+    get_ticker_index()
+    ticker_seconds = time.perf_counter() - started
+
+    def fetch(ticker):
+        t0 = time.perf_counter()
+        try:
+            facts = get_company_facts(get_cik_from_ticker(ticker), tags=VALUATION_TAGS)
+            return time.perf_counter() - t0, len(facts), None
+        except Exception as e:
+            return time.perf_counter() - t0, 0, f"{type(e).__name__}: {e}"
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        outcomes = list(pool.map(fetch, tickers))
+    elapsed = time.perf_counter() - started
+
+    latencies = [o[0] for o in outcomes if o[2] is None]
+    errors = {t: o[2] for t, o in zip(tickers, outcomes) if o[2] is not None}
+
+    return {
+        "tickers": len(tickers),
+        "fetched": len(latencies),
+        "facts": sum(o[1] for o in outcomes),
+        "seconds": elapsed,
+        "tickers_per_second": len(tickers) / elapsed if elapsed > 0 else 0.0,
+        "ticker_index_seconds": ticker_seconds,
+        "latency": percentiles(latencies),
+        "errors": errors,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test the SEC fetch pipeline against a local stand-in")
+    parser.add_argument("--fixtures", default=None, help="Existing fixture directory (default: generate one)")
+    parser.add_argument("--companies", type=int, default=100, help="Synthetic filers to generate")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent ticker fetches")
+    parser.add_argument("--client-rate", type=float, default=None, help="Client requests/second (default: SEC limit)")
+    parser.add_argument("--output", default=None, help="Results JSON (default reports/fetch_load_<time>.json)")
+    add_server_arguments(parser)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="edgar_load_") as tmp:
+        tmp = Path(tmp)
+        fixture_dir = Path(args.fixtures) if args.fixtures else tmp / "fixtures"
+
+        server = EdgarStandIn(
+            fixture_dir,
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            error_rate=args.error_rate,
+            rate_limit=args.rate_limit,
+            seed=args.seed,
+        )
+
+        # Must be set before anything imports modules.edgar_client
+        os.environ["SEC_BASE_URL"] = server.url
+        os.environ["SEC_CACHE_DIR"] = str(tmp / "sec_cache")
+        os.environ["FACT_STORE_DIR"] = str(tmp / "fact_store")
+        if args.client_rate:
+            os.environ["SEC_MAX_REQUESTS_PER_SECOND"] = str(args.client_rate)
+
+        if args.fixtures:
+            tickers = [t["ticker"] for t in json.loads((fixture_dir / "company_tickers.json").read_text()).values()]
+        else:
+            print(f"Generating {args.companies} synthetic filers ...")
+            tickers = generate_fixtures(fixture_dir, args.companies, seed=args.seed)
+
+        with server:
+            print(f"Fetching {len(tickers)} tickers from {server.url} with concurrency {args.concurrency}")
+            result = run_load(tickers, args.concurrency)
+            result["server"] = server.stats()
+
+    result["config"] = {k: v for k, v in vars(args).items() if k != "output"}
+
+    lat = result["latency"]
+    print(
+        f"\n{result['fetched']}/{result['tickers']} fetched in {result['seconds']:.2f}s "
+        f"({result['tickers_per_second']:.1f} tickers/s)"
+    )
+    if lat:
+        print(
+            f"Latency  p50 {lat['p50'] * 1000:.0f} ms  p95 {lat['p95'] * 1000:.0f} ms  "
+            f"p99 {lat['p99'] * 1000:.0f} ms  max {lat['max'] * 1000:.0f} ms"
+        )
+    print(f"Server   {result['server']['requests']} requests, status {result['server']['status']}")
+    for ticker, error in sorted(result["errors"].items())[:10]:
+        print(f"  ✗ {ticker}: {error}")
+
+    REPORTS_DIR.mkdir(exist_ok=True)
+    output = Path(args.output or REPORTS_DIR / f"fetch_load_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    output.write_text(json.dumps(result, indent=2))
+    print(f"Results -> {output}")
+
+    return 1 if result["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""
+Synthetic SEC companyfacts documents for benchmarking.
+
+The generator reproduces the shape of real companyfacts JSON: dei and
+us-gaap taxonomies, one entry per (tag, unit), and for every fiscal year a
+10-K reporting three comparative years plus three 10-Qs. Valuation tags
+(modules.data_fetcher.VALUATION_TAGS) carry internally consistent values
+in SEC's units (USD, share counts in "shares"), so every FCFF pipeline
+stage runs on them; the remaining tags are filler that only adds
+realistic bulk. They report InterestIncome, so classify_company flags
+them as financial - drop that tag to value one end to end.
+"""
+
+import random
+
+from modules.data_fetcher import VALUATION_TAGS
+
+
+# name -> (n_tags, n_years); mega-filer is roughly Apple / JPMorgan scale
+SIZES = {
+    "small_cap": (60, 6),
+    "mid_cap": (250, 10),
+    "large_cap": (700, 14),
+    "mega_filer": (1800, 17),
+}
+
+LAST_FY = 2024
+
+SHARE_TAGS = {
+    "WeightedAverageNumberOfDilutedSharesOutstanding",
+    "WeightedAverageNumberOfShareOutstandingDiluted",
+    "WeightedAverageNumberOfSharesOutstandingBasic",
+    "WeightedAverageNumberOfShareOutstandingBasic",
+}
+
+# Share of revenue each valuation tag represents in the synthetic filer
+_RATIOS = {
+    "Revenues": 1.0,
+    "SalesRevenueNet": 1.0,
+    "OperatingIncomeLoss": 0.18,
+    "IncomeBeforeTax": 0.16,
+    "IncomeLossFromContinuingOperationsBeforeIncomeTaxes": 0.16,
+    "IncomeTaxExpenseBenefit": 0.035,
+    "DepreciationAndAmortization": 0.04,
+    "PaymentsToAcquirePropertyPlantAndEquipment": 0.05,
+    "InterestIncome": 0.002,
+    "CashAndCashEquivalentsAtCarryingValue": 0.12,
+    "CashCashEquivalentsRestrictedCashAndRestrictedCashEquivalents": 0.13,
+    "ShortTermBorrowings": 0.03,
+    "LongTermDebt": 0.25,
+}
+
+
+def make_companyfacts(size: str = "mid_cap", seed: int = 0, cik: int = 1) -> dict:
+    """
+    companyfacts-shaped dict for one synthetic filer of ``size``
+    (see SIZES)
+    """
+    n_tags, n_years = SIZES[size]
+    rng = random.Random(f"{size}-{seed}")
+
+    first_fy = LAST_FY - n_years + 1
+    base_revenue = {"small_cap": 4e8, "mid_cap": 5e9, "large_cap": 6e10, "mega_filer": 3.5e11}[size]
+    revenue = {fy: base_revenue * 1.07 ** (fy - LAST_FY) for fy in range(first_fy - 2, LAST_FY + 1)}
+    shares = base_revenue / 50
+
+    filings = _filings(cik, first_fy, rng)
+
+    us_gaap = {}
+    for tag in VALUATION_TAGS:
+        if tag in SHARE_TAGS:
+            us_gaap[tag] = _tag(tag, "shares", filings, lambda fy: shares * (1 - 0.01 * (LAST_FY - fy)), rng)
+        else:
+            ratio = _RATIOS[tag]
+            us_gaap[tag] = _tag(tag, "USD", filings, lambda fy, r=ratio: revenue[fy] * r, rng)
+
+    for i in range(max(n_tags - len(VALUATION_TAGS), 0)):
+        ratio = rng.uniform(0.001, 0.5)
+        us_gaap[f"SyntheticLineItem{i:04d}"] = _tag(
+            f"SyntheticLineItem{i:04d}", "USD", filings, lambda fy, r=ratio: revenue[fy] * r, rng
+        )
+
+    dei = {
+        "EntityCommonStockSharesOutstanding": _tag(
+            "EntityCommonStockSharesOutstanding", "shares", filings, lambda fy: shares, rng, instant=True
+        )
+    }
+
+    return {
+        "cik": cik,
+        "entityName": f"Synthetic {size.replace('_', ' ').title()} Corp",
+        "facts": {"dei": dei, "us-gaap": us_gaap},
+    }
+
+
+def _filings(cik: int, first_fy: int, rng) -> list:
+    """
+    (form, fy, fp, filed, accn) for every filing of the synthetic filer
+    """
+    filings = []
+    seq = 0
+    for fy in range(first_fy, LAST_FY + 1):
+        for q, month in ((1, 5), (2, 8), (3, 11)):
+            seq += 1
+            filings.append(("10-Q", fy, f"Q{q}", f"{fy}-{month:02d}-{rng.randint(1, 28):02d}", _accn(cik, fy, seq)))
+        seq += 1
+        filings.append(("10-K", fy, "FY", f"{fy + 1}-02-{rng.randint(1, 28):02d}", _accn(cik, fy + 1, seq)))
+    return filings
+
+
+def _accn(cik: int, year: int, seq: int) -> str:
+    return f"{cik:010d}-{year % 100:02d}-{seq:06d}"
+
+
+def _tag(tag: str, unit: str, filings: list, value, rng, instant: bool = False) -> dict:
+    """
+    One tag's entry: every filing reports the current period plus
+    comparatives (three years for a 10-K, one for a 10-Q)
+    """
+    items = []
+    for form, fy, fp, filed, accn in filings:
+        periods = range(3) if form == "10-K" else range(2)
+        for back in periods:
+            year = fy - back
+            if form == "10-K":
+                start, end, frame = f"{year - 1}-10-01", f"{year}-09-30", f"CY{year}"
+                val = value(year)
+            else:
+                q = int(fp[1])
+                start = f"{year}-{3 * q - 2:02d}-01"
+                end = f"{year}-{3 * q:02d}-28"
+                frame = f"CY{year}Q{q}"
+                val = value(year) / 4
+            item = {
+                "end": end,
+                "val": round(val * rng.uniform(0.995, 1.005)),
+                "accn": accn,
+                "fy": fy,
+                "fp": fp,
+                "form": form,
+                "filed": filed,
+            }
+            if not instant:
+                item = {"start": start, **item}
+            if back == 0:
+                item["frame"] = frame
+            items.append(item)
+
+    return {
+        "label": tag,
+        "description": f"Synthetic {tag} for benchmarking.",
+        "units": {unit: items},
+    }
@@ -0,0 +1,358 @@
+"""
+Benchmark runner for the valuation hot paths.
+
+    python -m benchmarks.run                      # run, compare to baseline
+    python -m benchmarks.run --save-baseline      # record a new baseline
+    python -m benchmarks.run -k extract --quick   # subset, fewer rounds
+
+Each benchmark is calibrated so one round takes at least --min-time
+seconds, then timed for --rounds rounds. The fastest per-call time (the
+least noisy statistic) is compared against the stored baseline and
+anything slower by more than --threshold is flagged as a regression
+(exit status 1).
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.fixtures import SIZES, make_companyfacts
+from data_validation import FinancialDataValidator
+from modules.backtest import run_backtest
+from modules.base_year import get_base_year_operating_data
+from modules.data_fetcher import extract_series
+from modules.dcf import dcf_sensitivities, dcf_valuation
+from modules.fact_index import FactIndex
+from modules.fcff_projection import project_fcff, project_fcff_batch
+from modules.reverse_dcf import implied_expectations
+from modules.valuation_engine import calculate_sensitivity, run_multi_valuation, valuation_sensitivities
+
+
+ROOT = Path(__file__).resolve().parent.parent
+REPORTS_DIR = ROOT / "reports"
+BASELINE_PATH = REPORTS_DIR / "benchmark_baseline.json"
+
+GROWTH_RATES = [0.10, 0.10, 0.10, 0.08, 0.08]
+
+# Batch projection: this many companies, 10 years, per-year margin paths
+BATCH_COMPANIES = 1_000
+
+# Batch validation / reverse DCF: a screening universe of this many companies
+UNIVERSE_COMPANIES = 5_000
+
+# Point-in-time backtest: companies x quarter-end as-of dates
+BACKTEST_COMPANIES = 50
+BACKTEST_DATES = pd.date_range("2015-03-31", "2024-12-31", freq="QE")
+
+# The app's sensitivity table: 5 WACC x 5 terminal-growth cells
+WACC_RANGE = [0.08, 0.09, 0.10, 0.11, 0.12]
+G_RANGE = [0.020, 0.025, 0.030, 0.035, 0.040]
+
+# Engine inputs ($M), as app.py builds them from base-year data
+ENGINE_INPUTS = {
+    "revenue": 383_285.0,
+    "ebit": 114_301.0,
+    "net_income": 96_995.0,
+    "shares": 15_744.0,
+    "debt": 111_088.0,
+    "cash": 29_965.0,
+    "interest_exp": 3_933.0,
+    "current_price": 190.0,
+    "tax_rate": 0.16,
+    "market_cap": 3_000_000.0,
+    "total_equity": 62_146.0,
+    "current_assets": 143_566.0,
+    "current_liabilities": 145_308.0,
+}
+
+
+# -------------------------------------------------
+# TIMER
+# -------------------------------------------------
+def time_call(fn, min_time: float = 0.1, rounds: int = 7) -> dict:
+    """
+    Per-call timings for ``fn``: the loop count is doubled until one
+    round takes ``min_time``, then ``rounds`` rounds are timed
+    """
+    fn()  # warm-up
+
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time or loops >= 1 << 20:
+            break
+        loops *= 2
+
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        samples.append((time.perf_counter() - started) / loops)
+
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.fmean(samples),
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "rounds": rounds,
+        "loops": loops,
+    }
+
+
+# -------------------------------------------------
+# BENCHMARKS
+# -------------------------------------------------
+def build_benchmarks(sizes=None, pattern: str = None) -> dict:
+    """
+    {name: zero-argument callable}; XBRL benchmarks are parametrised by
+    fixture size (fixtures that no selected benchmark needs are skipped)
+    """
+    benchmarks = {}
+
+    for size in sizes or SIZES:
+        names = ("fact_index_build", "extract_series", "get_base_year_operating_data", "as_of_queries")
+        if pattern and not any(pattern in f"{n}[{size}]" for n in names):
+            continue
+        xbrl = make_companyfacts(size)
+
+        # Cold path: flattening the document (what a first extract_series pays)
+        benchmarks[f"fact_index_build[{size}]"] = lambda x=xbrl: FactIndex.from_companyfacts(x)
+
+        # Warm path: the caller holds the index, each call slices it
+        index = FactIndex.from_companyfacts(xbrl)
+        benchmarks[f"extract_series[{size}]"] = (
+            lambda x=index: extract_series(x, ["Revenues", "SalesRevenueNet"], "Revenue")
+        )
+        benchmarks[f"get_base_year_operating_data[{size}]"] = (
+            lambda x=index: get_base_year_operating_data(x, extract_series)
+        )
+
+        # Built as-of tables: latest annual value and latest-amendment period
+        # value for every backtest date, binary searches only
+        as_of = index.as_of_index(["Revenues", "SalesRevenueNet"])
+        as_of.latest_annual(BACKTEST_DATES[:1])
+        as_of.period(BACKTEST_DATES[:1])
+        benchmarks[f"as_of_queries[{size}]"] = lambda a=as_of: (
+            a.latest_annual(BACKTEST_DATES),
+            a.period(BACKTEST_DATES, as_of=BACKTEST_DATES[-1]),
+        )
+
+    base = {"revenue": 383_285e6, "operating_margin": 0.298, "tax_rate": 0.16}
+    projection = project_fcff(
+        base_revenue=base["revenue"],
+        operating_margin=base["operating_margin"],
+        tax_rate=base["tax_rate"],
+        growth_rates=GROWTH_RATES,
+        sales_to_capital=2.5,
+    )
+
+    benchmarks["project_fcff"] = lambda: project_fcff(
+        base_revenue=base["revenue"],
+        operating_margin=base["operating_margin"],
+        tax_rate=base["tax_rate"],
+        growth_rates=GROWTH_RATES,
+        sales_to_capital=2.5,
+    )
+
+    rng = np.random.default_rng(0)
+    batch = {
+        "base_revenue": rng.lognormal(7, 2, BATCH_COMPANIES),
+        "operating_margin": rng.uniform(0.05, 0.30, (BATCH_COMPANIES, 1)) + np.linspace(0, 0.02, 10),
+        "tax_rate": 0.21,
+        "growth_rates": rng.normal(0.06, 0.04, (BATCH_COMPANIES, 10)),
+        "sales_to_capital": rng.uniform(0.5, 4.0, (BATCH_COMPANIES, 1)),
+    }
+    benchmarks[f"project_fcff_batch[{BATCH_COMPANIES}]"] = lambda: project_fcff_batch(**batch)
+
+    # Value plus every input sensitivity, one pass for the whole batch
+    batch_wacc = np.linspace(0.07, 0.12, BATCH_COMPANIES)
+    benchmarks[f"dcf_sensitivities[{BATCH_COMPANIES}]"] = lambda: dcf_sensitivities(
+        **batch,
+        wacc=batch_wacc,
+        terminal_growth=0.025,
+        net_debt=0.0,
+        shares_outstanding=1.0,
+    )
+
+    benchmarks["dcf_valuation"] = lambda: dcf_valuation(
+        fcff_df=projection,
+        wacc=0.09,
+        terminal_growth=0.03,
+        net_debt=81_123e6,
+        shares_outstanding=15_744e6,
+    )
+    benchmarks["run_multi_valuation"] = lambda: run_multi_valuation(
+        ENGINE_INPUTS, growth_rate=0.08, wacc=0.09, t_growth=0.03, market_data={}
+    )
+    benchmarks["calculate_sensitivity"] = lambda: calculate_sensitivity(
+        ENGINE_INPUTS, growth_rate=0.08, wacc_range=WACC_RANGE, g_range=G_RANGE
+    )
+    benchmarks["valuation_sensitivities"] = lambda: valuation_sensitivities(
+        ENGINE_INPUTS, growth_rate=0.08, wacc=0.09, t_growth=0.03
+    )
+    benchmarks["validate_all"] = lambda: FinancialDataValidator("BENCH").validate_all(ENGINE_INPUTS)
+
+    # Screening a universe: every rule and the health score as column operations
+    universe = pd.DataFrame({
+        field: value * rng.lognormal(0, 1, UNIVERSE_COMPANIES)
+        for field, value in ENGINE_INPUTS.items()
+    })
+    validator = FinancialDataValidator("BENCH")
+    benchmarks[f"validate_batch[{UNIVERSE_COMPANIES}]"] = lambda: (
+        validator.validate_batch(universe),
+        validator.get_health_score(universe),
+    )
+
+    # Reverse DCF over the same universe: implied growth, WACC and terminal growth
+    implied = universe.assign(
+        growth=rng.uniform(0.0, 0.15, UNIVERSE_COMPANIES),
+        wacc=rng.uniform(0.07, 0.12, UNIVERSE_COMPANIES),
+        terminal_growth=rng.uniform(0.01, 0.03, UNIVERSE_COMPANIES),
+        price=universe["current_price"],
+    )
+    benchmarks[f"implied_expectations[{UNIVERSE_COMPANIES}]"] = lambda: implied_expectations(
+        implied, model="multi"
+    )
+
+    name = f"run_backtest[{BACKTEST_COMPANIES}x{len(BACKTEST_DATES)}]"
+    if not pattern or pattern in name:
+        # Indexed up front, as load_companies returns them
+        companies = {
+            f"SYN{i}": FactIndex.from_companyfacts(_backtest_filer(i))
+            for i in range(BACKTEST_COMPANIES)
+        }
+        benchmarks[name] = lambda: run_backtest(companies, BACKTEST_DATES)
+
+    return benchmarks
+
+
+def _backtest_filer(seed: int) -> dict:
+    """
+    Synthetic non-financial filer (the fixtures' InterestIncome removed)
+    """
+    xbrl = make_companyfacts("small_cap", seed=seed, cik=seed + 1)
+    us_gaap = xbrl["facts"]["us-gaap"]
+    us_gaap.pop("InterestIncome")
+    return xbrl
+
+
+# -------------------------------------------------
+# RESULTS
+# -------------------------------------------------
+def run_benchmarks(pattern: str = None, min_time: float = 0.1, rounds: int = 7, sizes=None, progress=None) -> dict:
+    """
+    Time every benchmark whose name contains ``pattern``
+    """
+    results = {}
+    for name, fn in build_benchmarks(sizes, pattern).items():
+        if pattern and pattern not in name:
+            continue
+        results[name] = time_call(fn, min_time=min_time, rounds=rounds)
+        if progress:
+            progress(name, results[name])
+
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float = 0.25) -> list:
+    """
+    (name, baseline min, current min, ratio, regressed) for every
+    benchmark present in both runs
+    """
+    rows = []
+    for name, result in current["results"].items():
+        old = baseline.get("results", {}).get(name)
+        if old is None:
+            continue
+        ratio = result["min"] / old["min"] if old["min"] > 0 else float("inf")
+        rows.append((name, old["min"], result["min"], ratio, ratio > 1 + threshold))
+    return rows
+
+
+def load_baseline(path=BASELINE_PATH):
+    try:
+        return json.loads(Path(path).read_text())
+    except FileNotFoundError:
+        return None
+
+
+def _fmt(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit}"
+    return f"{seconds / 1e-9:8.2f} ns"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the valuation hot paths")
+    parser.add_argument("-k", dest="pattern", default=None, help="Only benchmarks whose name contains this")
+    parser.add_argument("--size", action="append", choices=list(SIZES), help="Fixture sizes (repeatable)")
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.1, help="Minimum seconds per round")
+    parser.add_argument("--quick", action="store_true", help="3 rounds of at least 20 ms")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH), help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Write this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Flag benchmarks slower by more than this")
+    parser.add_argument("--output", default=None, help="Results JSON (default reports/benchmark_<time>.json)")
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        args.rounds, args.min_time = 3, 0.02
+
+    def progress(name, result):
+        print(f"  {name:<45} {_fmt(result['min'])}  (median {_fmt(result['median']).strip()}, {result['loops']} loops)")
+
+    print(f"Running benchmarks ({args.rounds} rounds, ≥{args.min_time}s each)")
+    current = run_benchmarks(args.pattern, args.min_time, args.rounds, args.size, progress)
+
+    REPORTS_DIR.mkdir(exist_ok=True)
+    output = Path(args.output or REPORTS_DIR / f"benchmark_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    output.write_text(json.dumps(current, indent=2))
+    print(f"\nResults -> {output}")
+
+    if args.save_baseline:
+        Path(args.baseline).write_text(json.dumps(current, indent=2))
+        print(f"Baseline -> {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to record one")
+        return 0
+
+    rows = compare(current, baseline, args.threshold)
+    print(f"\nAgainst baseline from {baseline['created']} (threshold +{args.threshold:.0%}):")
+    for name, old, new, ratio, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        print(f"  {name:<45} {_fmt(old)} -> {_fmt(new)}  {ratio:5.2f}x{flag}")
+
+    regressions = [r for r in rows if r[4]]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
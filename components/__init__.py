@@ -8,11 +8,13 @@ Mountain Path Valuation Terminal
 from .header import header_component
 from .sidebar import sidebar_component
 from .footer import footer_component
+from .performance import performance_component
 
 __all__ = [
     'header_component',
     'sidebar_component',
-    'footer_component'
+    'footer_component',
+    'performance_component'
 ]
 
 __version__ = '1.0.0'
@@ -0,0 +1,45 @@
+import pandas as pd
+import streamlit as st
+
+
+def performance_component(trace):
+    """Per-stage timings, counters and profiler output for one valuation run"""
+    if trace is None or trace.seconds is None:
+        return
+
+    with st.expander(f"⏱️ Performance ({trace.seconds * 1000:,.0f} ms)"):
+        stages = trace.stages()
+        if stages:
+            st.dataframe(
+                pd.DataFrame({
+                    "Stage": [" " * s["depth"] + s["name"] for s in stages],
+                    "ms": [s["seconds"] * 1000 for s in stages],
+                    "% of run": [s["seconds"] / trace.seconds for s in stages],
+                }).style.format({"ms": "{:,.1f}", "% of run": "{:.0%}"}),
+                hide_index=True,
+                use_container_width=True
+            )
+            st.caption(
+                "load_facts is served from the process-wide fact cache when no download or "
+                "parse step appears under it (see the fact_cache.* counters); other load_* "
+                "stages with no nested steps were served from the Streamlit cache."
+            )
+
+        if trace.counters:
+            st.markdown("**Counters**")
+            st.dataframe(
+                pd.DataFrame(sorted(trace.counters.items()), columns=["Counter", "Value"]),
+                hide_index=True,
+                use_container_width=True
+            )
+
+        if trace.profile_text:
+            st.markdown(f"**Profile ({trace.profile})**")
+            st.code(trace.profile_text, language="text")
+
+        st.download_button(
+            "Download trace (JSON lines)",
+            trace.to_jsonl(),
+            file_name=f"trace_{trace.id}.jsonl",
+            mime="application/jsonl"
+        )
@@ -9,11 +9,18 @@ Comprehensive validation of SEC-fetched financial data with:
 - Leverage ratios
 - Financial health indicators
 - Data quality flags
+
+Every check is a row of the RULES table, evaluated as column expressions:
+validate_batch() screens a whole DataFrame universe in one pass, and
+validate_all() runs the same rules for a single company.
 """
 
-from typing import Tuple, List, Dict
+from typing import Callable, Dict, List, NamedTuple, Tuple
 import logging
 
+import numpy as np
+import pandas as pd
+
 logger = logging.getLogger(__name__)
 
 
@@ -67,243 +74,66 @@ class FinancialDataValidator:
         Returns:
             Tuple: (is_valid, errors_list, warnings_list)
         """
+        verbose = logger.isEnabledFor(logging.INFO)
+        
         self.errors = []
         self.warnings = []
-        
-        # Run all validation checks
-        self._validate_scale_checks(inputs)
-        self._validate_profitability(inputs)
-        self._validate_leverage(inputs)
-        self._validate_liquidity(inputs)
-        self._validate_margins(inputs)
-        self._validate_growth_consistency(inputs)
-        self._validate_data_completeness(inputs)
+        section = None
+        
+        with np.errstate(all="ignore"):
+            m = _Metrics(inputs)
+            for rule in (RULES if verbose else _CHECKS):
+                if verbose and rule.section != section:
+                    section = rule.section
+                    logger.info(section)
+                if not rule.when(self, m):
+                    continue
+                
+                message = rule.message(self, m)
+                if rule.level == "error":
+                    self.errors.append(message)
+                elif rule.level == "warning":
+                    self.warnings.append(message)
+                else:
+                    logger.info(message)
         
         is_valid = len(self.errors) == 0
         
         # Log results
-        logger.info(f"\nValidation Summary for {self.company_name}:")
-        logger.info(f"  Status: {'✓ VALID' if is_valid else '✗ INVALID'}")
-        logger.info(f"  Errors:   {len(self.errors)}")
-        logger.info(f"  Warnings: {len(self.warnings)}")
+        if verbose:
+            logger.info(f"\nValidation Summary for {self.company_name}:")
+            logger.info(f"  Status: {'✓ VALID' if is_valid else '✗ INVALID'}")
+            logger.info(f"  Errors:   {len(self.errors)}")
+            logger.info(f"  Warnings: {len(self.warnings)}")
         
         return is_valid, self.errors, self.warnings
     
-    def _validate_scale_checks(self, inputs: Dict) -> None:
-        """Check if financial metrics are in realistic ranges"""
-        
-        logger.info("\n[1/6] SCALE CHECKS")
-        
-        # Revenue validation
-        revenue = inputs.get('revenue', 0)
-        if revenue < self.REVENUE_MIN_M:
-            self.errors.append(f"Revenue ${revenue:.0f}M below minimum threshold ($1M)")
-        elif revenue > self.REVENUE_MAX_M:
-            self.errors.append(f"Revenue ${revenue:.0f}M exceeds maximum threshold ($1T)")
-        else:
-            logger.info(f"  ✓ Revenue: ${revenue:,.0f}M (valid)")
-        
-        # Shares outstanding validation
-        shares = inputs.get('shares', 0)
-        shares_m = shares / 1e6
-        if shares_m < self.SHARES_MIN_M:
-            self.errors.append(f"Shares {shares_m:.2f}M below minimum ($0.1M)")
-        elif shares_m > self.SHARES_MAX_M:
-            self.errors.append(f"Shares {shares_m:.1f}M exceeds maximum (10B)")
-        else:
-            logger.info(f"  ✓ Shares: {shares_m:,.1f}M (valid)")
-        
-        # EBIT validation
-        ebit = inputs.get('ebit', 0)
-        if revenue > 0:
-            ebit_margin = ebit / revenue
-            if ebit_margin < self.EBIT_MARGIN_MIN:
-                self.errors.append(f"EBIT margin {ebit_margin:.1%} below minimum (-50%)")
-            elif ebit_margin > self.EBIT_MARGIN_MAX:
-                self.errors.append(f"EBIT margin {ebit_margin:.1%} exceeds maximum (+70%)")
-            else:
-                logger.info(f"  ✓ EBIT Margin: {ebit_margin:.1%} (valid)")
-    
-    def _validate_profitability(self, inputs: Dict) -> None:
-        """Check profitability metrics"""
-        
-        logger.info("\n[2/6] PROFITABILITY CHECKS")
-        
-        revenue = inputs.get('revenue', 1)
-        ebit = inputs.get('ebit', 0)
-        net_income = inputs.get('net_income', 0)
-        
-        # Unprofitable company check
-        if ebit < 0:
-            self.warnings.append("EBIT is negative (unprofitable operations)")
-        else:
-            logger.info(f"  ✓ EBIT Positive: ${ebit:,.0f}M")
-        
-        if net_income < 0:
-            self.warnings.append("Net income negative (company loss-making)")
-        else:
-            logger.info(f"  ✓ Net Income Positive: ${net_income:,.0f}M")
-        
-        # EBIT to Net Income ratio
-        if ebit > 0 and net_income > 0:
-            ni_to_ebit = net_income / ebit
-            if ni_to_ebit < 0.30 or ni_to_ebit > 1.0:
-                self.warnings.append(f"Net Income/EBIT ratio {ni_to_ebit:.1%} unusual (check for taxes/interest)")
-    
-    def _validate_leverage(self, inputs: Dict) -> None:
-        """Check debt and leverage ratios"""
-        
-        logger.info("\n[3/6] LEVERAGE CHECKS")
-        
-        ebit = inputs.get('ebit', 1)
-        interest_exp = inputs.get('interest_exp', 0)
-        debt = inputs.get('debt', 0)
-        cash = inputs.get('cash', 0)
-        
-        # Interest coverage ratio
-        if interest_exp > 0:
-            ic = ebit / interest_exp
-            
-            if ic > self.INTEREST_COVERAGE_EXCELLENT:
-                rating = "AAA/AA (Excellent)"
-                logger.info(f"  ✓ Interest Coverage: {ic:.2f}x [{rating}]")
-            elif ic > self.INTEREST_COVERAGE_HEALTHY:
-                rating = "A (Strong)"
-                logger.info(f"  ✓ Interest Coverage: {ic:.2f}x [{rating}]")
-            elif ic > self.INTEREST_COVERAGE_ADEQUATE:
-                rating = "BBB (Acceptable)"
-                self.warnings.append(f"Interest coverage {ic:.2f}x [{rating}] - moderate debt risk")
-            elif ic > self.INTEREST_COVERAGE_WEAK:
-                rating = "BB (High-Yield)"
-                self.warnings.append(f"Interest coverage {ic:.2f}x [{rating}] - elevated debt risk")
-            else:
-                rating = "B/Default (Distressed)"
-                self.errors.append(f"Interest coverage {ic:.2f}x [{rating}] - acute default risk")
-        else:
-            if debt > 0:
-                self.warnings.append("Debt reported but no interest expense (data inconsistency)")
-        
-        # Debt-to-Equity ratio
-        if debt > 0:
-            # Equity value = market cap
-            equity_value = inputs.get('current_price', 0) * inputs.get('shares', 1) / 1e6
-            if equity_value > 0:
-                de_ratio = debt / equity_value
-                
-                if de_ratio < 0.5:
-                    logger.info(f"  ✓ Debt-to-Equity: {de_ratio:.2f}x (conservative)")
-                elif de_ratio < self.DEBT_TO_EQUITY_WARNING:
-                    logger.info(f"  ✓ Debt-to-Equity: {de_ratio:.2f}x (normal)")
-                elif de_ratio < self.DEBT_TO_EQUITY_ERROR:
-                    self.warnings.append(f"Debt-to-Equity {de_ratio:.2f}x (elevated leverage)")
-                else:
-                    self.errors.append(f"Debt-to-Equity {de_ratio:.2f}x (excessive leverage)")
-        
-        # Net debt analysis
-        net_debt = debt - cash
-        if net_debt < 0:
-            logger.info(f"  ✓ Net Cash Position: ${-net_debt:,.0f}M (positive)")
-        else:
-            logger.info(f"  ✓ Net Debt: ${net_debt:,.0f}M")
-    
-    def _validate_liquidity(self, inputs: Dict) -> None:
-        """Check liquidity and working capital metrics"""
-        
-        logger.info("\n[4/6] LIQUIDITY CHECKS")
-        
-        cash = inputs.get('cash', 0)
-        debt = inputs.get('debt', 0)
-        
-        # Cash position relative to revenue
-        revenue = inputs.get('revenue', 1)
-        cash_to_revenue = cash / revenue if revenue > 0 else 0
-        
-        if cash_to_revenue < 0.01:
-            self.warnings.append(f"Cash/Revenue {cash_to_revenue:.1%} very low (liquidity squeeze)")
-        elif cash_to_revenue > 0.50:
-            logger.info(f"  ✓ Cash Position: {cash_to_revenue:.1%} of revenue (strong)")
-        else:
-            logger.info(f"  ✓ Cash Position: {cash_to_revenue:.1%} of revenue (normal)")
-        
-        # Cash relative to debt
-        if debt > 0:
-            cash_to_debt = cash / debt
-            if cash_to_debt > 1.0:
-                logger.info(f"  ✓ Cash covers all debt {cash_to_debt:.1f}x (strong position)")
-            elif cash_to_debt > 0.5:
-                logger.info(f"  ✓ Cash covers {cash_to_debt:.1%} of debt")
-            elif cash_to_debt > 0.1:
-                self.warnings.append(f"Cash only covers {cash_to_debt:.1%} of debt")
-            else:
-                self.warnings.append(f"Minimal cash vs debt (refinancing risk)")
-    
-    def _validate_margins(self, inputs: Dict) -> None:
-        """Check operating margins and efficiency"""
-        
-        logger.info("\n[5/6] MARGIN CHECKS")
-        
-        revenue = inputs.get('revenue', 1)
-        ebit = inputs.get('ebit', 0)
-        net_income = inputs.get('net_income', 0)
-        
-        # EBIT margin
-        if revenue > 0:
-            ebit_margin = ebit / revenue
-            if ebit_margin < 0:
-                logger.info(f"  ⚠ EBIT Margin: {ebit_margin:.1%} (unprofitable)")
-            elif ebit_margin < 0.05:
-                self.warnings.append(f"EBIT margin {ebit_margin:.1%} low (thin operations)")
-            elif ebit_margin > 0.40:
-                logger.info(f"  ✓ EBIT Margin: {ebit_margin:.1%} (strong/premium)")
-            else:
-                logger.info(f"  ✓ EBIT Margin: {ebit_margin:.1%} (normal)")
-            
-            # Net margin
-            net_margin = net_income / revenue
-            if net_margin < 0:
-                logger.info(f"  ⚠ Net Margin: {net_margin:.1%} (unprofitable)")
-            elif net_margin < ebit_margin - 0.15:
-                self.warnings.append(f"High interest/tax burden reducing net margin")
-            else:
-                logger.info(f"  ✓ Net Margin: {net_margin:.1%}")
-    
-    def _validate_growth_consistency(self, inputs: Dict) -> None:
-        """Check for data consistency issues related to growth"""
-        
-        logger.info("\n[6/6] GROWTH CONSISTENCY CHECKS")
-        
-        revenue = inputs.get('revenue', 0)
-        ebit = inputs.get('ebit', 0)
-        net_income = inputs.get('net_income', 0)
-        
-        # Sanity: Is operating income less than revenue?
-        if revenue > 0 and ebit > revenue:
-            self.warnings.append("EBIT exceeds revenue (possible data error)")
-        
-        # Sanity: Is net income less than EBIT (should be with taxes)?
-        if ebit > 0 and net_income > ebit:
-            self.warnings.append("Net income exceeds EBIT (data inconsistency)")
+    def validate_batch(self, frame: pd.DataFrame) -> Tuple[pd.Series, pd.DataFrame, pd.DataFrame]:
+        """
+        Run every rule over a whole universe at once
         
-        logger.info("  ✓ No critical growth inconsistencies detected")
-    
-    def _validate_data_completeness(self, inputs: Dict) -> None:
-        """Check for missing critical data fields"""
+        Args:
+            frame: One row per company, one column per input field
+                   (missing / NaN values get the same defaults as validate_all)
         
-        logger.info("\n[COMPLETENESS CHECK]")
+        Returns:
+            Tuple: (is_valid, errors, warnings) - a boolean Series, and one
+            boolean column per error / warning rule, all indexed like ``frame``.
+            validate_all(frame.loc[i].to_dict()) gives the messages for a row.
+        """
+        masks = {"error": {}, "warning": {}}
         
-        required_fields = [
-            'revenue', 'ebit', 'net_income', 'shares', 
-            'debt', 'cash', 'current_price'
-        ]
+        with np.errstate(all="ignore"):
+            m = _Metrics(frame)
+            for rule in _CHECKS:
+                masks[rule.level][rule.name] = np.broadcast_to(rule.when(self, m), len(frame))
         
-        missing = [f for f in required_fields if f not in inputs or inputs[f] is None]
+        errors = pd.DataFrame(masks["error"], index=frame.index)
+        warnings = pd.DataFrame(masks["warning"], index=frame.index)
         
-        if missing:
-            self.warnings.append(f"Missing fields: {', '.join(missing)}")
-        else:
-            logger.info("  ✓ All critical fields present")
+        return ~errors.any(axis=1), errors, warnings
     
-    def get_health_score(self, inputs: Dict) -> float:
+    def get_health_score(self, inputs):
         """
         Calculate overall financial health score (0-100)
         
@@ -313,37 +143,295 @@ class FinancialDataValidator:
         - Liquidity (20%)
         - Margins (20%)
         - Growth consistency (10%)
-        """
-        
-        score = 100
-        
-        # Profitability penalty
-        revenue = inputs.get('revenue', 1)
-        net_income = inputs.get('net_income', 0)
-        if revenue > 0:
-            net_margin = net_income / revenue
-            if net_margin < 0.02:
-                score -= 15  # Low profitability
-            elif net_margin > 0.20:
-                score -= 5   # Unusually high (might need validation)
         
-        # Leverage penalty
-        ebit = inputs.get('ebit', 1)
-        interest_exp = inputs.get('interest_exp', 0)
-        if interest_exp > 0:
-            ic = ebit / interest_exp
-            if ic < 1.5:
-                score -= 20  # High default risk
-            elif ic < 2.5:
-                score -= 10  # Moderate risk
+        ``inputs`` may be a dict (returns a number) or a DataFrame of many
+        companies (returns a Series indexed like it).
+        """
+        with np.errstate(all="ignore"):
+            m = _Metrics(inputs)
+            score = 100
+            
+            # Profitability penalty
+            score = score - np.where(
+                m.revenue_or_1 > 0,
+                np.where(m.net_margin < 0.02, 15, np.where(m.net_margin > 0.20, 5, 0)),  # Low / unusually high
+                0
+            )
+            
+            # Leverage penalty
+            score = score - np.where(
+                m.has_coverage,
+                np.where(m.coverage < 1.5, 20, np.where(m.coverage < 2.5, 10, 0)),  # High default / moderate risk
+                0
+            )
+            
+            # Liquidity check
+            score = score - np.where((m.debt > 0) & (m.cash < m.debt * 0.10), 10, 0)  # Limited liquidity
         
-        # Liquidity check
-        cash = inputs.get('cash', 0)
-        debt = inputs.get('debt', 0)
-        if debt > 0 and cash < debt * 0.10:
-            score -= 10  # Limited liquidity
+        score = np.maximum(0, score)  # Floor at 0
+        if isinstance(inputs, pd.DataFrame):
+            return pd.Series(score, index=inputs.index, name="health_score")
+        return int(score)
+
+
+REQUIRED_FIELDS = [
+    'revenue', 'ebit', 'net_income', 'shares',
+    'debt', 'cash', 'current_price'
+]
+
+
+class _Metrics:
+    """
+    Every input and ratio the rules read, computed once per validation:
+    float64 arrays (one value per company) for a DataFrame, numpy scalars
+    for a single dict. Missing / None / NaN fields take the same defaults
+    the checks have always used (0, or 1 where a divisor is involved).
+    """
+    
+    def __init__(self, inputs):
+        batch = isinstance(inputs, pd.DataFrame)
+        if batch:
+            n = len(inputs)
+            raw = {
+                f: pd.to_numeric(inputs[f], errors="coerce").to_numpy(np.float64)
+                   if f in inputs else np.full(n, np.nan)
+                for f in _FIELDS
+            }
+            self.always = np.ones(n, dtype=bool)
+        else:
+            raw = {f: _to_float(inputs.get(f)) for f in _FIELDS}
+            self.always = True
+        
+        self.missing = [raw[f] != raw[f] for f in REQUIRED_FIELDS]      # NaN
+        self.any_missing = np.any(self.missing, axis=0) if batch else np.bool_(any(self.missing))
+        
+        def field(name, default):
+            value = raw[name]
+            if batch:
+                return np.where(value != value, default, value)
+            return np.float64(default) if value != value else value
+        
+        self.revenue = field('revenue', 0)
+        self.revenue_or_1 = field('revenue', 1)
+        self.ebit = field('ebit', 0)
+        self.ebit_or_1 = field('ebit', 1)
+        self.net_income = field('net_income', 0)
+        self.shares = field('shares', 0)
+        self.debt = field('debt', 0)
+        self.cash = field('cash', 0)
+        self.interest_exp = field('interest_exp', 0)
+        
+        self.shares_m = self.shares / 1e6
+        self.scale_margin = self.ebit / self.revenue
+        self.ni_to_ebit = self.net_income / self.ebit
+        
+        self.has_coverage = self.interest_exp > 0
+        self.coverage = self.ebit_or_1 / self.interest_exp
+        
+        # Equity value = market cap
+        equity_value = field('current_price', 0) * field('shares', 1) / 1e6
+        self.has_debt_to_equity = (self.debt > 0) & (equity_value > 0)
+        self.debt_to_equity = self.debt / equity_value
+        self.net_debt = self.debt - self.cash
+        
+        if batch:
+            self.cash_to_revenue = np.where(self.revenue_or_1 > 0, self.cash / self.revenue_or_1, 0.0)
+        else:
+            self.cash_to_revenue = self.cash / self.revenue_or_1 if self.revenue_or_1 > 0 else np.float64(0.0)
+        self.cash_to_debt = self.cash / self.debt
         
-        return max(0, score)  # Floor at 0
+        self.ebit_margin = self.ebit / self.revenue_or_1
+        self.net_margin = self.net_income / self.revenue_or_1
+
+
+_FIELDS = REQUIRED_FIELDS + ['interest_exp']
+
+
+def _to_float(value) -> float:
+    try:
+        return np.float64(value if value is not None else np.nan)
+    except (TypeError, ValueError):
+        return np.float64(np.nan)
+
+
+class _Rule(NamedTuple):
+    name: str
+    section: str        # log header the rule belongs to
+    level: str          # "error", "warning" or "info" (logged only)
+    when: Callable      # (validator, metrics) -> bool / boolean array
+    message: Callable   # (validator, metrics) -> str, for a single company
+
+
+_SCALE = "\n[1/6] SCALE CHECKS"
+_PROFITABILITY = "\n[2/6] PROFITABILITY CHECKS"
+_LEVERAGE = "\n[3/6] LEVERAGE CHECKS"
+_LIQUIDITY = "\n[4/6] LIQUIDITY CHECKS"
+_MARGINS = "\n[5/6] MARGIN CHECKS"
+_GROWTH = "\n[6/6] GROWTH CONSISTENCY CHECKS"
+_COMPLETENESS = "\n[COMPLETENESS CHECK]"
+
+# Evaluated in this order, which is also the order of the messages
+RULES = [
+    # Scale checks: realistic ranges
+    _Rule("revenue_below_min", _SCALE, "error",
+          lambda v, m: m.revenue < v.REVENUE_MIN_M,
+          lambda v, m: f"Revenue ${m.revenue:.0f}M below minimum threshold ($1M)"),
+    _Rule("revenue_above_max", _SCALE, "error",
+          lambda v, m: m.revenue > v.REVENUE_MAX_M,
+          lambda v, m: f"Revenue ${m.revenue:.0f}M exceeds maximum threshold ($1T)"),
+    _Rule("revenue_ok", _SCALE, "info",
+          lambda v, m: ~(m.revenue < v.REVENUE_MIN_M) & ~(m.revenue > v.REVENUE_MAX_M),
+          lambda v, m: f"  ✓ Revenue: ${m.revenue:,.0f}M (valid)"),
+    _Rule("shares_below_min", _SCALE, "error",
+          lambda v, m: m.shares_m < v.SHARES_MIN_M,
+          lambda v, m: f"Shares {m.shares_m:.2f}M below minimum ($0.1M)"),
+    _Rule("shares_above_max", _SCALE, "error",
+          lambda v, m: m.shares_m > v.SHARES_MAX_M,
+          lambda v, m: f"Shares {m.shares_m:.1f}M exceeds maximum (10B)"),
+    _Rule("shares_ok", _SCALE, "info",
+          lambda v, m: ~(m.shares_m < v.SHARES_MIN_M) & ~(m.shares_m > v.SHARES_MAX_M),
+          lambda v, m: f"  ✓ Shares: {m.shares_m:,.1f}M (valid)"),
+    _Rule("ebit_margin_below_min", _SCALE, "error",
+          lambda v, m: (m.revenue > 0) & (m.scale_margin < v.EBIT_MARGIN_MIN),
+          lambda v, m: f"EBIT margin {m.scale_margin:.1%} below minimum (-50%)"),
+    _Rule("ebit_margin_above_max", _SCALE, "error",
+          lambda v, m: (m.revenue > 0) & (m.scale_margin > v.EBIT_MARGIN_MAX),
+          lambda v, m: f"EBIT margin {m.scale_margin:.1%} exceeds maximum (+70%)"),
+    _Rule("ebit_margin_ok", _SCALE, "info",
+          lambda v, m: (m.revenue > 0) & ~(m.scale_margin < v.EBIT_MARGIN_MIN)
+                       & ~(m.scale_margin > v.EBIT_MARGIN_MAX),
+          lambda v, m: f"  ✓ EBIT Margin: {m.scale_margin:.1%} (valid)"),
+
+    # Profitability
+    _Rule("ebit_negative", _PROFITABILITY, "warning",
+          lambda v, m: m.ebit < 0,
+          lambda v, m: "EBIT is negative (unprofitable operations)"),
+    _Rule("ebit_positive", _PROFITABILITY, "info",
+          lambda v, m: ~(m.ebit < 0),
+          lambda v, m: f"  ✓ EBIT Positive: ${m.ebit:,.0f}M"),
+    _Rule("net_income_negative", _PROFITABILITY, "warning",
+          lambda v, m: m.net_income < 0,
+          lambda v, m: "Net income negative (company loss-making)"),
+    _Rule("net_income_positive", _PROFITABILITY, "info",
+          lambda v, m: ~(m.net_income < 0),
+          lambda v, m: f"  ✓ Net Income Positive: ${m.net_income:,.0f}M"),
+    _Rule("net_income_to_ebit_unusual", _PROFITABILITY, "warning",
+          lambda v, m: (m.ebit > 0) & (m.net_income > 0) & ((m.ni_to_ebit < 0.30) | (m.ni_to_ebit > 1.0)),
+          lambda v, m: f"Net Income/EBIT ratio {m.ni_to_ebit:.1%} unusual (check for taxes/interest)"),
+
+    # Leverage: interest coverage, debt-to-equity, net debt
+    _Rule("interest_coverage_excellent", _LEVERAGE, "info",
+          lambda v, m: m.has_coverage & (m.coverage > v.INTEREST_COVERAGE_EXCELLENT),
+          lambda v, m: f"  ✓ Interest Coverage: {m.coverage:.2f}x [AAA/AA (Excellent)]"),
+    _Rule("interest_coverage_strong", _LEVERAGE, "info",
+          lambda v, m: m.has_coverage & ~(m.coverage > v.INTEREST_COVERAGE_EXCELLENT)
+                       & (m.coverage > v.INTEREST_COVERAGE_HEALTHY),
+          lambda v, m: f"  ✓ Interest Coverage: {m.coverage:.2f}x [A (Strong)]"),
+    _Rule("interest_coverage_bbb", _LEVERAGE, "warning",
+          lambda v, m: m.has_coverage & ~(m.coverage > v.INTEREST_COVERAGE_HEALTHY)
+                       & (m.coverage > v.INTEREST_COVERAGE_ADEQUATE),
+          lambda v, m: f"Interest coverage {m.coverage:.2f}x [BBB (Acceptable)] - moderate debt risk"),
+    _Rule("interest_coverage_bb", _LEVERAGE, "warning",
+          lambda v, m: m.has_coverage & ~(m.coverage > v.INTEREST_COVERAGE_ADEQUATE)
+                       & (m.coverage > v.INTEREST_COVERAGE_WEAK),
+          lambda v, m: f"Interest coverage {m.coverage:.2f}x [BB (High-Yield)] - elevated debt risk"),
+    _Rule("interest_coverage_distressed", _LEVERAGE, "error",
+          lambda v, m: m.has_coverage & ~(m.coverage > v.INTEREST_COVERAGE_WEAK),
+          lambda v, m: f"Interest coverage {m.coverage:.2f}x [B/Default (Distressed)] - acute default risk"),
+    _Rule("debt_without_interest", _LEVERAGE, "warning",
+          lambda v, m: ~m.has_coverage & (m.debt > 0),
+          lambda v, m: "Debt reported but no interest expense (data inconsistency)"),
+    _Rule("leverage_conservative", _LEVERAGE, "info",
+          lambda v, m: m.has_debt_to_equity & (m.debt_to_equity < 0.5),
+          lambda v, m: f"  ✓ Debt-to-Equity: {m.debt_to_equity:.2f}x (conservative)"),
+    _Rule("leverage_normal", _LEVERAGE, "info",
+          lambda v, m: m.has_debt_to_equity & ~(m.debt_to_equity < 0.5)
+                       & (m.debt_to_equity < v.DEBT_TO_EQUITY_WARNING),
+          lambda v, m: f"  ✓ Debt-to-Equity: {m.debt_to_equity:.2f}x (normal)"),
+    _Rule("leverage_elevated", _LEVERAGE, "warning",
+          lambda v, m: m.has_debt_to_equity & ~(m.debt_to_equity < v.DEBT_TO_EQUITY_WARNING)
+                       & (m.debt_to_equity < v.DEBT_TO_EQUITY_ERROR),
+          lambda v, m: f"Debt-to-Equity {m.debt_to_equity:.2f}x (elevated leverage)"),
+    _Rule("leverage_excessive", _LEVERAGE, "error",
+          lambda v, m: m.has_debt_to_equity & ~(m.debt_to_equity < v.DEBT_TO_EQUITY_ERROR),
+          lambda v, m: f"Debt-to-Equity {m.debt_to_equity:.2f}x (excessive leverage)"),
+    _Rule("net_cash", _LEVERAGE, "info",
+          lambda v, m: m.net_debt < 0,
+          lambda v, m: f"  ✓ Net Cash Position: ${-m.net_debt:,.0f}M (positive)"),
+    _Rule("net_debt", _LEVERAGE, "info",
+          lambda v, m: ~(m.net_debt < 0),
+          lambda v, m: f"  ✓ Net Debt: ${m.net_debt:,.0f}M"),
+
+    # Liquidity: cash vs revenue and debt
+    _Rule("cash_to_revenue_low", _LIQUIDITY, "warning",
+          lambda v, m: m.cash_to_revenue < 0.01,
+          lambda v, m: f"Cash/Revenue {m.cash_to_revenue:.1%} very low (liquidity squeeze)"),
+    _Rule("cash_to_revenue_strong", _LIQUIDITY, "info",
+          lambda v, m: ~(m.cash_to_revenue < 0.01) & (m.cash_to_revenue > 0.50),
+          lambda v, m: f"  ✓ Cash Position: {m.cash_to_revenue:.1%} of revenue (strong)"),
+    _Rule("cash_to_revenue_normal", _LIQUIDITY, "info",
+          lambda v, m: ~(m.cash_to_revenue < 0.01) & ~(m.cash_to_revenue > 0.50),
+          lambda v, m: f"  ✓ Cash Position: {m.cash_to_revenue:.1%} of revenue (normal)"),
+    _Rule("cash_covers_debt", _LIQUIDITY, "info",
+          lambda v, m: (m.debt > 0) & (m.cash_to_debt > 1.0),
+          lambda v, m: f"  ✓ Cash covers all debt {m.cash_to_debt:.1f}x (strong position)"),
+    _Rule("cash_covers_half_debt", _LIQUIDITY, "info",
+          lambda v, m: (m.debt > 0) & ~(m.cash_to_debt > 1.0) & (m.cash_to_debt > 0.5),
+          lambda v, m: f"  ✓ Cash covers {m.cash_to_debt:.1%} of debt"),
+    _Rule("cash_to_debt_low", _LIQUIDITY, "warning",
+          lambda v, m: (m.debt > 0) & ~(m.cash_to_debt > 0.5) & (m.cash_to_debt > 0.1),
+          lambda v, m: f"Cash only covers {m.cash_to_debt:.1%} of debt"),
+    _Rule("cash_to_debt_minimal", _LIQUIDITY, "warning",
+          lambda v, m: (m.debt > 0) & ~(m.cash_to_debt > 0.1),
+          lambda v, m: "Minimal cash vs debt (refinancing risk)"),
+
+    # Margins: operating and net
+    _Rule("ebit_margin_negative", _MARGINS, "info",
+          lambda v, m: (m.revenue_or_1 > 0) & (m.ebit_margin < 0),
+          lambda v, m: f"  ⚠ EBIT Margin: {m.ebit_margin:.1%} (unprofitable)"),
+    _Rule("ebit_margin_thin", _MARGINS, "warning",
+          lambda v, m: (m.revenue_or_1 > 0) & ~(m.ebit_margin < 0) & (m.ebit_margin < 0.05),
+          lambda v, m: f"EBIT margin {m.ebit_margin:.1%} low (thin operations)"),
+    _Rule("ebit_margin_premium", _MARGINS, "info",
+          lambda v, m: (m.revenue_or_1 > 0) & ~(m.ebit_margin < 0.05) & (m.ebit_margin > 0.40),
+          lambda v, m: f"  ✓ EBIT Margin: {m.ebit_margin:.1%} (strong/premium)"),
+    _Rule("ebit_margin_normal", _MARGINS, "info",
+          lambda v, m: (m.revenue_or_1 > 0) & ~(m.ebit_margin < 0.05) & ~(m.ebit_margin > 0.40),
+          lambda v, m: f"  ✓ EBIT Margin: {m.ebit_margin:.1%} (normal)"),
+    _Rule("net_margin_negative", _MARGINS, "info",
+          lambda v, m: (m.revenue_or_1 > 0) & (m.net_margin < 0),
+          lambda v, m: f"  ⚠ Net Margin: {m.net_margin:.1%} (unprofitable)"),
+    _Rule("net_margin_squeezed", _MARGINS, "warning",
+          lambda v, m: (m.revenue_or_1 > 0) & ~(m.net_margin < 0) & (m.net_margin < m.ebit_margin - 0.15),
+          lambda v, m: "High interest/tax burden reducing net margin"),
+    _Rule("net_margin_ok", _MARGINS, "info",
+          lambda v, m: (m.revenue_or_1 > 0) & ~(m.net_margin < 0) & ~(m.net_margin < m.ebit_margin - 0.15),
+          lambda v, m: f"  ✓ Net Margin: {m.net_margin:.1%}"),
+
+    # Growth consistency: sanity of the income statement
+    _Rule("ebit_exceeds_revenue", _GROWTH, "warning",
+          lambda v, m: (m.revenue > 0) & (m.ebit > m.revenue),
+          lambda v, m: "EBIT exceeds revenue (possible data error)"),
+    _Rule("net_income_exceeds_ebit", _GROWTH, "warning",
+          lambda v, m: (m.ebit > 0) & (m.net_income > m.ebit),
+          lambda v, m: "Net income exceeds EBIT (data inconsistency)"),
+    _Rule("growth_consistent", _GROWTH, "info",
+          lambda v, m: m.always,
+          lambda v, m: "  ✓ No critical growth inconsistencies detected"),
+
+    # Completeness: critical fields present
+    _Rule("missing_fields", _COMPLETENESS, "warning",
+          lambda v, m: m.any_missing,
+          lambda v, m: "Missing fields: " + ", ".join(
+              f for f, missing in zip(REQUIRED_FIELDS, m.missing) if missing
+          )),
+    _Rule("fields_complete", _COMPLETENESS, "info",
+          lambda v, m: ~m.any_missing,
+          lambda v, m: "  ✓ All critical fields present"),
+]
+
+# Rules that produce errors / warnings (info rules only feed the log)
+_CHECKS = [rule for rule in RULES if rule.level != "info"]
 
 
 def validate_sec_inputs(inputs: Dict, company_name: str = "") -> Tuple[bool, Dict]:
@@ -1 +1,68 @@
+# modules/__init__.py
+"""
+Modules Package - Core Valuation Engine and Data Fetcher
+Mountain Path Valuation Terminal
 
+Public names are resolved on first use (PEP 562), so ``import modules``
+and ``from modules import X`` only load the submodule that defines X.
+Heavy optional dependencies (yfinance, scipy, pyarrow, pyinstrument) are
+imported inside the functions that need them, never at module import.
+"""
+
+import importlib
+
+__version__ = '1.0.0'
+__author__ = 'Prof. V. Ravichandran'
+
+# public name -> defining submodule
+_EXPORTS = {
+    # Data
+    'SECDataFetcher': 'data_fetcher_SIMPLE',
+    'VALUATION_TAGS': 'data_fetcher',
+    'get_cik_from_ticker': 'data_fetcher',
+    'get_company_facts': 'data_fetcher',
+    'get_company_xbrl': 'data_fetcher',
+    'extract_series': 'data_fetcher',
+    'get_market_data': 'market_data',
+    'set_market_data': 'market_data',
+    'StaticMarketData': 'market_data',
+    'YahooMarketData': 'market_data',
+
+    # FCFF pipeline
+    'classify_company': 'company_classifier',
+    'get_base_year_operating_data': 'base_year',
+    'project_fcff': 'fcff_projection',
+    'dcf_valuation': 'dcf',
+    'dcf_valuation_batch': 'dcf',
+    'dcf_sensitivities': 'dcf',
+    'calculate_wacc': 'wacc',
+    'get_net_debt': 'net_debt',
+    'get_share_count': 'equity',
+
+    # Multi-model valuation
+    'run_multi_valuation': 'valuation_engine',
+    'calculate_sensitivity': 'valuation_engine',
+    'calculate_sensitivity_grid': 'valuation_engine',
+    'valuation_sensitivities': 'valuation_engine',
+    'run_monte_carlo': 'monte_carlo',
+    'default_distributions': 'monte_carlo',
+    'run_backtest': 'backtest',
+    'point_in_time_inputs': 'backtest',
+    'implied_parameter': 'reverse_dcf',
+    'implied_expectations': 'reverse_dcf',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    submodule = _EXPORTS.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{submodule}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
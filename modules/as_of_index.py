@@ -0,0 +1,172 @@
+import numpy as np
+
+
+# Filing dates are packed under period ends in one int64 search key;
+# datetime64[D] day numbers fit comfortably in 21 bits either side of 1970
+_FILED_BITS = 21
+_FILED_OFFSET = 1 << (_FILED_BITS - 1)
+_LAST_FILED = (1 << _FILED_BITS) - 1
+
+
+class AsOfIndex:
+    """
+    As-of lookups over one fact series: the rows of a FactIndex for a tag
+    list (in priority order) in one unit.
+
+    Sorted keys and running "best fact so far" tables are built once per
+    query kind, in O(n log n); every query is then a binary search
+    (O(log n)), vectorized over any number of dates:
+
+    - latest_annual(as_of): series() semantics - latest fiscal year among
+      facts filed on or before each date (what a 10-K reader knew then)
+    - latest_period(as_of): latest period end, last fact winning ties
+      (SECDataFetcher's rule), optionally restricted to facts filed by then
+    - period(end, as_of): the value for the period ending ``end`` from the
+      latest filing (amendment / restatement) made on or before ``as_of``
+
+    Facts without a filing date are only seen by latest_period() without
+    ``as_of``. Each query returns {"found", "Year", "val", "end", "filed",
+    "row"} arrays aligned with its input (NaN / NaT / -1 where not found);
+    "row" indexes the parent FactIndex.
+    """
+
+    def __init__(self, rows: np.ndarray, fy: np.ndarray, end: np.ndarray, filed: np.ndarray, val: np.ndarray):
+        self.rows = rows
+        self.fy = fy
+        self.end = end
+        self.filed = filed
+        self.val = val
+
+        self._annual = None         # (filed days ascending, best local row per prefix)
+        self._latest = None
+        self._last = None           # local row of latest_period() over every fact
+        self._periods = None        # (packed end/filed keys ascending, local rows)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Approximate memory held, counting the query tables at full size
+        whether built yet or not, so the figure does not change with use
+        """
+        columns = sum(a.nbytes for a in (self.rows, self.fy, self.end, self.filed, self.val))
+        # Three tables of two int64 arrays, at most one entry per row
+        return columns + 3 * 2 * 8 * len(self.rows)
+
+    # ---------------------------------------------
+    # QUERIES
+    # ---------------------------------------------
+    def latest_annual(self, as_of) -> dict:
+        """
+        Latest fiscal-year fact filed on or before each date; earlier rows
+        (earlier tags) win ties within a year
+        """
+        if self._annual is None:
+            eligible = np.flatnonzero(~np.isnan(self.fy) & ~np.isnat(self.filed))
+            # Rank: higher fiscal year first, then lower priority position
+            self._annual = _running_best(eligible, self.filed, (-eligible, self.fy[eligible]))
+        return self._prefix_query(self._annual, as_of)
+
+    def latest_period(self, as_of=None) -> dict:
+        """
+        Fact with the latest period end (the last one among equal ends),
+        overall or among facts filed on or before each date in ``as_of``
+        """
+        if as_of is not None:
+            if self._latest is None:
+                eligible = np.flatnonzero(~np.isnat(self.end) & ~np.isnat(self.filed))
+                self._latest = _running_best(eligible, self.filed, (eligible, _days(self.end[eligible])))
+            return self._prefix_query(self._latest, as_of)
+
+        if self._last is None:
+            eligible = np.flatnonzero(~np.isnat(self.end))
+            ends = _days(self.end[eligible])
+            # Last maximum, as a stable sort by end followed by [-1] would pick
+            self._last = eligible[len(ends) - 1 - np.argmax(ends[::-1])] if len(eligible) else -1
+        return self._result(np.array([self._last]))
+
+    def period(self, end, as_of=None) -> dict:
+        """
+        Value for the period ending on each date in ``end`` as reported by
+        the latest filing on or before ``as_of`` (default: latest overall)
+        """
+        if self._periods is None:
+            eligible = np.flatnonzero(~np.isnat(self.end) & ~np.isnat(self.filed))
+            keys = _pack(_days(self.end[eligible]), _days(self.filed[eligible]))
+            order = np.argsort(keys, kind="stable")
+            self._periods = (keys[order], eligible[order])
+
+        keys, local = self._periods
+        ends = _days(np.atleast_1d(np.asarray(end, dtype="datetime64[D]")))
+        limit = (
+            np.full(ends.shape, _LAST_FILED - _FILED_OFFSET)
+            if as_of is None
+            else np.broadcast_to(_days(np.asarray(as_of, dtype="datetime64[D]")), ends.shape)
+        )
+
+        pos = np.searchsorted(keys, _pack(ends, limit), side="right") - 1
+        if len(local) == 0:
+            return self._result(np.full(len(ends), -1))
+
+        # The key just below (end, as_of) is a hit only if it has that end
+        pick = local[np.maximum(pos, 0)]
+        hit = (pos >= 0) & (_days(self.end[pick]) == ends)
+        return self._result(np.where(hit, pick, -1))
+
+    # ---------------------------------------------
+    # INTERNALS
+    # ---------------------------------------------
+    def _prefix_query(self, table: tuple, as_of) -> dict:
+        filed, best = table
+        dates = _days(np.atleast_1d(np.asarray(as_of, dtype="datetime64[D]")))
+        pos = np.searchsorted(filed, dates, side="right") - 1
+        if len(best) == 0:
+            return self._result(np.full(len(dates), -1))
+        return self._result(np.where(pos >= 0, best[np.maximum(pos, 0)], -1))
+
+    def _result(self, local: np.ndarray) -> dict:
+        found = local >= 0
+        if len(self.rows) == 0:
+            return {
+                "found": found,
+                "Year": np.full(len(local), np.nan),
+                "val": np.full(len(local), np.nan),
+                "end": np.full(len(local), np.datetime64("NaT"), dtype="datetime64[D]"),
+                "filed": np.full(len(local), np.datetime64("NaT"), dtype="datetime64[D]"),
+                "row": np.full(len(local), -1),
+            }
+
+        safe = np.where(found, local, 0)
+        return {
+            "found": found,
+            "Year": np.where(found, self.fy[safe], np.nan),
+            "val": np.where(found, self.val[safe], np.nan),
+            "end": np.where(found, self.end[safe], np.datetime64("NaT")),
+            "filed": np.where(found, self.filed[safe], np.datetime64("NaT")),
+            "row": np.where(found, self.rows[safe], -1),
+        }
+
+
+def _days(dates: np.ndarray) -> np.ndarray:
+    return dates.astype("datetime64[D]").astype(np.int64)
+
+
+def _pack(end_days: np.ndarray, filed_days: np.ndarray) -> np.ndarray:
+    return (end_days << _FILED_BITS) | (filed_days + _FILED_OFFSET)
+
+
+def _running_best(eligible: np.ndarray, filed: np.ndarray, rank_keys: tuple) -> tuple:
+    """
+    (filing days ascending, best eligible row among all filed up to each)
+    where "best" is the lexicographic maximum of ``rank_keys`` (np.lexsort
+    order: last key primary)
+    """
+    by_rank = eligible[np.lexsort(rank_keys)]
+    rank = np.empty(len(filed), dtype=np.int64)
+    rank[by_rank] = np.arange(len(by_rank))
+
+    order = eligible[np.argsort(filed[eligible], kind="stable")]
+    best = by_rank[np.maximum.accumulate(rank[order])] if len(order) else order
+    return _days(filed[order]), best
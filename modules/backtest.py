@@ -0,0 +1,365 @@
+"""
+Point-in-time backtest of the FCFF valuation.
+
+    python -m modules.backtest AAPL MSFT NVDA --start 2015-01-01 --freq QE
+    python -m modules.backtest sp500.txt --start 2012-01-01 --prices closes.csv --wacc 0.085
+
+For every company and as-of date the base year, net debt and share count
+are rebuilt only from facts filed on or before that date, so no valuation
+uses a 10-K before investors could have read it. Fact extraction is
+vectorized across dates (one pass per company); every (company, date)
+valuation then runs as a single batch through project_fcff_batch and
+dcf_valuation_batch. The result is a long panel of fair value vs. price.
+
+WACC is an input (one rate, or one per ticker): historical betas and
+rates are not available point-in-time in this tree.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from modules.data_fetcher import VALUATION_TAGS, get_cik_from_ticker, get_company_facts
+from modules.dcf import dcf_valuation_batch
+from modules.fact_index import get_fact_index
+from modules.fcff_projection import project_fcff_batch
+from modules.instrumentation import span, timed
+from modules.market_data import download_price_history
+
+
+# -------------------------------------------------
+# GLOBAL SETTINGS
+# -------------------------------------------------
+REPORTS_DIR = Path(__file__).resolve().parent.parent / "reports"
+
+DEFAULT_WACC = 0.09
+
+DEFAULT_ASSUMPTIONS = {
+    "growth_rates": [0.10, 0.10, 0.10, 0.08, 0.08],
+    "sales_to_capital": 2.5,
+    "terminal_growth": 0.03,
+}
+
+# Same tags, in the same priority order, as the live pipeline modules
+FIELDS = {
+    # company_classifier
+    "interest_income": ["InterestIncome"],
+    # base_year
+    "revenue": ["Revenues", "SalesRevenueNet"],
+    "ebit": ["OperatingIncomeLoss"],
+    "pbt": ["IncomeBeforeTax", "IncomeLossFromContinuingOperationsBeforeIncomeTaxes"],
+    "tax": ["IncomeTaxExpenseBenefit"],
+    # net_debt
+    "cash": [
+        "CashAndCashEquivalentsAtCarryingValue",
+        "CashCashEquivalentsRestrictedCashAndRestrictedCashEquivalents",
+    ],
+    "short_debt": ["ShortTermBorrowings"],
+    "long_debt": ["LongTermDebt"],
+    # equity
+    "diluted_shares": [
+        "WeightedAverageNumberOfDilutedSharesOutstanding",
+        "WeightedAverageNumberOfShareOutstandingDiluted",
+    ],
+    "basic_shares": [
+        "WeightedAverageNumberOfSharesOutstandingBasic",
+        "WeightedAverageNumberOfShareOutstandingBasic",
+    ],
+}
+
+# Fields not reported in USD (SEC files share counts under "shares")
+UNITS = {
+    "diluted_shares": "shares",
+    "basic_shares": "shares",
+}
+
+
+# -------------------------------------------------
+# POINT-IN-TIME INPUTS
+# -------------------------------------------------
+@timed
+def point_in_time_inputs(facts, as_of) -> pd.DataFrame:
+    """
+    Valuation inputs for one company as they stood on each date in ``as_of``
+
+    ``facts`` is a companyfacts dict or FactIndex. Mirrors classify_company,
+    get_base_year_operating_data, get_net_debt and get_share_count on the
+    facts filed by each date; "status" / "error" carry what those would
+    have raised (or "skipped" for financials), as in batch_valuation.
+    """
+    dates = pd.DatetimeIndex(as_of)
+    return _inputs_frame(None, dates, _point_in_time_columns(facts, dates))
+
+
+def _inputs_frame(tickers, dates, columns: dict) -> pd.DataFrame:
+    frame = pd.DataFrame({"as_of": dates, **columns})
+    frame["fiscal_year"] = frame["fiscal_year"].astype("Int64")
+    if tickers is not None:
+        frame.insert(0, "ticker", tickers)
+    return frame
+
+
+def _point_in_time_columns(facts, dates: pd.DatetimeIndex) -> dict:
+    index = get_fact_index(facts)
+    pit = {
+        name: index.series_as_of(tags, dates, unit=UNITS.get(name, "USD"))
+        for name, tags in FIELDS.items()
+    }
+    found = {name: s["found"] for name, s in pit.items()}
+    val = {name: s["val"] for name, s in pit.items()}
+
+    # Tax rate: latest PBT and tax, clipped; 21% when either is missing
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tax_rate = np.where(
+            found["pbt"] & found["tax"] & (val["pbt"] > 0),
+            np.clip(val["tax"] / val["pbt"], 0.10, 0.30),
+            0.21
+        )
+        operating_margin = val["ebit"] / val["revenue"]
+
+    def latest_or_zero(name):
+        return np.where(found[name], val[name], 0.0)
+
+    net_debt = latest_or_zero("short_debt") + latest_or_zero("long_debt") - latest_or_zero("cash")
+    shares = np.where(
+        found["diluted_shares"],
+        val["diluted_shares"],
+        np.where(found["basic_shares"], val["basic_shares"], np.nan)
+    )
+
+    status = np.full(len(dates), "ok", dtype=object)
+    error = np.full(len(dates), None, dtype=object)
+    for failed, state, message in [
+        (~(found["diluted_shares"] | found["basic_shares"]), "error",
+         "Shares outstanding not available from 10-K"),
+        (~(found["revenue"] & found["ebit"]), "error",
+         "Insufficient 10-K data to extract base year"),
+        (found["interest_income"], "skipped",
+         "Financial institution: FCFF not applicable"),
+    ]:
+        # Reverse pipeline order: the first stage that fails wins
+        status[failed] = state
+        error[failed] = message
+
+    return {
+        "status": status,
+        "error": error,
+        "fiscal_year": pit["revenue"]["Year"],
+        "filed": pit["revenue"]["filed"],
+        "revenue": val["revenue"],
+        "ebit": val["ebit"],
+        "operating_margin": operating_margin,
+        "tax_rate": tax_rate,
+        "net_debt": net_debt,
+        "shares": shares,
+    }
+
+
+# -------------------------------------------------
+# BACKTEST PANEL
+# -------------------------------------------------
+@timed
+def run_backtest(
+    companies: dict,
+    as_of,
+    prices: pd.DataFrame = None,
+    wacc=DEFAULT_WACC,
+    assumptions: dict = None,
+) -> pd.DataFrame:
+    """
+    Historical fair values for every (company, as-of date)
+
+    Parameters
+    ----------
+    companies : {ticker: companyfacts dict or FactIndex}
+    as_of : dates to value on
+    prices : optional wide table of closes (DatetimeIndex, one column per
+        ticker); each row gets the last close on or before its date
+    wacc : float, or {ticker: WACC}
+    assumptions : overrides for DEFAULT_ASSUMPTIONS
+
+    Returns one row per (ticker, as_of) with the point-in-time inputs,
+    "enterprise_value", "equity_value", "fair_value_per_share" and, with
+    ``prices``, "price" and "upside" (fair value / price - 1).
+    """
+    assumptions = {**DEFAULT_ASSUMPTIONS, **(assumptions or {})}
+    dates = pd.DatetimeIndex(as_of)
+
+    columns = []
+    for ticker, facts in companies.items():
+        with span("backtest_inputs", ticker=ticker):
+            columns.append(_point_in_time_columns(facts, dates))
+
+    if not columns:
+        columns = [_point_in_time_columns({}, dates[:0])]
+
+    # One frame for the whole panel: per-company frames would dominate
+    panel = _inputs_frame(
+        np.repeat(np.asarray(list(companies), dtype=object), len(dates)),
+        np.tile(dates, len(companies)),
+        {name: np.concatenate([c[name] for c in columns]) for name in columns[0]}
+    )
+    panel["wacc"] = (
+        panel["ticker"].map(wacc).astype(np.float64)
+        if isinstance(wacc, (dict, pd.Series))
+        else float(wacc)
+    )
+
+    # -------------------------------
+    # ONE BATCHED VALUATION
+    # -------------------------------
+    ok = (panel["status"] == "ok").to_numpy()
+    rows = panel[ok]
+
+    with span("backtest_valuation", rows=len(rows)):
+        projection = project_fcff_batch(
+            rows["revenue"].to_numpy(),
+            rows["operating_margin"].to_numpy()[:, None],
+            rows["tax_rate"].to_numpy()[:, None],
+            np.asarray(assumptions["growth_rates"], dtype=np.float64),
+            sales_to_capital=assumptions["sales_to_capital"]
+        )
+        valuation = dcf_valuation_batch(
+            projection["FCFF"],
+            rows["wacc"].to_numpy(),
+            assumptions["terminal_growth"],
+            net_debt=rows["net_debt"].to_numpy(),
+            shares_outstanding=rows["shares"].to_numpy()
+        )
+
+    for column, key in [
+        ("enterprise_value", "EnterpriseValue"),
+        ("equity_value", "EquityValue"),
+        ("fair_value_per_share", "FairValuePerShare"),
+    ]:
+        values = np.full(len(panel), np.nan)
+        values[ok] = valuation[key]
+        panel[column] = values
+
+    panel["terminal_growth"] = assumptions["terminal_growth"]
+
+    if prices is not None:
+        panel["price"] = prices_as_of(prices, panel["ticker"], panel["as_of"])
+        panel["upside"] = panel["fair_value_per_share"] / panel["price"] - 1
+
+    return panel
+
+
+def prices_as_of(prices: pd.DataFrame, tickers, dates) -> np.ndarray:
+    """
+    Last non-missing close on or before each date, per ticker
+    (NaN before the first close or for tickers without a column)
+    """
+    tickers = np.asarray(tickers, dtype=object)
+    dates = pd.DatetimeIndex(dates).to_numpy("datetime64[ns]")
+    out = np.full(len(tickers), np.nan)
+
+    for ticker in pd.unique(tickers):
+        if ticker not in prices:
+            continue
+        closes = prices[ticker].dropna().sort_index()
+        if closes.empty:
+            continue
+        index = pd.DatetimeIndex(closes.index)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+
+        mask = tickers == ticker
+        pos = np.searchsorted(index.to_numpy("datetime64[ns]"), dates[mask], side="right") - 1
+        out[mask] = np.where(pos >= 0, closes.to_numpy(np.float64)[np.maximum(pos, 0)], np.nan)
+
+    return out
+
+
+# -------------------------------------------------
+# LOADING
+# -------------------------------------------------
+def load_companies(tickers: list, offline: bool = None) -> tuple:
+    """
+    ({ticker: FactIndex}, {ticker: error}) for ``tickers``, restricted to
+    the valuation tags
+    """
+    companies, failed = {}, {}
+    for ticker in tickers:
+        try:
+            cik = get_cik_from_ticker(ticker)
+            companies[ticker] = get_company_facts(cik, offline=offline, tags=VALUATION_TAGS)
+        except Exception as e:
+            failed[ticker] = f"{type(e).__name__}: {e}"
+    return companies, failed
+
+
+def read_tickers(sources: list) -> list:
+    tickers = []
+    for source in sources:
+        path = Path(source)
+        if path.is_file():
+            tickers += [line.strip().upper() for line in path.read_text().splitlines() if line.strip()]
+        else:
+            tickers.append(source.upper())
+    return list(dict.fromkeys(tickers))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Point-in-time FCFF backtest: historical fair value vs. price")
+    parser.add_argument("tickers", nargs="+", help="Tickers, or files with one ticker per line")
+    parser.add_argument("--start", required=True, help="First as-of date (YYYY-MM-DD)")
+    parser.add_argument("--end", default=None, help="Last as-of date (default: today)")
+    parser.add_argument("--freq", default="QE", help="pandas frequency of as-of dates (default: quarter ends)")
+    parser.add_argument("--prices", default=None, help="CSV of closes: a date column then one column per ticker "
+                                                       "(default: download from Yahoo Finance)")
+    parser.add_argument("--no-prices", action="store_true", help="Fair values only")
+    parser.add_argument("--wacc", type=float, default=DEFAULT_WACC)
+    parser.add_argument("--growth", type=float, nargs=5, default=DEFAULT_ASSUMPTIONS["growth_rates"], metavar="G",
+                        help="Five revenue growth rates")
+    parser.add_argument("--sales-to-capital", type=float, default=DEFAULT_ASSUMPTIONS["sales_to_capital"])
+    parser.add_argument("--terminal-growth", type=float, default=DEFAULT_ASSUMPTIONS["terminal_growth"])
+    parser.add_argument("--offline", action="store_true", help="Use cached SEC data only")
+    parser.add_argument("--name", default="backtest", help="Run name for the report file")
+    args = parser.parse_args(argv)
+
+    started = time.time()
+    as_of = pd.date_range(args.start, args.end or pd.Timestamp.today().normalize(), freq=args.freq)
+    if len(as_of) == 0:
+        parser.error("no as-of dates in range")
+
+    companies, failed = load_companies(read_tickers(args.tickers), offline=args.offline or None)
+
+    prices = None
+    if args.prices:
+        prices = pd.read_csv(args.prices, index_col=0, parse_dates=True)
+    elif not args.no_prices and companies:
+        prices = download_price_history(list(companies), start=as_of[0] - pd.Timedelta(days=10), end=as_of[-1])
+
+    panel = run_backtest(
+        companies,
+        as_of,
+        prices=prices,
+        wacc=args.wacc,
+        assumptions={
+            "growth_rates": args.growth,
+            "sales_to_capital": args.sales_to_capital,
+            "terminal_growth": args.terminal_growth,
+        }
+    )
+
+    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    path = REPORTS_DIR / f"{args.name}_backtest.csv"
+    panel.to_csv(path, index=False)
+
+    print(
+        f"Valued {int((panel['status'] == 'ok').sum())} of {len(panel)} company-dates "
+        f"({len(companies)} tickers x {len(as_of)} dates) in {time.time() - started:,.1f}s -> {path}"
+    )
+    for ticker, error in sorted(failed.items()):
+        print(f"  ✗ {ticker}: {error}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
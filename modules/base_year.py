@@ -1,6 +1,9 @@
 import pandas as pd
 
+from modules.instrumentation import timed
 
+
+@timed
 def get_base_year_operating_data(xbrl: dict, extract) -> dict:
     """
     Extract base-year (latest 10-K) operating inputs required for FCFF valuation
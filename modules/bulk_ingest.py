@@ -0,0 +1,142 @@
+"""
+Bulk ingestion of SEC's nightly companyfacts.zip into the local FactStore.
+
+    python -m modules.bulk_ingest companyfacts.zip --workers 8
+    python -m modules.bulk_ingest companyfacts.zip --format parquet
+
+The archive (one CIK##########.json member per filer) is read in place:
+each member is streamed out of the zip and parsed in memory, never
+extracted to disk. Members are spread over a process pool; each worker
+opens its own handle on the archive.
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from modules.fact_index import FactIndex
+from modules.fact_store import FACT_STORE_DIR, FACT_STORE_FORMAT, open_fact_store
+
+
+_MEMBER_RE = re.compile(r"CIK(\d{10})\.json$")
+
+
+def list_members(zip_path, ciks=None) -> list:
+    """
+    (member name, CIK) pairs in the archive, optionally limited to ``ciks``
+    """
+    wanted = {str(int(c)).zfill(10) for c in ciks} if ciks else None
+
+    with zipfile.ZipFile(zip_path) as zf:
+        members = []
+        for name in zf.namelist():
+            m = _MEMBER_RE.search(name)
+            if m and (wanted is None or m.group(1) in wanted):
+                members.append((name, m.group(1)))
+    return members
+
+
+def _ingest_members(zip_path, members: list, store_dir, fmt: str) -> list:
+    """
+    Worker: parse and store a batch of members; returns
+    (cik, manifest entry or None, error or None) per member
+    """
+    store = open_fact_store(store_dir, fmt)
+    indexes, results = {}, []
+
+    with zipfile.ZipFile(zip_path) as zf:
+        for name, cik in members:
+            try:
+                with zf.open(name) as f:
+                    xbrl = json.load(f)
+                indexes[cik] = FactIndex.from_companyfacts(xbrl)
+                del xbrl
+            except Exception as e:
+                results.append((cik, None, f"{type(e).__name__}: {e}"))
+
+    try:
+        entries = store.write_batch(indexes, source=str(zip_path))
+        results.extend((cik, entries[cik], None) for cik in indexes)
+    except Exception as e:
+        results.extend((cik, None, f"{type(e).__name__}: {e}") for cik in indexes)
+
+    return results
+
+
+def ingest_companyfacts_zip(
+    zip_path,
+    store_dir=FACT_STORE_DIR,
+    workers: int = None,
+    ciks=None,
+    batch_size: int = 50,
+    progress=None,
+    fmt: str = FACT_STORE_FORMAT,
+) -> dict:
+    """
+    Load every filer in ``zip_path`` into the fact store at ``store_dir``
+
+    Returns {"ingested": n, "failed": {cik: error}, "seconds": t}.
+    """
+    started = time.time()
+    members = list_members(zip_path, ciks)
+    batches = [members[i:i + batch_size] for i in range(0, len(members), batch_size)]
+
+    store = open_fact_store(store_dir, fmt)
+    entries, failed = {}, {}
+
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(_ingest_members, str(zip_path), b, str(store_dir), fmt) for b in batches]
+
+        for future in as_completed(futures):
+            for cik, entry, error in future.result():
+                if error is None:
+                    entries[cik] = entry
+                else:
+                    failed[cik] = error
+            if progress:
+                progress(len(entries) + len(failed), len(members))
+
+    store.update_manifest(entries)
+    store.compact()
+
+    return {
+        "ingested": len(entries),
+        "failed": failed,
+        "seconds": time.time() - started,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Ingest SEC companyfacts.zip into the local fact store")
+    parser.add_argument("zip_path", help="Path to companyfacts.zip")
+    parser.add_argument("--store", default=str(FACT_STORE_DIR), help="Fact store directory")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--cik", action="append", help="Only ingest these CIKs (repeatable)")
+    parser.add_argument("--format", default=FACT_STORE_FORMAT, choices=["npz", "parquet"], help="Fact store layout")
+    args = parser.parse_args(argv)
+
+    def progress(done, total):
+        print(f"\r  {done:>6}/{total} filers", end="", flush=True)
+
+    result = ingest_companyfacts_zip(
+        args.zip_path,
+        store_dir=args.store,
+        workers=args.workers,
+        ciks=args.cik,
+        progress=progress,
+        fmt=args.format
+    )
+
+    print(f"\nIngested {result['ingested']} filers in {result['seconds']:,.1f}s -> {args.store}")
+    for cik, error in sorted(result["failed"].items()):
+        print(f"  ✗ CIK{cik}: {error}")
+
+    return 1 if result["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
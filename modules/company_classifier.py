@@ -1,3 +1,7 @@
+from modules.instrumentation import timed
+
+
+@timed
 def classify_company(xbrl, extract):
     """
     Classify company based on SEC XBRL characteristics.
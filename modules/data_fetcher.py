@@ -1,82 +1,220 @@
 
-import requests
+import json
+import os
+import time
+
 import pandas as pd
+import requests
+
+from modules.as_of_index import AsOfIndex
+from modules.fact_index import FactIndex, get_fact_index
+from modules.edgar_client import SEC_DATA_URL
+from modules.fact_cache import get_fact_cache
+from modules.fact_store import get_fact_store
+from modules.instrumentation import count, span, timed
+from modules.sec_cache import SEC_CACHE_OFFLINE, SEC_CACHE_TTL, SEC_HEADERS, get_sec_cache
+from modules.ticker_index import SEC_TICKER_URL, get_ticker_index
+from modules.xbrl_parser import load_selected_facts
+
 
 # -------------------------------------------------
 # GLOBAL SETTINGS
 # -------------------------------------------------
-SEC_HEADERS = {
-    "User-Agent": "YourName your.email@example.com"
+# Host comes from SEC_BASE_URL (modules.edgar_client) for stand-in testing
+SEC_XBRL_URL = SEC_DATA_URL + "/api/xbrl/companyfacts/CIK{cik}.json"
+
+# Fact store copies older than this (seconds since ingest) are reloaded
+# through the SEC cache, so its TTL and revalidation apply to them too
+FACT_STORE_MAX_AGE = int(os.environ.get("FACT_STORE_MAX_AGE", SEC_CACHE_TTL))
+
+# Every us-gaap tag the FCFF pipeline reads; pass as get_company_xbrl(tags=...)
+# to parse just these out of the companyfacts document
+VALUATION_TAGS = [
+    # company_classifier
+    "InterestIncome",
+    # base_year
+    "Revenues",
+    "SalesRevenueNet",
+    "OperatingIncomeLoss",
+    "IncomeBeforeTax",
+    "IncomeLossFromContinuingOperationsBeforeIncomeTaxes",
+    "IncomeTaxExpenseBenefit",
+    "DepreciationAndAmortization",
+    "PaymentsToAcquirePropertyPlantAndEquipment",
+    # net_debt
+    "CashAndCashEquivalentsAtCarryingValue",
+    "CashCashEquivalentsRestrictedCashAndRestrictedCashEquivalents",
+    "ShortTermBorrowings",
+    "LongTermDebt",
+    # equity
+    "WeightedAverageNumberOfDilutedSharesOutstanding",
+    "WeightedAverageNumberOfShareOutstandingDiluted",
+    "WeightedAverageNumberOfSharesOutstandingBasic",
+    "WeightedAverageNumberOfShareOutstandingBasic",
+]
+
+# Every tag the summary SECDataFetcher (data_fetcher_SIMPLE / _MINIMAL)
+# reads, by taxonomy
+SUMMARY_TAGS = {
+    "us-gaap": [
+        "Revenues",
+        "RevenueFromContractWithCustomerExcludingCostReportedAmount",
+        "OperatingIncomeLoss",
+        "NetIncomeLoss",
+        "DepreciationDepletionAndAmortization",
+        "PaymentsToAcquirePropertyPlantAndEquipment",
+        "LongTermDebtNoncurrent",
+        "DebtCurrent",
+        "CashAndCashEquivalentsAtCarryingValue",
+        "InterestExpense",
+        "PaymentsOfDividends",
+    ],
+    "dei": ["EntityCommonStockSharesOutstanding"],
 }
 
-SEC_TICKER_URL = "https://www.sec.gov/files/company_tickers.json"
-SEC_XBRL_URL = "https://data.sec.gov/api/xbrl/companyfacts/CIK{cik}.json"
-
 
 # -------------------------------------------------
 # TICKER → CIK
 # -------------------------------------------------
+@timed
 def get_cik_from_ticker(ticker: str) -> str:
     """
     Convert ticker to zero-padded CIK using SEC mapping
-    """
-    r = requests.get(SEC_TICKER_URL, headers=SEC_HEADERS)
-    r.raise_for_status()
-    data = r.json()
 
-    ticker = ticker.upper()
+    Resolved against the shared in-memory TickerIndex (modules.ticker_index),
+    which is loaded once and refreshed in the background.
+    """
+    cik = get_ticker_index().cik(ticker)
 
-    for _, item in data.items():
-        if item["ticker"] == ticker:
-            return str(item["cik_str"]).zfill(10)
+    if cik is None:
+        raise ValueError(f"CIK not found for ticker: {ticker.upper()}")
 
-    raise ValueError(f"CIK not found for ticker: {ticker}")
+    return cik
 
 
 # -------------------------------------------------
 # DOWNLOAD COMPANY XBRL JSON
 # -------------------------------------------------
-def get_company_xbrl(cik: str) -> dict:
+@timed
+def get_company_xbrl(cik: str, offline: bool = None, tags: list = None) -> dict:
     """
     Download company XBRL facts JSON from SEC
+
+    Served from the on-disk SEC cache when fresh (see modules.sec_cache);
+    offline=True never touches the network and raises CacheMiss instead.
+
+    With ``tags`` (e.g. VALUATION_TAGS) the cached document is memory-mapped
+    and only those tags are parsed, instead of materialising every fact.
     """
     url = SEC_XBRL_URL.format(cik=cik)
-    r = requests.get(url, headers=SEC_HEADERS)
-    r.raise_for_status()
-    return r.json()
+    with span("download_companyfacts"):
+        f = get_sec_cache().open(url, headers=SEC_HEADERS, offline=offline)
+
+    with f, span("parse_companyfacts", selective=tags is not None):
+        if tags is not None:
+            return load_selected_facts(f, tags)
+        return json.loads(f.read())
 
 
 # -------------------------------------------------
-# EXTRACT TIME SERIES FROM XBRL
+# COMPANY FACTS (LOCAL STORE FIRST)
 # -------------------------------------------------
-def extract_series(xbrl: dict, tags: list[str], col_name: str) -> pd.DataFrame:
+@timed
+def get_company_facts(cik: str, offline: bool = None, tags: list = None) -> FactIndex:
     """
-    Extract annual USD values for given XBRL tags
+    FactIndex for a company, read from the local fact store when the filer
+    was bulk-ingested (modules.bulk_ingest) within FACT_STORE_MAX_AGE, else
+    built from get_company_xbrl (restricted to ``tags``, a list of us-gaap
+    tags or a {taxonomy: [tags]} mapping, when given). An older store copy
+    is still used offline or when EDGAR cannot be reached.
+
+    Results are shared process-wide through modules.fact_cache: concurrent
+    callers for the same CIK wait on one load, and the returned index is
+    read-only. Offline and online loads are cached separately, so an
+    offline CacheMiss is never handed to a caller that may use the network.
     """
-    records = []
+    if offline is None:
+        offline = SEC_CACHE_OFFLINE
+    key = (cik, _tags_key(tags), offline)
+    return get_fact_cache().get_or_load(key, lambda: _load_company_facts(cik, offline, tags))
+
+
+def get_as_of_index(
+    cik: str,
+    tags,
+    unit: str = "USD",
+    form: str = None,
+    taxonomy: str = "us-gaap",
+    facts_tags=None,
+    offline: bool = None,
+) -> AsOfIndex:
+    """
+    AsOfIndex over ``tags`` of get_company_facts(cik, tags=facts_tags),
+    built once per cached FactIndex and shared through the fact cache
+    """
+    if offline is None:
+        offline = SEC_CACHE_OFFLINE
+    index = get_company_facts(cik, offline=offline, tags=facts_tags)
+    return get_fact_cache().get_or_derive(
+        (cik, _tags_key(facts_tags), offline),
+        index,
+        ("as_of", tuple(tags), unit, form, taxonomy),
+        lambda: index.as_of_index(tags, unit=unit, form=form, taxonomy=taxonomy),
+    )
 
-    facts = xbrl.get("facts", {}).get("us-gaap", {})
 
-    for tag in tags:
-        tag_data = facts.get(tag, {})
-        units = tag_data.get("units", {}).get("USD", [])
+def _tags_key(tags):
+    if tags is None:
+        return None
+    if isinstance(tags, dict):
+        return tuple((taxonomy, tuple(names)) for taxonomy, names in tags.items())
+    return tuple(tags)
 
-        for item in units:
-            if item.get("form") == "10-K":
-                year = int(item["fy"])
-                value = item["val"]
 
-                records.append({
-                    "Year": year,
-                    col_name: value
-                })
+def in_fact_store(cik: str, offline: bool = None) -> bool:
+    """
+    Whether get_company_facts serves ``cik`` from the local fact store
+    """
+    if offline is None:
+        offline = SEC_CACHE_OFFLINE
+    store = get_fact_store()
+    return cik in store and (offline or _store_age(store, cik) < FACT_STORE_MAX_AGE)
 
-    if not records:
-        return pd.DataFrame()
 
-    df = pd.DataFrame(records)
-    return (
-        df.sort_values("Year", ascending=False)
-          .drop_duplicates("Year")
-          .reset_index(drop=True)
-    )
+def _store_age(store, cik: str) -> float:
+    entry = store.manifest().get(str(int(cik)).zfill(10), {})
+    return time.time() - entry.get("ingested_at", 0)
+
+
+def _load_company_facts(cik: str, offline: bool, tags: list) -> FactIndex:
+    store = get_fact_store()
+    if in_fact_store(cik, offline):
+        count("fact_store.hits")
+        return store.load(cik)
+    stored = cik in store
+
+    try:
+        xbrl = get_company_xbrl(cik, offline=offline, tags=tags)
+    except requests.RequestException:
+        if not stored:
+            raise
+        count("fact_store.stale_served")
+        return store.load(cik)
+    with span("build_fact_index"):
+        return FactIndex.from_companyfacts(xbrl)
+
+
+# -------------------------------------------------
+# EXTRACT TIME SERIES FROM XBRL
+# -------------------------------------------------
+@timed
+def extract_series(xbrl, tags: list[str], col_name: str, unit: str = "USD") -> pd.DataFrame:
+    """
+    Extract annual values for given XBRL tags in one unit (USD, or
+    "shares" for share counts)
+
+    ``xbrl`` may be a companyfacts dict or a FactIndex; pass a FactIndex
+    (see get_company_facts) when extracting several series, as a dict is
+    indexed afresh on every call.
+    """
+    return get_fact_index(xbrl).series(tags, col_name, unit=unit)
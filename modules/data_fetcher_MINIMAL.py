@@ -1,7 +1,13 @@
-import streamlit as st
-import requests
-import yfinance as yf
+import logging
 
+import numpy as np
+
+from modules.data_fetcher import SUMMARY_TAGS, get_as_of_index
+from modules.market_data import get_market_data
+from modules.ticker_index import get_ticker_index
+
+
+logger = logging.getLogger(__name__)
 
 class SECDataFetcher:
     """Minimal data fetcher for SEC 10-K data"""
@@ -13,35 +19,23 @@ class SECDataFetcher:
         """Fetch valuation inputs from SEC data"""
         try:
             # Get ticker to CIK mapping
-            ticker_map_url = "https://www.sec.gov/files/company_tickers.json"
-            response = requests.get(ticker_map_url)
-            ticker_map = response.json()
-            
-            cik = None
-            for item in ticker_map.values():
-                if item['ticker'] == self.ticker:
-                    cik = str(item['cik_str']).zfill(10)
-                    break
+            cik = get_ticker_index().cik(self.ticker)
             
             if not cik:
                 return None
             
-            # Fetch SEC facts
-            facts_url = f"https://data.sec.gov/api/xbrl/companyfacts/CIK{cik}.json"
-            facts_response = requests.get(facts_url)
-            facts = facts_response.json()
-            
-            def get_val(tag, taxonomy='us-gaap'):
-                try:
-                    data = facts['facts'][taxonomy][tag]['units']['USD']
-                    return sorted(data, key=lambda x: x['end'])[-1]['val']
-                except:
-                    return 0
+            # Fetch SEC facts (latest period per tag, via the fact cache)
+            def get_val(tag, taxonomy='us-gaap', unit='USD'):
+                # Latest period end; the last-reported fact wins ties. The
+                # AsOfIndex is built once per cached document and shared
+                latest = get_as_of_index(
+                    cik, [tag], unit=unit, taxonomy=taxonomy, facts_tags=SUMMARY_TAGS
+                ).latest_period()
+                val = latest["val"][0]
+                return float(val) if latest["found"][0] and not np.isnan(val) else 0
             
             # Get current price
-            stock = yf.Ticker(self.ticker)
-            hist = stock.history(period="1d")
-            current_price = hist['Close'].iloc[-1] if not hist.empty else 0
+            current_price = get_market_data().get_quote(self.ticker)["price"] or 0
             
             return {
                 "name": self.ticker,
@@ -55,10 +49,10 @@ class SECDataFetcher:
                 "cash": get_val('CashAndCashEquivalentsAtCarryingValue') / 1e6,
                 "interest_exp": get_val('InterestExpense') / 1e6,
                 "dividends": get_val('PaymentsOfDividends') / 1e6,
-                "shares": get_val('EntityCommonStockSharesOutstanding', 'dei') or 1e6,
+                "shares": get_val('EntityCommonStockSharesOutstanding', 'dei', 'shares') or 1e6,
                 "tax_rate": 0.21,
                 "beta": 1.1
             }
         except Exception as e:
-            st.error(f"Error fetching data: {e}")
+            logger.error("Error fetching data: %s", e)
             return None
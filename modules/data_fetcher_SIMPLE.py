@@ -1,56 +1,40 @@
-import pandas as pd
-import streamlit as st
-import requests
-import yfinance as yf
+import logging
 
+import numpy as np
+
+from modules.data_fetcher import SUMMARY_TAGS, get_as_of_index
+from modules.market_data import get_market_data
+from modules.ticker_index import get_ticker_index
+
+
+logger = logging.getLogger(__name__)
 
 class SECDataFetcher:
     def __init__(self, ticker):
         self.ticker = ticker.upper()
-        self.headers = {
-            'User-Agent': 'Mountain Path Valuation research@mountainpath.edu',
-            'Accept-Encoding': 'gzip, deflate',
-            'Host': 'data.sec.gov'
-        }
 
     def get_valuation_inputs(self):
         """Fetch valuation inputs from SEC 10-K data"""
         try:
             # 1. Map Ticker to CIK
-            ticker_map_url = "https://www.sec.gov/files/company_tickers.json"
-            map_headers = {'User-Agent': 'MPV/1.0 research@mountainpath.edu'}
-            response = requests.get(ticker_map_url, headers=map_headers)
-            
-            if not response.text.strip():
-                return None
-            ticker_map = response.json()
-            
-            cik = None
-            for item in ticker_map.values():
-                if item['ticker'] == self.ticker:
-                    cik = str(item['cik_str']).zfill(10)
-                    break
+            cik = get_ticker_index().cik(self.ticker)
             
             if not cik:
-                st.error(f"Ticker {self.ticker} not found in SEC database")
+                logger.error("Ticker %s not found in SEC database", self.ticker)
                 return None
 
-            # 2. Fetch Audited Facts
-            facts_url = f"https://data.sec.gov/api/xbrl/companyfacts/CIK{cik}.json"
-            facts_res = requests.get(facts_url, headers=self.headers)
-            facts = facts_res.json()
-            
-            def get_val(tag, taxonomy='us-gaap'):
-                try:
-                    data = facts['facts'][taxonomy][tag]['units']['USD']
-                    return sorted(data, key=lambda x: x['end'])[-1]['val']
-                except:
-                    return 0
+            # 2. Audited Facts (latest period per tag, via the fact cache)
+            def get_val(tag, taxonomy='us-gaap', unit='USD'):
+                # Latest period end; the last-reported fact wins ties. The
+                # AsOfIndex is built once per cached document and shared
+                latest = get_as_of_index(
+                    cik, [tag], unit=unit, taxonomy=taxonomy, facts_tags=SUMMARY_TAGS
+                ).latest_period()
+                val = latest["val"][0]
+                return float(val) if latest["found"][0] and not np.isnan(val) else 0
 
             # 3. Market Price
-            stock = yf.Ticker(self.ticker)
-            hist = stock.history(period="1d")
-            current_price = hist['Close'].iloc[-1] if not hist.empty else 0
+            current_price = get_market_data().get_quote(self.ticker)["price"] or 0
 
             return {
                 "name": self.ticker,
@@ -64,10 +48,10 @@ class SECDataFetcher:
                 "cash": get_val('CashAndCashEquivalentsAtCarryingValue') / 1e6,
                 "interest_exp": get_val('InterestExpense') / 1e6,
                 "dividends": get_val('PaymentsOfDividends') / 1e6,
-                "shares": get_val('EntityCommonStockSharesOutstanding', 'dei') or 1e6,
+                "shares": get_val('EntityCommonStockSharesOutstanding', 'dei', 'shares') or 1e6,
                 "tax_rate": 0.21,
                 "beta": 1.1
             }
         except Exception as e:
-            st.error(f"Fetch Error: {e}")
+            logger.error("Fetch Error: %s", e)
             return None
@@ -1,7 +1,11 @@
 import numpy as np
 import pandas as pd
 
+from modules.fcff_projection import project_fcff_batch
+from modules.instrumentation import timed
 
+
+@timed
 def dcf_valuation(
     fcff_df: pd.DataFrame,
     wacc: float,
@@ -14,7 +18,8 @@ def dcf_valuation(
 
     Parameters
     ----------
-    fcff_df : DataFrame with columns ['Year', 'FCFF']
+    fcff_df : DataFrame with columns ['Year', 'FCFF'], or the dict of
+        arrays from project_fcff(..., as_frame=False)
     wacc : float
     terminal_growth : float
     net_debt : float
@@ -24,7 +29,7 @@ def dcf_valuation(
     # -------------------------------
     # DISCOUNT EXPLICIT FCFF
     # -------------------------------
-    fcff = fcff_df["FCFF"].values
+    fcff = np.asarray(fcff_df["FCFF"], dtype=np.float64)
     years = np.arange(1, len(fcff) + 1)
 
     discount_factors = (1 + wacc) ** years
@@ -61,3 +66,183 @@ def dcf_valuation(
         "PV_Terminal": pv_terminal_value,
     }
 
+
+def dcf_valuation_batch(
+    fcff,
+    wacc,
+    terminal_growth,
+    net_debt=0.0,
+    shares_outstanding=1.0,
+    gradients: bool = False,
+):
+    """
+    Vectorized DCF valuation over many scenarios at once
+
+    Parameters
+    ----------
+    fcff : array (n_scenarios, n_years), or (n_years,) shared by all scenarios
+    wacc : float or array (n_scenarios,)
+    terminal_growth : float or array (n_scenarios,)
+    net_debt : float or array (n_scenarios,)
+    shares_outstanding : float or array (n_scenarios,)
+
+    gradients : also return the closed-form partial derivatives of EV,
+        "dEV_dFCFF" (n_scenarios, n_years), "dEV_dWACC" and
+        "dEV_dTerminalGrowth" (n_scenarios,)
+
+    Unlike dcf_valuation, scenarios with WACC <= terminal growth do not
+    raise: they are flagged False in "Valid" and their values are NaN.
+    """
+
+    fcff = np.atleast_2d(np.asarray(fcff, dtype=np.float64))
+    wacc = np.asarray(wacc, dtype=np.float64)
+    terminal_growth = np.asarray(terminal_growth, dtype=np.float64)
+
+    (n_scenarios,) = np.broadcast_shapes(
+        fcff.shape[:1], wacc.shape, terminal_growth.shape,
+        np.shape(net_debt), np.shape(shares_outstanding)
+    )
+    n_years = fcff.shape[1]
+
+    fcff = np.broadcast_to(fcff, (n_scenarios, n_years))
+    wacc = np.broadcast_to(wacc, (n_scenarios,))
+    terminal_growth = np.broadcast_to(terminal_growth, (n_scenarios,))
+
+    # -------------------------------
+    # DISCOUNT EXPLICIT FCFF
+    # -------------------------------
+    years = np.arange(1, n_years + 1)
+    discount_factors = (1 + wacc[:, None]) ** years
+    pv_fcff = fcff / discount_factors
+
+    # -------------------------------
+    # TERMINAL VALUE (MASKED)
+    # -------------------------------
+    valid = wacc > terminal_growth
+    spread = np.where(valid, wacc - terminal_growth, np.nan)
+
+    terminal_value = fcff[:, -1] * (1 + terminal_growth) / spread
+    pv_terminal_value = terminal_value / discount_factors[:, -1]
+
+    # -------------------------------
+    # ENTERPRISE & EQUITY VALUE
+    # -------------------------------
+    enterprise_value = pv_fcff.sum(axis=1) + pv_terminal_value
+    equity_value = enterprise_value - net_debt
+
+    shares_outstanding = np.broadcast_to(
+        np.asarray(shares_outstanding, dtype=np.float64), (n_scenarios,)
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fair_value_per_share = np.where(
+            shares_outstanding > 0,
+            equity_value / shares_outstanding,
+            np.nan
+        )
+
+    result = {
+        "EnterpriseValue": enterprise_value,
+        "EquityValue": equity_value,
+        "FairValuePerShare": fair_value_per_share,
+        "PV_FCFF": pv_fcff,
+        "PV_Terminal": pv_terminal_value,
+        "Valid": valid,
+    }
+
+    if gradients:
+        # Each FCFF is discounted; the last one also capitalises into TV
+        d_fcff = 1 / discount_factors
+        d_fcff[:, -1] *= 1 + (1 + terminal_growth) / spread
+
+        result["dEV_dFCFF"] = d_fcff
+        result["dEV_dWACC"] = (
+            -(years * pv_fcff).sum(axis=1) / (1 + wacc)
+            - pv_terminal_value * (n_years / (1 + wacc) + 1 / spread)
+        )
+        result["dEV_dTerminalGrowth"] = (
+            fcff[:, -1] / discount_factors[:, -1] * (1 + wacc) / spread ** 2
+        )
+
+    return result
+
+
+@timed
+def dcf_sensitivities(
+    base_revenue,
+    operating_margin,
+    tax_rate,
+    growth_rates,
+    sales_to_capital,
+    wacc,
+    terminal_growth,
+    net_debt=0.0,
+    shares_outstanding=1.0,
+):
+    """
+    Valuation and closed-form sensitivities of the FCFF model in one pass
+
+    Inputs broadcast as in project_fcff_batch (growth_rates is
+    (..., n_years)) and dcf_valuation_batch. Returns the
+    dcf_valuation_batch result plus "dEV" and "dFairValuePerShare": dicts
+    of partial derivatives keyed by input name, "growth_rates" per year
+    (n_scenarios, n_years) and the rest (n_scenarios,). Margin, tax rate and
+    sales-to-capital derivatives are for a parallel shift of every year.
+    """
+    projection = project_fcff_batch(
+        base_revenue,
+        operating_margin,
+        tax_rate,
+        growth_rates,
+        sales_to_capital=sales_to_capital
+    )
+    valuation = dcf_valuation_batch(
+        projection["FCFF"],
+        wacc,
+        terminal_growth,
+        net_debt=net_debt,
+        shares_outstanding=shares_outstanding,
+        gradients=True
+    )
+
+    d_fcff = valuation["dEV_dFCFF"]
+    shape = d_fcff.shape
+
+    def per_year(x):
+        return np.broadcast_to(np.asarray(x, dtype=np.float64), shape)
+
+    revenue = per_year(projection["Revenue"])
+    growth = per_year(growth_rates)
+    margin = per_year(operating_margin)
+    after_tax = 1 - per_year(tax_rate)
+    sales_to_capital = per_year(sales_to_capital)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        per_capital = np.where(sales_to_capital > 0, 1 / sales_to_capital, 0.0)
+    revenue_change = revenue * growth / (1 + growth)
+
+    # EV w.r.t. each year's revenue: NOPAT now, reinvestment now and next year
+    weighted = d_fcff * per_capital
+    d_revenue = d_fcff * margin * after_tax - weighted
+    d_revenue[:, :-1] += weighted[:, 1:]
+
+    # Growth in year j scales revenue from year j on by 1 / (1 + g_j)
+    d_growth = np.cumsum((d_revenue * revenue)[:, ::-1], axis=1)[:, ::-1] / (1 + growth)
+
+    d_ev = {
+        "growth_rates": d_growth,
+        "operating_margin": (d_fcff * revenue * after_tax).sum(axis=1),
+        "tax_rate": -(d_fcff * revenue * margin).sum(axis=1),
+        "sales_to_capital": (d_fcff * revenue_change * per_capital ** 2).sum(axis=1),
+        "wacc": valuation["dEV_dWACC"],
+        "terminal_growth": valuation["dEV_dTerminalGrowth"],
+    }
+
+    shares = np.broadcast_to(np.asarray(shares_outstanding, dtype=np.float64), shape[:1])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        per_share = np.where(shares > 0, 1 / shares, np.nan)
+
+    valuation["dEV"] = d_ev
+    valuation["dFairValuePerShare"] = {
+        name: grad * (per_share[:, None] if grad.ndim == 2 else per_share)
+        for name, grad in d_ev.items()
+    }
+    return valuation
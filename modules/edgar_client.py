@@ -0,0 +1,208 @@
+import asyncio
+import datetime
+import email.utils
+import math
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from modules.instrumentation import count
+
+
+# -------------------------------------------------
+# GLOBAL SETTINGS
+# -------------------------------------------------
+SEC_HEADERS = {
+    "User-Agent": "YourName your.email@example.com"
+}
+
+# Set SEC_BASE_URL (e.g. http://127.0.0.1:8765) to send every www.sec.gov and
+# data.sec.gov request to a stand-in server instead (benchmarks.edgar_standin)
+SEC_BASE_URL = os.environ.get("SEC_BASE_URL", "").rstrip("/")
+SEC_WWW_URL = SEC_BASE_URL or "https://www.sec.gov"
+SEC_DATA_URL = SEC_BASE_URL or "https://data.sec.gov"
+
+# SEC fair-access policy: at most 10 requests per second per client
+SEC_MAX_REQUESTS_PER_SECOND = float(os.environ.get("SEC_MAX_REQUESTS_PER_SECOND", 10))
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+# -------------------------------------------------
+# RATE LIMITER
+# -------------------------------------------------
+class TokenBucket:
+    """
+    Thread-safe token bucket: ``rate`` tokens per second, bursts up to
+    ``capacity``
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """
+        Block until a token is available, then take it
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+# -------------------------------------------------
+# CLIENT
+# -------------------------------------------------
+class EdgarClient:
+    """
+    Pooled, rate-limited HTTP client for sec.gov / data.sec.gov.
+
+    One requests.Session keeps TCP+TLS connections alive across calls and
+    negotiates gzip. Every attempt (including retries) takes a token from
+    a shared bucket, so all threads together stay under the SEC limit.
+    429 and 5xx responses are retried with jittered exponential backoff,
+    honouring Retry-After when SEC sends it.
+
+    get() is synchronous; fetch() / fetch_many() expose the same client to
+    asyncio code, running transfers on worker threads.
+    """
+
+    def __init__(
+        self,
+        rate: float = SEC_MAX_REQUESTS_PER_SECOND,
+        max_retries: int = 5,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        pool_size: int = 16,
+        timeout: float = 30.0,
+        headers: dict = None,
+    ):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.limiter = TokenBucket(rate)
+
+        self.session = requests.Session()
+        self.session.headers.update(headers or SEC_HEADERS)
+        self.session.headers.setdefault("Accept-Encoding", "gzip, deflate")
+
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    # ---------------------------------------------
+    # SYNC API
+    # ---------------------------------------------
+    def get(self, url: str, headers: dict = None) -> requests.Response:
+        """
+        GET with rate limiting and retries; returns the final response
+        (callers decide how to treat 304 / 4xx)
+        """
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+            count("http.requests")
+            try:
+                r = self.session.get(url, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                count("http.connection_errors")
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self._delay(attempt))
+                continue
+
+            count("http.bytes", len(r.content))
+            if r.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                return r
+
+            count(f"http.retried_{r.status_code}")
+            time.sleep(self._delay(attempt, r.headers.get("Retry-After")))
+
+        return r
+
+    def _delay(self, attempt: int, retry_after: str = None) -> float:
+        wait = _parse_retry_after(retry_after) if retry_after else None
+        if wait is not None:
+            return min(wait, self.max_backoff)
+
+        # "Full jitter": spreads retries from many threads apart
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    # ---------------------------------------------
+    # ASYNC API
+    # ---------------------------------------------
+    async def fetch(self, url: str, headers: dict = None) -> requests.Response:
+        return await asyncio.to_thread(self.get, url, headers)
+
+    async def fetch_many(self, urls: list, headers: dict = None, concurrency: int = 16) -> list:
+        """
+        Fetch ``urls`` concurrently (results in input order); exceptions are
+        returned in place of responses so one failure does not cancel the rest
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one(url):
+            async with semaphore:
+                return await self.fetch(url, headers)
+
+        return await asyncio.gather(*(one(u) for u in urls), return_exceptions=True)
+
+    def fetch_all(self, urls: list, headers: dict = None, concurrency: int = 16) -> list:
+        """
+        Blocking wrapper around fetch_many() for non-async callers
+        """
+        return asyncio.run(self.fetch_many(urls, headers, concurrency))
+
+
+def _parse_retry_after(value: str):
+    """
+    Seconds to wait from a Retry-After header (delta-seconds or HTTP date);
+    None when it cannot be parsed, so the caller falls back to backoff
+    """
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            when = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            # HTTP dates are always GMT
+            when = when.replace(tzinfo=datetime.timezone.utc)
+        seconds = when.timestamp() - time.time()
+
+    if not math.isfinite(seconds):
+        return None
+    return max(seconds, 0.0)
+
+
+# -------------------------------------------------
+# SHARED INSTANCE
+# -------------------------------------------------
+_default_client = None
+_default_lock = threading.Lock()
+
+
+def get_edgar_client() -> EdgarClient:
+    """
+    Process-wide client, so every caller shares one pool and one rate limit
+    """
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = EdgarClient()
+        return _default_client
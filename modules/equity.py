@@ -1,6 +1,12 @@
+from modules.instrumentation import timed
+
+
+@timed
 def get_share_count(xbrl: dict, extract) -> float:
     """
     Extract diluted shares outstanding from the latest 10-K
+
+    SEC reports share counts under the "shares" unit, not USD.
     """
 
     # ----------------------------------
@@ -12,7 +18,8 @@ def get_share_count(xbrl: dict, extract) -> float:
             "WeightedAverageNumberOfDilutedSharesOutstanding",
             "WeightedAverageNumberOfShareOutstandingDiluted"
         ],
-        col_name="DilutedShares"
+        col_name="DilutedShares",
+        unit="shares"
     )
 
     if not diluted_df.empty:
@@ -27,7 +34,8 @@ def get_share_count(xbrl: dict, extract) -> float:
             "WeightedAverageNumberOfSharesOutstandingBasic",
             "WeightedAverageNumberOfShareOutstandingBasic"
         ],
-        col_name="BasicShares"
+        col_name="BasicShares",
+        unit="shares"
     )
 
     if not basic_df.empty:
@@ -0,0 +1,179 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from modules.instrumentation import count
+
+
+# -------------------------------------------------
+# GLOBAL SETTINGS
+# -------------------------------------------------
+FACT_CACHE_MAX_BYTES = int(os.environ.get("FACT_CACHE_MAX_BYTES", 512 * 1024 ** 2))
+FACT_CACHE_TTL = int(os.environ.get("FACT_CACHE_TTL", 3600))              # seconds
+
+
+# -------------------------------------------------
+# SHARED FACT CACHE
+# -------------------------------------------------
+class FactCache:
+    """
+    Process-wide, memory-bounded cache of loaded company facts.
+
+    - Entries are kept in LRU order and evicted once the sum of their
+      ``nbytes`` exceeds ``max_bytes``; a single value larger than the
+      bound is returned but never cached.
+    - Entries older than ``ttl`` seconds are reloaded on next use.
+    - Loads are single-flight: concurrent get_or_load() calls for the
+      same key wait on the first caller's load instead of repeating it,
+      and share its result or its exception.
+
+    Cached values are shared between threads (e.g. Streamlit sessions)
+    and must be treated as read-only; what is built from them (such as an
+    AsOfIndex) is kept alongside through get_or_derive().
+    """
+
+    def __init__(self, max_bytes: int = FACT_CACHE_MAX_BYTES, ttl: int = FACT_CACHE_TTL):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.bytes = 0
+
+        self._entries = OrderedDict()      # key -> (value, nbytes, loaded_at)
+        self._derived = {}                 # key -> {name: value built from the entry}
+        self._inflight = {}                # key -> Future
+        self._lock = threading.Lock()
+
+    # ---------------------------------------------
+    # PUBLIC API
+    # ---------------------------------------------
+    def get_or_load(self, key, loader):
+        """
+        Cached value for ``key``, calling ``loader()`` at most once across
+        concurrent callers when it is missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry[2] < self.ttl:
+                self._entries.move_to_end(key)
+                count("fact_cache.hits")
+                return entry[0]
+
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = Future()
+
+        if not leader:
+            count("fact_cache.coalesced")
+            return flight.result()
+
+        count("fact_cache.misses")
+        try:
+            value = loader()
+            size = getattr(value, "nbytes", 0)      # may walk object columns: outside the lock
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            flight.set_exception(e)
+            raise
+
+        with self._lock:
+            self._store(key, value, size)
+            del self._inflight[key]
+        flight.set_result(value)
+        return value
+
+    def get_or_derive(self, key, value, name, builder):
+        """
+        Something built from the cached ``value`` for ``key`` (e.g. an
+        AsOfIndex over some of its tags), built once per cached value,
+        counted in its size and dropped with it; ``value`` itself is never
+        modified. Built but not kept once ``value`` is no longer cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            derived = self._derived.get(key, {})
+            if entry is not None and entry[0] is value and name in derived:
+                count("fact_cache.derived_hits")
+                return derived[name]
+
+        built = builder()
+        size = getattr(built, "nbytes", 0)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] is not value:
+                return built
+
+            derived = self._derived.setdefault(key, {})
+            if name not in derived:
+                derived[name] = built
+                self._entries[key] = (value, entry[1] + size, entry[2])
+                self.bytes += size
+            built = derived[name]
+            self._evict()
+        return built
+
+    def invalidate(self, predicate=None) -> int:
+        """
+        Drop entries whose key satisfies ``predicate`` (all when None);
+        returns how many were dropped
+        """
+        with self._lock:
+            keys = [k for k in self._entries if predicate is None or predicate(k)]
+            for key in keys:
+                self._drop(key)
+        return len(keys)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "inflight": len(self._inflight),
+            }
+
+    # ---------------------------------------------
+    # INTERNALS
+    # ---------------------------------------------
+    def _store(self, key, value, size: int) -> None:
+        if key in self._entries:
+            self._drop(key)
+
+        if size > self.max_bytes:
+            count("fact_cache.oversize")
+            return
+
+        self._entries[key] = (value, size, time.time())
+        self.bytes += size
+        self._evict()
+
+    def _evict(self) -> None:
+        while self.bytes > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+            count("fact_cache.evictions")
+
+    def _drop(self, key) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._derived.pop(key, None)
+        self.bytes -= size
+
+
+# -------------------------------------------------
+# SHARED INSTANCE
+# -------------------------------------------------
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_fact_cache() -> FactCache:
+    """
+    Process-wide cache configured from the FACT_CACHE_* environment variables
+    """
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = FactCache()
+        return _default_cache
@@ -0,0 +1,307 @@
+import sys
+
+import numpy as np
+import pandas as pd
+
+from modules.as_of_index import AsOfIndex
+
+
+
+class FactIndex:
+    """
+    Columnar view of one SEC companyfacts document.
+
+    Every fact is flattened once into parallel arrays
+    (taxonomy, tag, unit, form, fy, fp, start, end, filed, accn, val),
+    grouped so that each (taxonomy, tag, unit) occupies one contiguous row
+    range. Lookups slice those ranges instead of re-walking the JSON.
+    """
+
+    def __init__(self, columns: dict, ranges: dict, cik=None, entity_name=None):
+        self.cik = cik
+        self.entity_name = entity_name
+        self._ranges = ranges          # (taxonomy, tag, unit) -> (start, stop)
+        self._tags = {key[1] for key in ranges}
+
+        self.form = columns["form"]            # Categorical codes
+        self.fp = columns["fp"]
+        self.forms = columns["forms"]          # code -> label
+        self.fps = columns["fps"]
+        self.fy = columns["fy"]                # float64, NaN if missing
+        self.start = columns["start"]          # datetime64[D], NaT if instant
+        self.end = columns["end"]
+        self.filed = columns["filed"]
+        self.accn = columns["accn"]            # object
+        self.val = columns["val"]              # float64
+
+    # ---------------------------------------------
+    # CONSTRUCTION
+    # ---------------------------------------------
+    @classmethod
+    def from_companyfacts(cls, xbrl: dict, tags=None) -> "FactIndex":
+        """
+        Flatten a companyfacts JSON dict in a single pass (only ``tags``,
+        in any taxonomy, when given)
+        """
+        keep = set(tags) if tags is not None else None
+        form, fy, fp, start, end, filed, accn, val = ([] for _ in range(8))
+        ranges = {}
+        n = 0
+
+        for taxonomy, tag_map in xbrl.get("facts", {}).items():
+            for tag, tag_data in tag_map.items():
+                if keep is not None and tag not in keep:
+                    continue
+                for unit, items in tag_data.get("units", {}).items():
+                    for item in items:
+                        form.append(item.get("form"))
+                        fy.append(item.get("fy"))
+                        fp.append(item.get("fp"))
+                        start.append(item.get("start"))
+                        end.append(item.get("end"))
+                        filed.append(item.get("filed"))
+                        accn.append(item.get("accn"))
+                        val.append(item.get("val"))
+                    ranges[(taxonomy, tag, unit)] = (n, n + len(items))
+                    n += len(items)
+
+        form_cat = pd.Categorical(form)
+        fp_cat = pd.Categorical(fp)
+
+        columns = {
+            "form": form_cat.codes,
+            "forms": np.asarray(form_cat.categories, dtype=object),
+            "fp": fp_cat.codes,
+            "fps": np.asarray(fp_cat.categories, dtype=object),
+            "fy": pd.to_numeric(pd.Series(fy, dtype=object), errors="coerce").to_numpy(np.float64),
+            "start": _to_dates(start),
+            "end": _to_dates(end),
+            "filed": _to_dates(filed),
+            "accn": np.asarray(accn, dtype=object),
+            "val": pd.to_numeric(pd.Series(val, dtype=object), errors="coerce").to_numpy(np.float64),
+        }
+
+        return cls(
+            columns,
+            ranges,
+            cik=xbrl.get("cik"),
+            entity_name=xbrl.get("entityName")
+        )
+
+    @classmethod
+    def from_table(cls, table: pd.DataFrame, cik=None, entity_name=None) -> "FactIndex":
+        """
+        Rebuild from a flat fact table in the layout of ``.table``
+        (rows of each (taxonomy, tag, unit) contiguous, in original order)
+        """
+        n = len(table)
+        keys = [table[c].to_numpy(dtype=object) for c in ("taxonomy", "tag", "unit")]
+
+        ranges = {}
+        if n:
+            change = np.zeros(n - 1, dtype=bool)
+            for k in keys:
+                change |= k[1:] != k[:-1]
+            bounds = np.r_[0, np.flatnonzero(change) + 1, n]
+            for a, b in zip(bounds[:-1], bounds[1:]):
+                ranges[(keys[0][a], keys[1][a], keys[2][a])] = (int(a), int(b))
+
+        form_cat = pd.Categorical(table["form"])
+        fp_cat = pd.Categorical(table["fp"])
+
+        columns = {
+            "form": form_cat.codes,
+            "forms": np.asarray(form_cat.categories, dtype=object),
+            "fp": fp_cat.codes,
+            "fps": np.asarray(fp_cat.categories, dtype=object),
+            "fy": table["fy"].to_numpy(np.float64, na_value=np.nan),
+            "start": table["start"].to_numpy("datetime64[D]"),
+            "end": table["end"].to_numpy("datetime64[D]"),
+            "filed": table["filed"].to_numpy("datetime64[D]"),
+            "accn": table["accn"].to_numpy(dtype=object),
+            "val": table["val"].to_numpy(np.float64, na_value=np.nan),
+        }
+
+        return cls(columns, ranges, cik=cik, entity_name=entity_name)
+
+    @property
+    def ranges(self) -> dict:
+        """
+        (taxonomy, tag, unit) -> (start, stop) row ranges
+        """
+        return dict(self._ranges)
+
+    def columns(self) -> dict:
+        """
+        Raw column arrays, in the layout accepted by the constructor
+        """
+        return {
+            "form": self.form,
+            "forms": self.forms,
+            "fp": self.fp,
+            "fps": self.fps,
+            "fy": self.fy,
+            "start": self.start,
+            "end": self.end,
+            "filed": self.filed,
+            "accn": self.accn,
+            "val": self.val,
+        }
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Approximate memory held by the index: column buffers, the strings
+        behind object columns and the range / tag maps
+        """
+        total = sys.getsizeof(self._ranges) + sys.getsizeof(self._tags)
+        for arr in self.columns().values():
+            total += arr.nbytes
+            if arr.dtype == object:
+                # Repeated values usually share one object; count each once
+                total += sum(sys.getsizeof(v) for v in {id(v): v for v in arr}.values())
+        return total
+
+    # ---------------------------------------------
+    # QUERIES
+    # ---------------------------------------------
+    def __len__(self) -> int:
+        return len(self.val)
+
+    def __contains__(self, tag: str) -> bool:
+        return tag in self._tags
+
+    def rows(self, tags, unit: str = "USD", taxonomy: str = "us-gaap") -> np.ndarray:
+        """
+        Row numbers for ``tags`` (in tag order) in one unit
+        """
+        spans = [
+            self._ranges[(taxonomy, tag, unit)]
+            for tag in tags
+            if (taxonomy, tag, unit) in self._ranges
+        ]
+        if not spans:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([np.arange(a, b) for a, b in spans])
+
+    def form_mask(self, rows: np.ndarray, form: str) -> np.ndarray:
+        codes = np.flatnonzero(self.forms == form)
+        if len(codes) == 0:
+            return np.zeros(len(rows), dtype=bool)
+        return self.form[rows] == codes[0]
+
+    def series(self, tags, col_name: str, unit: str = "USD", form: str = "10-K") -> pd.DataFrame:
+        """
+        Annual values for ``tags``, latest fiscal year first
+
+        Same contract as data_fetcher.extract_series: one row per fiscal
+        year, earlier tags (and earlier facts) win ties for a year.
+        """
+        rows = self.rows(tags, unit=unit)
+        rows = rows[self.form_mask(rows, form)]
+        rows = rows[~np.isnan(self.fy[rows])]
+
+        if len(rows) == 0:
+            return pd.DataFrame()
+
+        years = self.fy[rows].astype(np.int64)
+        order = np.argsort(-years, kind="stable")
+        years = years[order]
+        keep = np.r_[True, years[1:] != years[:-1]]
+
+        return pd.DataFrame({
+            "Year": years[keep],
+            col_name: self.val[rows[order][keep]],
+        })
+
+    def as_of_index(self, tags, unit: str = "USD", form: str = None, taxonomy: str = "us-gaap") -> AsOfIndex:
+        """
+        AsOfIndex over ``tags`` (in priority order) in one unit, optionally
+        restricted to one form
+
+        A new index each call, so a FactIndex shared through the fact
+        cache is never modified: callers that query repeatedly keep it.
+        """
+        rows = self.rows(tags, unit=unit, taxonomy=taxonomy)
+        if form is not None:
+            rows = rows[self.form_mask(rows, form)]
+        return AsOfIndex(rows, self.fy[rows], self.end[rows], self.filed[rows], self.val[rows])
+
+    def series_as_of(self, tags, as_of, unit: str = "USD", form: str = "10-K") -> dict:
+        """
+        Point-in-time version of ``series(...).iloc[0]`` for many dates
+
+        For each date in ``as_of`` only facts filed on or before it are
+        visible; the latest visible fiscal year wins, ties resolved as in
+        series(); facts without a filing date are never visible. Returns
+        the AsOfIndex.latest_annual fields ("found", "Year", "val", "end",
+        "filed", "row"), arrays aligned with ``as_of`` (NaN / NaT where
+        nothing had been filed yet).
+        """
+        return self.as_of_index(tags, unit=unit, form=form).latest_annual(as_of)
+
+    def latest_accession(self, form: str = "10-K"):
+        """
+        Accession number of the most recently filed ``form`` (None if absent)
+
+        Changes exactly when a new filing lands, so it makes a good cache key.
+        """
+        rows = np.flatnonzero(self.form_mask(np.arange(len(self)), form))
+        if len(rows) == 0:
+            return None
+        # NaT becomes the smallest int64, so undated facts never win
+        filed = self.filed[rows].astype(np.int64)
+        return self.accn[rows[np.argmax(filed)]]
+
+    @property
+    def table(self) -> pd.DataFrame:
+        """
+        Full fact table, for ad-hoc analysis (built on each access, so the
+        index itself stays immutable)
+        """
+        keys = np.empty(len(self), dtype=object)
+        taxonomy = np.empty(len(self), dtype=object)
+        unit = np.empty(len(self), dtype=object)
+        for (tax, tag, u), (a, b) in self._ranges.items():
+            keys[a:b] = tag
+            taxonomy[a:b] = tax
+            unit[a:b] = u
+
+        return pd.DataFrame({
+            "taxonomy": pd.Categorical(taxonomy),
+            "tag": pd.Categorical(keys),
+            "unit": pd.Categorical(unit),
+            "form": pd.Categorical.from_codes(self.form, self.forms),
+            "fy": self.fy,
+            "fp": pd.Categorical.from_codes(self.fp, self.fps),
+            "start": self.start,
+            "end": self.end,
+            "filed": self.filed,
+            "accn": self.accn,
+            "val": self.val,
+        })
+
+
+def _to_dates(values: list) -> np.ndarray:
+    return pd.to_datetime(
+        pd.Series(values, dtype=object),
+        format="%Y-%m-%d",
+        errors="coerce"
+    ).to_numpy("datetime64[D]")
+
+
+# -------------------------------------------------
+# DICT OR INDEX
+# -------------------------------------------------
+def get_fact_index(xbrl) -> FactIndex:
+    """
+    ``xbrl`` itself if it is a FactIndex, else a FactIndex built from the
+    companyfacts dict
+
+    Nothing is remembered between calls: code that queries one document
+    repeatedly (e.g. the extract_series calls of one valuation) should
+    pass a FactIndex (see data_fetcher.get_company_facts).
+    """
+    if isinstance(xbrl, FactIndex):
+        return xbrl
+    return FactIndex.from_companyfacts(xbrl)
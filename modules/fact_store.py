@@ -0,0 +1,204 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from modules.fact_index import FactIndex
+
+
+# -------------------------------------------------
+# GLOBAL SETTINGS
+# -------------------------------------------------
+FACT_STORE_DIR = Path(
+    os.environ.get(
+        "FACT_STORE_DIR",
+        Path.home() / ".cache" / "mountain_path" / "facts"
+    )
+)
+
+# "npz" (one file per filer) or "parquet" (partitioned dataset with
+# cross-company scans, see modules.parquet_store; needs pyarrow)
+FACT_STORE_FORMAT = os.environ.get("FACT_STORE_FORMAT", "npz")
+
+
+def _cik10(cik) -> str:
+    return str(int(cik)).zfill(10)
+
+
+# -------------------------------------------------
+# LOCAL COLUMNAR FACT STORE
+# -------------------------------------------------
+class FactStore:
+    """
+    One compressed columnar file per filer (CIK##########.npz) holding the
+    FactIndex arrays, plus manifest.json with per-filer metadata.
+
+    Strings that repeat (form, fp) are stored as small-integer codes, dates
+    as datetime64[D] and values as float64, so a filer's history loads
+    straight into a FactIndex without any JSON parsing.
+    """
+
+    def __init__(self, root=FACT_STORE_DIR):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._manifest_path = self.root / "manifest.json"
+        self._lock = threading.Lock()
+
+    # ---------------------------------------------
+    # READ
+    # ---------------------------------------------
+    def path(self, cik) -> Path:
+        return self.root / f"CIK{_cik10(cik)}.npz"
+
+    def __contains__(self, cik) -> bool:
+        return self.path(cik).exists()
+
+    def ciks(self) -> list:
+        return sorted(p.stem[3:] for p in self.root.glob("CIK*.npz"))
+
+    def load(self, cik) -> FactIndex:
+        """
+        FactIndex for ``cik`` (KeyError if the filer was never ingested)
+        """
+        path = self.path(cik)
+        if not path.exists():
+            raise KeyError(f"CIK {_cik10(cik)} not in fact store {self.root}")
+
+        with np.load(path, allow_pickle=False) as z:
+            ranges = {
+                (str(tax), str(tag), str(unit)): (int(a), int(b))
+                for tax, tag, unit, a, b in zip(
+                    z["range_taxonomy"], z["range_tag"], z["range_unit"],
+                    z["range_start"], z["range_stop"]
+                )
+            }
+            columns = {
+                "form": z["form"],
+                "forms": z["forms"].astype(object),
+                "fp": z["fp"],
+                "fps": z["fps"].astype(object),
+                "fy": z["fy"],
+                "start": z["start"],
+                "end": z["end"],
+                "filed": z["filed"],
+                "accn": z["accn"].astype(object),
+                "val": z["val"],
+            }
+            if "accn_missing" in z:
+                columns["accn"][z["accn_missing"]] = None
+            entity_name = str(z["entity_name"]) or None
+
+        return FactIndex(columns, ranges, cik=int(cik), entity_name=entity_name)
+
+    def manifest(self) -> dict:
+        try:
+            return json.loads(self._manifest_path.read_text())
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    # ---------------------------------------------
+    # WRITE
+    # ---------------------------------------------
+    def write(self, cik, index: FactIndex, source: str = None) -> dict:
+        """
+        Persist ``index`` for ``cik``; returns its manifest entry
+        """
+        cols = index.columns()
+        keys = list(index.ranges.items())
+
+        arrays = {
+            "form": cols["form"],
+            "forms": _str_array(cols["forms"]),
+            "fp": cols["fp"],
+            "fps": _str_array(cols["fps"]),
+            "fy": cols["fy"],
+            "start": cols["start"],
+            "end": cols["end"],
+            "filed": cols["filed"],
+            "accn": _str_array(cols["accn"]),
+            # Fixed-width strings cannot hold None; keep which ones were
+            "accn_missing": np.array([v is None for v in cols["accn"]], dtype=bool),
+            "val": cols["val"],
+            "range_taxonomy": _str_array([k[0] for k, _ in keys]),
+            "range_tag": _str_array([k[1] for k, _ in keys]),
+            "range_unit": _str_array([k[2] for k, _ in keys]),
+            "range_start": np.array([r[0] for _, r in keys], dtype=np.int64),
+            "range_stop": np.array([r[1] for _, r in keys], dtype=np.int64),
+            "entity_name": np.array(index.entity_name or ""),
+        }
+
+        path = self.path(cik)
+        tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npz")
+        np.savez_compressed(tmp, **arrays)
+        os.replace(tmp, path)
+
+        entry = {
+            "entity_name": index.entity_name,
+            "n_facts": len(index),
+            "bytes": path.stat().st_size,
+            "source": source,
+            "ingested_at": time.time(),
+        }
+        return entry
+
+    def write_batch(self, indexes: dict, source: str = None) -> dict:
+        """
+        Persist {cik: FactIndex}; returns {cik: manifest entry}
+        """
+        return {_cik10(cik): self.write(cik, index, source) for cik, index in indexes.items()}
+
+    def update_manifest(self, entries: dict) -> None:
+        """
+        Merge {cik: entry} into manifest.json (single writer: the caller)
+        """
+        with self._lock:
+            manifest = self.manifest()
+            manifest.update({_cik10(k): v for k, v in entries.items()})
+            tmp = self._manifest_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(manifest))
+            os.replace(tmp, self._manifest_path)
+
+    def compact(self, min_batches: int = 0) -> int:
+        """
+        Nothing to merge: each filer is always rewritten as one file
+        (same signature as ParquetFactStore.compact)
+        """
+        return 0
+
+
+def _str_array(values) -> np.ndarray:
+    # Fixed-width unicode keeps .npz files loadable without pickle
+    return np.array(["" if v is None else str(v) for v in values], dtype=str)
+
+
+# -------------------------------------------------
+# SHARED INSTANCE
+# -------------------------------------------------
+_default_store = None
+_default_lock = threading.Lock()
+
+
+def open_fact_store(root=FACT_STORE_DIR, fmt: str = None):
+    """
+    FactStore or ParquetFactStore at ``root``, per ``fmt`` (default
+    FACT_STORE_FORMAT)
+    """
+    fmt = fmt or FACT_STORE_FORMAT
+    if fmt == "parquet":
+        # Imported lazily: pyarrow is only needed for the Parquet backend
+        from modules.parquet_store import ParquetFactStore
+        return ParquetFactStore(root)
+    if fmt == "npz":
+        return FactStore(root)
+    raise ValueError(f"Unknown fact store format: {fmt}")
+
+
+def get_fact_store():
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = open_fact_store()
+        return _default_store
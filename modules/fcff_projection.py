@@ -1,45 +1,99 @@
-
+import numpy as np
 import pandas as pd
 
+from modules.instrumentation import timed
+
+
+FCFF_COLUMNS = ["Year", "Revenue", "EBIT", "NOPAT", "Reinvestment", "FCFF"]
 
+
+@timed
 def project_fcff(
     base_revenue: float,
     operating_margin: float,
     tax_rate: float,
     growth_rates: list,
     sales_to_capital: float,
-) -> pd.DataFrame:
+    as_frame: bool = True,
+):
     """
     Project FCFF using Damodaran-style reinvestment logic
+
+    Returns a DataFrame with FCFF_COLUMNS, or with ``as_frame=False`` the
+    same columns as a dict of arrays (no pandas work on hot paths).
     """
+    projection = project_fcff_batch(
+        base_revenue,
+        operating_margin,
+        tax_rate,
+        growth_rates,
+        sales_to_capital=sales_to_capital
+    )
+    return projection_frame(projection) if as_frame else projection
 
-    results = []
-    revenue_prev = base_revenue
 
-    for year, g in enumerate(growth_rates, start=1):
-        revenue = revenue_prev * (1 + g)
+def project_fcff_batch(
+    base_revenue,
+    operating_margin,
+    tax_rate,
+    growth_rates,
+    sales_to_capital=None,
+    reinvestment_rate=None,
+) -> dict:
+    """
+    Vectorized FCFF projection for one or many companies / scenarios
 
-        ebit = revenue * operating_margin
-        nopat = ebit * (1 - tax_rate)
+    Parameters
+    ----------
+    base_revenue : float or array (...)
+    growth_rates : array (..., n_years)
+    operating_margin, tax_rate, sales_to_capital : float or array
+        broadcast against (..., n_years): a (n_years,) array is a per-year
+        path shared by every row, an (n, 1) column a per-row constant
+    reinvestment_rate : optional, same broadcasting
+        Reinvest this share of NOPAT instead of revenue growth divided by
+        sales-to-capital (the run_multi_valuation convention)
 
-        revenue_change = revenue - revenue_prev
-        reinvestment = (
-            revenue_change / sales_to_capital
-            if sales_to_capital > 0
-            else 0.0
+    Revenue compounds growth; EBIT = revenue x margin; NOPAT = EBIT x
+    (1 - tax); reinvestment = revenue change / sales-to-capital (zero where
+    sales-to-capital <= 0). Returns {column: array (..., n_years)} for
+    FCFF_COLUMNS, with "Year" as 1..n_years.
+    """
+    growth = np.asarray(growth_rates, dtype=np.float64)
+    base = np.asarray(base_revenue, dtype=np.float64)[..., None]
+
+    revenue = base * np.cumprod(1 + growth, axis=-1)
+    ebit = revenue * np.asarray(operating_margin, dtype=np.float64)
+    nopat = ebit * (1 - np.asarray(tax_rate, dtype=np.float64))
+
+    if reinvestment_rate is not None:
+        reinvestment = nopat * np.asarray(reinvestment_rate, dtype=np.float64)
+    else:
+        sales_to_capital = np.asarray(sales_to_capital, dtype=np.float64)
+        revenue_change = np.diff(
+            revenue, axis=-1, prepend=np.broadcast_to(base, revenue.shape[:-1] + (1,))
         )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            reinvestment = np.where(sales_to_capital > 0, revenue_change / sales_to_capital, 0.0)
 
-        fcff = nopat - reinvestment
+    fcff = nopat - reinvestment
 
-        results.append({
-            "Year": year,
-            "Revenue": revenue,
-            "EBIT": ebit,
-            "NOPAT": nopat,
-            "Reinvestment": reinvestment,
-            "FCFF": fcff,
-        })
+    shape = fcff.shape
+    return {
+        "Year": np.arange(1, shape[-1] + 1),
+        "Revenue": np.broadcast_to(revenue, shape),
+        "EBIT": np.broadcast_to(ebit, shape),
+        "NOPAT": np.broadcast_to(nopat, shape),
+        "Reinvestment": np.broadcast_to(reinvestment, shape),
+        "FCFF": fcff,
+    }
 
-        revenue_prev = revenue
 
-    return pd.DataFrame(results)
+def projection_frame(projection: dict, row=()) -> pd.DataFrame:
+    """
+    Materialise one projection for display; ``row`` indexes the batch axes
+    """
+    return pd.DataFrame({
+        "Year": projection["Year"],
+        **{col: projection[col][row] for col in FCFF_COLUMNS[1:]}
+    })
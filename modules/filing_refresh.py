@@ -0,0 +1,316 @@
+"""
+Incremental refresh of cached companyfacts, driven by SEC submissions.
+
+    python -m modules.filing_refresh sp500.txt
+    python -m modules.filing_refresh AAPL MSFT 0000320193 --baseline
+
+The per-CIK submissions index (data.sec.gov/submissions) is small and
+lists every filing with its accession number. Each run compares the latest
+annual-report accession against the one recorded at the last sync; only
+filers with a new 10-K have companyfacts re-downloaded and, if they are in
+the local fact store, re-ingested. Filers with only a newer interim filing
+(10-Q, amendment, ...) have companyfacts revalidated; the rest just have
+their cached companyfacts marked fresh.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from modules.data_fetcher import SEC_XBRL_URL, get_cik_from_ticker
+from modules.fact_cache import get_fact_cache
+from modules.fact_index import FactIndex
+from modules.edgar_client import SEC_DATA_URL
+from modules.fact_store import get_fact_store
+from modules.sec_cache import SEC_CACHE_DIR, SEC_HEADERS, get_sec_cache
+
+
+# -------------------------------------------------
+# GLOBAL SETTINGS
+# -------------------------------------------------
+SEC_SUBMISSIONS_URL = SEC_DATA_URL + "/submissions/CIK{cik}.json"
+
+SEC_SYNC_STATE = Path(os.environ.get("SEC_SYNC_STATE", SEC_CACHE_DIR / "sync_state.json"))
+
+ANNUAL_FORMS = ("10-K", "10-K/A")
+
+
+def _cik10(cik) -> str:
+    return str(int(cik)).zfill(10)
+
+
+# -------------------------------------------------
+# SUBMISSIONS
+# -------------------------------------------------
+def latest_filing(submissions: dict, forms=ANNUAL_FORMS, xbrl_only: bool = False):
+    """
+    Most recently filed ``forms`` entry (any form if None) in a submissions
+    document, optionally only among filings with XBRL data:
+    {"accession", "form", "filed", "report_date"}, or None
+    """
+    recent = submissions.get("filings", {}).get("recent", {})
+    accessions = recent.get("accessionNumber", [])
+    # Without isXBRL every filing may carry facts
+    is_xbrl = recent.get("isXBRL") or [1] * len(accessions)
+
+    best = None
+    for form, accn, filed, report, xbrl in zip(
+        recent.get("form", []),
+        accessions,
+        recent.get("filingDate", []),
+        recent.get("reportDate", []),
+        is_xbrl,
+    ):
+        if forms is not None and form not in forms or xbrl_only and not xbrl:
+            continue
+        if best is None or filed > best["filed"]:
+            best = {"accession": accn, "form": form, "filed": filed, "report_date": report}
+    return best
+
+
+def check_filer(cik: str, forms=ANNUAL_FORMS, cache=None):
+    """
+    Latest annual filing for ``cik`` from a freshly revalidated
+    submissions document, with the accession of the latest XBRL filing
+    of any form as "xbrl_accession"
+    """
+    cache = cache or get_sec_cache()
+    body = cache.get(SEC_SUBMISSIONS_URL.format(cik=_cik10(cik)), headers=SEC_HEADERS, ttl=0)
+    submissions = json.loads(body)
+
+    filing = latest_filing(submissions, forms)
+    if filing is not None:
+        latest = latest_filing(submissions, forms=None, xbrl_only=True)
+        filing["xbrl_accession"] = latest["accession"] if latest is not None else None
+    return filing
+
+
+# -------------------------------------------------
+# SYNC STATE
+# -------------------------------------------------
+def load_sync_state(path=SEC_SYNC_STATE) -> dict:
+    """
+    {cik: {"accession", "form", "filed", "report_date", "xbrl_accession",
+    "synced_at"}}; "xbrl_accession" is None until cached companyfacts is
+    known to contain it
+    """
+    try:
+        return json.loads(Path(path).read_text())
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_sync_state(state: dict, path=SEC_SYNC_STATE) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(state, indent=1, sort_keys=True))
+    os.replace(tmp, path)
+
+
+# -------------------------------------------------
+# REFRESH
+# -------------------------------------------------
+def _pull(cik: str, filing: dict, cache) -> FactIndex:
+    """
+    Re-download companyfacts for ``cik``; None if SEC has not folded the
+    new filing into it yet
+    """
+    body = cache.get(SEC_XBRL_URL.format(cik=cik), headers=SEC_HEADERS, ttl=0)
+    index = FactIndex.from_companyfacts(json.loads(body))
+    if not np.any(index.accn == filing["accession"]):
+        return None
+    return index
+
+
+def _revalidate(cik: str, filing: dict, cache) -> bool:
+    """
+    Revalidate cached companyfacts for ``cik``; whether it now contains
+    the filer's latest XBRL filing
+    """
+    body = cache.get(SEC_XBRL_URL.format(cik=cik), headers=SEC_HEADERS, ttl=0)
+    return filing["xbrl_accession"] is None or filing["xbrl_accession"].encode() in body
+
+
+def refresh_filers(
+    ciks,
+    state_path=SEC_SYNC_STATE,
+    forms=ANNUAL_FORMS,
+    workers: int = 4,
+    baseline: bool = False,
+    cache=None,
+    store=None,
+    progress=None,
+) -> dict:
+    """
+    Check ``ciks`` against their submissions index and refresh only the
+    filers with a new annual report since the last sync
+
+    A CIK never synced before counts as changed, unless ``baseline`` is
+    set: then current accessions are just recorded. Cached companyfacts is
+    only marked fresh when it is known to contain the filer's latest XBRL
+    filing of any form; after a new 10-Q or amendment it is revalidated
+    instead (not re-ingested). A filer whose companyfacts does not yet
+    contain the new accession stays pending and is retried on the next run.
+
+    Only this process's fact cache (modules.fact_cache) is invalidated;
+    other processes, such as the app, see refreshed facts once their
+    cached entries pass FACT_CACHE_TTL.
+
+    Returns {"checked", "changed", "refreshed", "revalidated", "pending",
+    "failed", "seconds"}.
+    """
+    started = time.time()
+    cache = cache or get_sec_cache()
+    store = store or get_fact_store()
+    ciks = list(dict.fromkeys(_cik10(c) for c in ciks))
+    state = load_sync_state(state_path)
+    failed = {}
+
+    def check(cik):
+        try:
+            return cik, check_filer(cik, forms, cache)
+        except Exception as e:
+            failed[cik] = f"{type(e).__name__}: {e}"
+            return cik, None
+
+    with ThreadPoolExecutor(workers) as pool:
+        latest = {}
+        for i, (cik, filing) in enumerate(pool.map(check, ciks), 1):
+            if filing is not None:
+                latest[cik] = filing
+            if progress:
+                progress("check", i, len(ciks))
+
+        changed, current, interim = [], [], []
+        for cik, filing in latest.items():
+            synced = state.get(cik, {})
+            if synced.get("accession") != filing["accession"]:
+                changed.append(cik)
+            elif synced.get("xbrl_accession") == filing["xbrl_accession"]:
+                current.append(cik)
+            else:
+                interim.append(cik)
+        cache.mark_fresh([SEC_XBRL_URL.format(cik=cik) for cik in current])
+
+        def pull(cik):
+            try:
+                return cik, _pull(cik, latest[cik], cache)
+            except Exception as e:
+                failed[cik] = f"{type(e).__name__}: {e}"
+                return cik, None
+
+        def revalidate(cik):
+            try:
+                return cik, _revalidate(cik, latest[cik], cache)
+            except Exception as e:
+                failed[cik] = f"{type(e).__name__}: {e}"
+                return cik, False
+
+        indexes, revalidated, pending = {}, [], []
+        if not baseline:
+            for i, (cik, index) in enumerate(pool.map(pull, changed), 1):
+                if index is not None:
+                    indexes[cik] = index
+                elif cik not in failed:
+                    pending.append(cik)
+                if progress:
+                    progress("pull", i, len(changed))
+
+            for i, (cik, ok) in enumerate(pool.map(revalidate, interim), 1):
+                if ok:
+                    revalidated.append(cik)
+                elif cik not in failed:
+                    pending.append(cik)
+                if progress:
+                    progress("revalidate", i, len(interim))
+
+    stored = {cik: index for cik, index in indexes.items() if cik in store}
+    if stored:
+        store.update_manifest(store.write_batch(stored, source="filing_refresh"))
+        store.compact()
+
+    # Indexes loaded before the refresh are stale now
+    refreshed = set(indexes) | set(revalidated)
+    get_fact_cache().invalidate(lambda key: key[0] in refreshed)
+
+    now = time.time()
+    for cik in (changed + interim if baseline else list(indexes) + revalidated):
+        state[cik] = {**latest[cik], "synced_at": now}
+    for cik, index in indexes.items():
+        if not np.any(index.accn == latest[cik]["xbrl_accession"]):
+            # A later interim filing is not in it yet: revalidate next run
+            state[cik]["xbrl_accession"] = None
+    cache.flush()
+    save_sync_state(state, state_path)
+
+    return {
+        "checked": len(ciks),
+        "changed": changed,
+        "refreshed": list(indexes),
+        "revalidated": revalidated,
+        "pending": pending,
+        "failed": failed,
+        "seconds": time.time() - started,
+    }
+
+
+# -------------------------------------------------
+# COMMAND LINE
+# -------------------------------------------------
+def read_universe(sources: list) -> list:
+    """
+    CIKs from tickers / CIKs given directly or one per line in files
+    """
+    items = []
+    for source in sources:
+        path = Path(source)
+        if path.is_file():
+            for line in path.read_text().splitlines():
+                line = line.split("#")[0].split(",")[0].strip()
+                if line and line.lower() not in ("ticker", "cik"):
+                    items.append(line)
+        else:
+            items.append(source)
+
+    return [_cik10(item) if item.isdigit() else get_cik_from_ticker(item) for item in items]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Refresh cached SEC companyfacts for filers with a new 10-K")
+    parser.add_argument("universe", nargs="+", help="Tickers, CIKs, or files with one per line")
+    parser.add_argument("--state", default=str(SEC_SYNC_STATE), help="Sync state file")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent SEC requests")
+    parser.add_argument("--baseline", action="store_true", help="Record current filings without re-downloading")
+    args = parser.parse_args(argv)
+
+    def progress(stage, done, total):
+        print(f"\r  {stage}: {done:>6}/{total}", end="", flush=True)
+
+    result = refresh_filers(
+        read_universe(args.universe),
+        state_path=args.state,
+        workers=args.workers,
+        baseline=args.baseline,
+        progress=progress
+    )
+
+    print(
+        f"\nChecked {result['checked']} filers in {result['seconds']:,.1f}s: "
+        f"{len(result['changed'])} changed, {len(result['refreshed'])} refreshed, "
+        f"{len(result['revalidated'])} revalidated, {len(result['pending'])} pending"
+    )
+    for cik, error in sorted(result["failed"].items()):
+        print(f"  ✗ CIK{cik}: {error}")
+
+    return 1 if result["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,292 @@
+import contextvars
+import functools
+import importlib.util
+import io
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+
+
+logger = logging.getLogger(__name__)
+
+
+# -------------------------------------------------
+# GLOBAL SETTINGS
+# -------------------------------------------------
+# Append every finished trace to this JSON-lines file
+PERF_LOG = os.environ.get("PERF_LOG")
+
+# Rows of profiler output kept per trace
+PROFILE_ROWS = 40
+
+_current_trace = contextvars.ContextVar("current_trace", default=None)
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+# Process-wide counters, whether or not a trace is active
+_totals = {}
+_totals_lock = threading.Lock()
+
+
+# -------------------------------------------------
+# TRACE
+# -------------------------------------------------
+class Trace:
+    """
+    Timings and counters for one unit of work (e.g. one app valuation).
+
+    While a trace is active (start() / ``with trace(...)``), every span()
+    and count() in the same thread or asyncio task is recorded into it.
+    Outside a trace, spans cost one context-variable lookup.
+
+    ``profile`` may be "cprofile" or "pyinstrument" to also capture a
+    profile of everything between start() and stop().
+    """
+
+    def __init__(self, name: str, profile: str = None, **attrs):
+        self.id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.attrs = attrs
+        self.profile = profile
+        self.spans = []             # finished spans, in completion order
+        self.counters = {}
+        self.profile_text = None
+        self.started_at = None
+        self.seconds = None
+
+        self._t0 = None
+        self._token = None
+        self._profiler = None
+        self._lock = threading.Lock()
+
+    def start(self) -> "Trace":
+        self.started_at = time.time()
+        self._t0 = time.perf_counter()
+        self._token = _current_trace.set(self)
+        if self.profile:
+            self._profiler = _start_profiler(self.profile)
+        return self
+
+    def stop(self) -> "Trace":
+        if self._profiler is not None:
+            self.profile_text = _stop_profiler(self.profile, self._profiler)
+            self._profiler = None
+        self.seconds = time.perf_counter() - self._t0
+        if self._token is not None:
+            _current_trace.reset(self._token)
+            self._token = None
+        if PERF_LOG:
+            export_jsonl(self, PERF_LOG)
+        return self
+
+    def add_span(self, record: dict) -> None:
+        with self._lock:
+            self.spans.append(record)
+
+    def add_count(self, name: str, n) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def stages(self) -> list:
+        """
+        Spans in start order, each with its nesting depth
+        """
+        return sorted(self.spans, key=lambda s: s["start"])
+
+    def to_records(self) -> list:
+        """
+        JSON-ready records: one per span, then one summary record
+        """
+        base = {"trace": self.id, "trace_name": self.name}
+        records = [{**base, "type": "span", **s} for s in self.stages()]
+        records.append({
+            **base,
+            "type": "trace",
+            "started_at": self.started_at,
+            "seconds": self.seconds,
+            "counters": dict(self.counters),
+            "attrs": self.attrs,
+        })
+        return records
+
+    def to_jsonl(self) -> str:
+        return "".join(json.dumps(r, default=str) + "\n" for r in self.to_records())
+
+
+def trace(name: str, profile: str = None, **attrs):
+    """
+    Context manager running a Trace: ``with trace("valuation") as t: ...``
+    """
+    return _TraceContext(Trace(name, profile=profile, **attrs))
+
+
+class _TraceContext:
+    def __init__(self, t: Trace):
+        self.trace = t
+
+    def __enter__(self) -> Trace:
+        return self.trace.start()
+
+    def __exit__(self, *exc):
+        self.trace.stop()
+
+
+def current_trace():
+    return _current_trace.get()
+
+
+# -------------------------------------------------
+# SPANS
+# -------------------------------------------------
+class span:
+    """
+    Time a pipeline stage into the active trace
+
+        with span("get_company_xbrl", cik=cik):
+            ...
+
+        @span("dcf_valuation")
+        def dcf_valuation(...): ...
+
+    Nested spans record their parent and depth; an exception is recorded
+    on the span and re-raised.
+    """
+
+    __slots__ = ("name", "attrs", "_trace", "_t0", "_token", "_record")
+
+    def __init__(self, name: str, **attrs):
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        self._trace = _current_trace.get()
+        if self._trace is None:
+            return self
+        parent = _current_span.get()
+        self._record = {
+            "name": self.name,
+            "parent": parent["name"] if parent else None,
+            "depth": parent["depth"] + 1 if parent else 0,
+            **({"attrs": self.attrs} if self.attrs else {}),
+        }
+        self._token = _current_span.set(self._record)
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._trace is None:
+            return False
+        end = time.perf_counter()
+        _current_span.reset(self._token)
+        self._record["start"] = self._t0 - self._trace._t0
+        self._record["seconds"] = end - self._t0
+        if exc_type is not None:
+            self._record["error"] = exc_type.__name__
+        self._trace.add_span(self._record)
+        return False
+
+    def __call__(self, func):
+        name, attrs = self.name, self.attrs
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current_trace.get() is None:
+                return func(*args, **kwargs)
+            with span(name, **attrs):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+
+def timed(func=None, *, name: str = None):
+    """
+    Decorator form of span(), named after the function by default
+    """
+    if func is None:
+        return lambda f: timed(f, name=name)
+    return span(name or func.__name__)(func)
+
+
+# -------------------------------------------------
+# COUNTERS
+# -------------------------------------------------
+def count(name: str, n=1) -> None:
+    """
+    Add ``n`` to counter ``name`` in the active trace and the process totals
+    """
+    with _totals_lock:
+        _totals[name] = _totals.get(name, 0) + n
+    t = _current_trace.get()
+    if t is not None:
+        t.add_count(name, n)
+
+
+def totals() -> dict:
+    """
+    Process-wide counters since start-up (or the last reset_totals())
+    """
+    with _totals_lock:
+        return dict(_totals)
+
+
+def reset_totals() -> None:
+    with _totals_lock:
+        _totals.clear()
+
+
+# -------------------------------------------------
+# PROFILING
+# -------------------------------------------------
+def profilers() -> list:
+    """
+    Profilers usable in this environment
+    """
+    available = ["cprofile"]
+    if importlib.util.find_spec("pyinstrument") is not None:
+        available.append("pyinstrument")
+    return available
+
+
+def _start_profiler(kind: str):
+    if kind == "cprofile":
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+
+    if kind == "pyinstrument":
+        # Imported lazily: optional dependency
+        from pyinstrument import Profiler
+        profiler = Profiler()
+        profiler.start()
+        return profiler
+
+    raise ValueError(f"Unknown profiler: {kind}")
+
+
+def _stop_profiler(kind: str, profiler) -> str:
+    if kind == "pyinstrument":
+        profiler.stop()
+        return profiler.output_text(unicode=True, color=False)
+
+    import pstats
+    profiler.disable()
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(PROFILE_ROWS)
+    return out.getvalue()
+
+
+# -------------------------------------------------
+# EXPORT
+# -------------------------------------------------
+def export_jsonl(t: Trace, path) -> None:
+    """
+    Append a trace's records to a JSON-lines file
+    """
+    try:
+        with open(path, "a") as f:
+            f.write(t.to_jsonl())
+    except OSError as e:
+        logger.warning("Could not write performance log %s: %s", path, e)
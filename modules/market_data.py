@@ -0,0 +1,239 @@
+import csv
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from modules.instrumentation import count, span
+
+
+# -------------------------------------------------
+# GLOBAL SETTINGS
+# -------------------------------------------------
+MARKET_DATA_TTL = int(os.environ.get("MARKET_DATA_TTL", 3600))    # seconds
+
+# Empty quotes (ticker missing from a fetch, transient provider failure)
+# are only remembered briefly, so they do not pin NaN prices for a full TTL
+MARKET_DATA_NEGATIVE_TTL = int(os.environ.get("MARKET_DATA_NEGATIVE_TTL", 60))
+
+# Set to a CSV/JSON quotes file to run without Yahoo Finance
+MARKET_DATA_FILE = os.environ.get("MARKET_DATA_FILE")
+
+# Yahoo's published beta: 5 years of monthly returns against the S&P 500
+BETA_BENCHMARK = "^GSPC"
+BETA_PERIOD = "5y"
+BETA_INTERVAL = "1mo"
+
+
+# -------------------------------------------------
+# PROVIDER INTERFACE
+# -------------------------------------------------
+class MarketDataProvider:
+    """
+    Source of per-ticker quotes: {"price", "beta", "market_cap"}
+    (any of which may be None).
+
+    Subclasses implement _fetch(tickers) for a batch; this base class adds a
+    TTL cache so repeated lookups - and every ticker already fetched in a
+    batch - are served from memory. Empty quotes expire after
+    ``negative_ttl`` instead, so a missed ticker is retried soon.
+    """
+
+    def __init__(self, ttl: int = MARKET_DATA_TTL, negative_ttl: int = MARKET_DATA_NEGATIVE_TTL):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._cache = {}        # ticker -> (expires_at, quote)
+        self._lock = threading.Lock()
+
+    def get_quote(self, ticker: str) -> dict:
+        return self.get_quotes([ticker])[ticker.upper()]
+
+    def get_quotes(self, tickers: list) -> dict:
+        """
+        Quotes for ``tickers``; only stale or missing ones are fetched, in
+        one _fetch call
+        """
+        tickers = [t.upper() for t in tickers]
+        now = time.time()
+
+        with self._lock:
+            missing = [
+                t for t in dict.fromkeys(tickers)
+                if t not in self._cache or now >= self._cache[t][0]
+            ]
+
+        count("market_data.hits", len(set(tickers)) - len(missing))
+        if missing:
+            with span("market_data_fetch", provider=type(self).__name__, tickers=len(missing)):
+                fetched = self._fetch(missing)
+            with self._lock:
+                for t in missing:
+                    quote = fetched.get(t) or _empty_quote()
+                    empty = all(v is None for v in quote.values())
+                    self._cache[t] = (now + (self.negative_ttl if empty else self.ttl), quote)
+
+        with self._lock:
+            return {t: dict(self._cache[t][1]) for t in tickers}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def _fetch(self, tickers: list) -> dict:
+        raise NotImplementedError
+
+
+def _empty_quote() -> dict:
+    return {"price": None, "beta": None, "market_cap": None}
+
+
+# -------------------------------------------------
+# LOCAL FILE / IN-MEMORY BACKEND
+# -------------------------------------------------
+class StaticMarketData(MarketDataProvider):
+    """
+    Quotes from a dict, or from a CSV / JSON file with columns
+    ticker, price, beta, market_cap (for offline runs and reproducible
+    backtests)
+    """
+
+    def __init__(self, quotes: dict = None, ttl: int = MARKET_DATA_TTL):
+        super().__init__(ttl)
+        self.quotes = {t.upper(): {**_empty_quote(), **q} for t, q in (quotes or {}).items()}
+
+    @classmethod
+    def from_file(cls, path) -> "StaticMarketData":
+        path = Path(path)
+        if path.suffix.lower() == ".json":
+            return cls(json.loads(path.read_text()))
+
+        quotes = {}
+        with open(path, newline="") as f:
+            for row in csv.DictReader(f):
+                quotes[row["ticker"]] = {
+                    k: float(row[k]) if row.get(k) not in (None, "") else None
+                    for k in ("price", "beta", "market_cap")
+                }
+        return cls(quotes)
+
+    def _fetch(self, tickers: list) -> dict:
+        return {t: self.quotes[t] for t in tickers if t in self.quotes}
+
+
+# -------------------------------------------------
+# YAHOO FINANCE BACKEND
+# -------------------------------------------------
+class YahooMarketData(MarketDataProvider):
+    """
+    Yahoo Finance quotes.
+
+    A single ticker (the app) makes one Ticker.info call: Yahoo's own
+    price, published beta and market cap. A batch makes one yf.download
+    call for every ticker plus the benchmark, taking the last close as
+    price and regressing monthly returns for beta over the same window
+    Yahoo uses; market cap is left to the caller (price x SEC share count).
+    """
+
+    def _fetch(self, tickers: list) -> dict:
+        # Imported lazily: yfinance is heavy and only needed on a cache miss
+        import yfinance as yf
+
+        if len(tickers) == 1:
+            info = yf.Ticker(tickers[0]).info or {}
+            return {
+                tickers[0]: {
+                    "price": info.get("currentPrice") or info.get("regularMarketPrice") or info.get("previousClose"),
+                    "beta": info.get("beta"),
+                    "market_cap": info.get("marketCap"),
+                }
+            }
+
+        prices = yf.download(
+            tickers + [BETA_BENCHMARK],
+            period=BETA_PERIOD,
+            interval=BETA_INTERVAL,
+            auto_adjust=True,
+            progress=False,
+            threads=True,
+        )
+        return prices_to_quotes(prices["Close"], tickers, BETA_BENCHMARK) if "Close" in prices else {}
+
+
+def download_price_history(tickers: list, start, end=None) -> "pd.DataFrame":
+    """
+    Daily adjusted closes from Yahoo Finance, one column per ticker
+    (for backtests; see modules.backtest)
+    """
+    import yfinance as yf
+
+    prices = yf.download(
+        list(tickers),
+        start=start,
+        end=end,
+        interval="1d",
+        auto_adjust=True,
+        progress=False,
+        threads=True,
+    )["Close"]
+
+    # A single ticker may come back as a Series
+    return prices.to_frame(tickers[0]) if prices.ndim == 1 else prices
+
+
+def prices_to_quotes(prices, tickers: list, benchmark: str, min_periods: int = 24) -> dict:
+    """
+    Last price and OLS beta per ticker from a wide price table
+    (one column per ticker, benchmark included); beta is None when the
+    benchmark column is missing
+    """
+    returns = prices.pct_change(fill_method=None)
+
+    quotes = {}
+    for t in tickers:
+        if t not in prices:
+            continue
+        last = prices[t].dropna()
+
+        beta = None
+        pair = returns[[t, benchmark]].dropna() if benchmark in prices else ()
+        if len(pair) >= min_periods:
+            cov = np.cov(pair[t], pair[benchmark])
+            beta = float(cov[0, 1] / cov[1, 1]) if cov[1, 1] > 0 else None
+
+        quotes[t] = {
+            "price": float(last.iloc[-1]) if len(last) else None,
+            "beta": beta,
+            "market_cap": None,
+        }
+
+    return quotes
+
+
+# -------------------------------------------------
+# SHARED INSTANCE
+# -------------------------------------------------
+_default_provider = None
+_default_lock = threading.Lock()
+
+
+def get_market_data() -> MarketDataProvider:
+    """
+    Process-wide provider: MARKET_DATA_FILE if set, else Yahoo Finance
+    """
+    global _default_provider
+    with _default_lock:
+        if _default_provider is None:
+            if MARKET_DATA_FILE:
+                _default_provider = StaticMarketData.from_file(MARKET_DATA_FILE)
+            else:
+                _default_provider = YahooMarketData()
+        return _default_provider
+
+
+def set_market_data(provider: MarketDataProvider) -> None:
+    global _default_provider
+    with _default_lock:
+        _default_provider = provider
@@ -0,0 +1,296 @@
+import math
+
+import numpy as np
+
+from modules.dcf import dcf_valuation_batch
+from modules.fcff_projection import project_fcff_batch
+
+
+# -------------------------------------------------
+# GLOBAL SETTINGS
+# -------------------------------------------------
+# Draws per independently seeded block: results for a seed depend on this,
+# never on chunk_size
+SEED_BLOCK = 10_000
+
+
+# -------------------------------------------------
+# STREAMING QUANTILE SKETCH
+# -------------------------------------------------
+class _Store:
+    """
+    Dense bucket counts over a growing range of integer indexes
+    """
+
+    def __init__(self):
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.offset = 0
+
+    def add(self, index: np.ndarray) -> None:
+        if len(index) == 0:
+            return
+        lo, hi = int(index.min()), int(index.max())
+        self._extend(lo, hi)
+        np.add.at(self.counts, index - self.offset, 1)
+
+    def merge(self, other: "_Store") -> None:
+        if other.counts.sum() == 0:
+            return
+        self._extend(other.offset, other.offset + len(other.counts) - 1)
+        start = other.offset - self.offset
+        self.counts[start:start + len(other.counts)] += other.counts
+
+    def _extend(self, lo: int, hi: int) -> None:
+        if len(self.counts) == 0:
+            self.counts = np.zeros(hi - lo + 1, dtype=np.int64)
+            self.offset = lo
+            return
+        cur_hi = self.offset + len(self.counts) - 1
+        new_lo, new_hi = min(lo, self.offset), max(hi, cur_hi)
+        if new_lo < self.offset or new_hi > cur_hi:
+            self.counts = np.pad(self.counts, (self.offset - new_lo, new_hi - cur_hi))
+            self.offset = new_lo
+
+
+class QuantileSketch:
+    """
+    Mergeable log-bucket quantile sketch (DDSketch-style).
+
+    Every quantile estimate is within ``relative_accuracy`` of the true
+    value, and memory depends only on the dynamic range of the data, not on
+    the number of values added.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.005, min_value: float = 1e-9):
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+
+        self._positive = _Store()
+        self._negative = _Store()
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, values) -> None:
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return
+
+        pos = values[values > self.min_value]
+        neg = -values[values < -self.min_value]
+
+        self._positive.add(self._index(pos))
+        self._negative.add(self._index(neg))
+        self.zero_count += len(values) - len(pos) - len(neg)
+
+        self.count += len(values)
+        self.sum += float(values.sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        self._positive.merge(other._positive)
+        self._negative.merge(other._negative)
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimated value at quantile ``q`` (0-1)
+        """
+        if self.count == 0:
+            return math.nan
+        rank = q * (self.count - 1)
+
+        # Negative values, most negative first
+        neg = self._negative
+        cum_neg = np.cumsum(neg.counts[::-1])
+        if len(cum_neg) and cum_neg[-1] > rank:
+            i = int(np.searchsorted(cum_neg, rank, side="right"))
+            return self._clamp(-self._value(neg.offset + len(neg.counts) - 1 - i))
+
+        cum = (int(cum_neg[-1]) if len(cum_neg) else 0) + self.zero_count
+        if cum > rank:
+            return 0.0
+
+        pos = self._positive
+        cum_pos = np.cumsum(pos.counts) + cum
+        i = int(np.searchsorted(cum_pos, rank, side="right"))
+        i = min(i, len(pos.counts) - 1)
+        return self._clamp(self._value(pos.offset + i))
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else math.nan
+
+    def _index(self, magnitudes: np.ndarray) -> np.ndarray:
+        return np.ceil(np.log(magnitudes) / self._log_gamma).astype(np.int64)
+
+    def _value(self, index: int) -> float:
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+    def _clamp(self, value: float) -> float:
+        return min(max(value, self.min), self.max)
+
+
+# -------------------------------------------------
+# ASSUMPTION DISTRIBUTIONS
+# -------------------------------------------------
+def default_distributions(base: dict, wacc: float, terminal_growth: float = 0.03, n_years: int = 5) -> dict:
+    """
+    Reasonable starting distributions around the base-year point estimates
+
+    Every entry may be replaced by a float (held constant), any frozen
+    scipy.stats distribution, or - for "growth" - a list with one of either
+    per projection year.
+    """
+    # Imported lazily: scipy.stats alone takes longer to import than the
+    # rest of the package, and only these defaults need it
+    from scipy import stats
+
+    margin = base["operating_margin"]
+
+    return {
+        "growth": [stats.norm(0.08, 0.04)] * n_years,
+        "operating_margin": stats.norm(margin, abs(margin) * 0.15),
+        "tax_rate": base["tax_rate"],
+        "sales_to_capital": stats.lognorm(s=0.25, scale=2.5),
+        "wacc": stats.norm(wacc, 0.01),
+        "terminal_growth": stats.triang(c=0.5, loc=terminal_growth - 0.01, scale=0.02),
+    }
+
+
+def _sample(spec, size: int, rng: np.random.Generator) -> np.ndarray:
+    if hasattr(spec, "rvs"):
+        return np.asarray(spec.rvs(size=size, random_state=rng), dtype=np.float64)
+    return np.full(size, float(spec))
+
+
+def _sample_growth(spec, size: int, n_years: int, rng: np.random.Generator) -> np.ndarray:
+    if isinstance(spec, (list, tuple)):
+        if len(spec) != n_years:
+            raise ValueError(f"Expected {n_years} growth distributions, got {len(spec)}")
+        return np.column_stack([_sample(s, size, rng) for s in spec])
+    return _sample(spec, size * n_years, rng).reshape(size, n_years)
+
+
+# -------------------------------------------------
+# SIMULATION
+# -------------------------------------------------
+def simulate_chunk(
+    base_revenue: float,
+    distributions: dict,
+    net_debt: float,
+    shares_outstanding: float,
+    size: int,
+    rng,
+    n_years: int = 5,
+) -> dict:
+    """
+    Draw ``size`` scenarios and value them in one vectorized pass
+
+    ``rng`` is a Generator, or a list of (size, Generator) blocks whose
+    draws are concatenated (their sizes must add up to ``size``).
+    """
+    blocks = rng if isinstance(rng, list) else [(size, rng)]
+    draws = [_draw(distributions, n, block_rng, n_years) for n, block_rng in blocks]
+    growth, margin, tax_rate, sales_to_capital, wacc, terminal_growth = (
+        np.concatenate(column) for column in zip(*draws)
+    )
+
+    fcff = project_fcff_batch(
+        base_revenue,
+        margin[:, None],
+        tax_rate[:, None],
+        growth,
+        sales_to_capital=sales_to_capital[:, None]
+    )["FCFF"]
+
+    return dcf_valuation_batch(
+        fcff,
+        wacc,
+        terminal_growth,
+        net_debt=net_debt,
+        shares_outstanding=shares_outstanding
+    )
+
+
+def _draw(distributions: dict, size: int, rng: np.random.Generator, n_years: int) -> tuple:
+    return (
+        _sample_growth(distributions["growth"], size, n_years, rng),
+        _sample(distributions["operating_margin"], size, rng),
+        _sample(distributions["tax_rate"], size, rng),
+        _sample(distributions["sales_to_capital"], size, rng),
+        _sample(distributions["wacc"], size, rng),
+        _sample(distributions["terminal_growth"], size, rng),
+    )
+
+
+def run_monte_carlo(
+    base: dict,
+    distributions: dict,
+    net_debt: float,
+    shares_outstanding: float,
+    n_draws: int = 100_000,
+    chunk_size: int = 100_000,
+    seed: int = None,
+    n_years: int = 5,
+    percentiles=(5, 25, 50, 75, 95),
+    relative_accuracy: float = 0.005,
+) -> dict:
+    """
+    Monte Carlo fair value per share
+
+    Draws are evaluated about ``chunk_size`` at a time (rounded to whole
+    blocks of SEED_BLOCK) and folded into streaming quantile sketches, so
+    memory is bounded regardless of ``n_draws``. Each block of SEED_BLOCK
+    draws gets its own child of SeedSequence(seed), so a given seed
+    reproduces the same draws whatever the chunk size.
+    """
+    n_blocks = math.ceil(n_draws / SEED_BLOCK)
+    seeds = np.random.SeedSequence(seed).spawn(n_blocks)
+    blocks = [
+        (min(SEED_BLOCK, n_draws - i * SEED_BLOCK), np.random.default_rng(child))
+        for i, child in enumerate(seeds)
+    ]
+    per_chunk = max(1, chunk_size // SEED_BLOCK)
+
+    fair_value = QuantileSketch(relative_accuracy)
+    enterprise_value = QuantileSketch(relative_accuracy)
+    n_valid = 0
+
+    for i in range(0, n_blocks, per_chunk):
+        chunk = blocks[i:i + per_chunk]
+        res = simulate_chunk(
+            base["revenue"],
+            distributions,
+            net_debt,
+            shares_outstanding,
+            sum(n for n, _ in chunk),
+            chunk,
+            n_years=n_years
+        )
+        valid = res["Valid"]
+        n_valid += int(valid.sum())
+        fair_value.add(res["FairValuePerShare"][valid])
+        enterprise_value.add(res["EnterpriseValue"][valid])
+
+    return {
+        "percentiles": {p: fair_value.quantile(p / 100) for p in percentiles},
+        "ev_percentiles": {p: enterprise_value.quantile(p / 100) for p in percentiles},
+        "mean": fair_value.mean,
+        "n_draws": n_draws,
+        "n_valid": n_valid,
+        "n_invalid": n_draws - n_valid,
+        "sketch": fair_value,
+    }
@@ -1,3 +1,7 @@
+from modules.instrumentation import timed
+
+
+@timed
 def get_net_debt(xbrl: dict, extract) -> float:
     """
     Compute Net Debt = Total Debt - Cash & Cash Equivalents
@@ -0,0 +1,421 @@
+import json
+import os
+import secrets
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from modules.fact_index import FactIndex
+
+
+# compact() is a no-op until the dataset holds more batches than this
+PARQUET_COMPACT_BATCHES = int(os.environ.get("PARQUET_COMPACT_BATCHES", 16))
+
+
+def _cik10(cik) -> str:
+    return str(int(cik)).zfill(10)
+
+
+# Hive-style fy=YYYY directories; facts without a fiscal year land in
+# fy=__HIVE_DEFAULT_PARTITION__
+_PARTITIONING = ds.partitioning(pa.schema([("fy", pa.int16())]), flavor="hive")
+
+_DICT = pa.dictionary(pa.int32(), pa.string())
+
+SCHEMA = pa.schema([
+    ("cik", pa.int32()),
+    ("taxonomy", _DICT),
+    ("tag", _DICT),
+    ("unit", _DICT),
+    ("form", _DICT),
+    ("fp", _DICT),
+    ("start", pa.date32()),
+    ("end", pa.date32()),
+    ("filed", pa.date32()),
+    ("accn", _DICT),
+    ("val", pa.float64()),
+    ("row", pa.int32()),          # position in the filer's FactIndex
+    ("batch", pa.int64()),        # write that produced the row
+    ("fy", pa.int16()),
+])
+
+
+# -------------------------------------------------
+# PARTITIONED PARQUET FACT STORE
+# -------------------------------------------------
+class ParquetFactStore:
+    """
+    Normalised XBRL facts for many filers in one Parquet dataset,
+    partitioned by fiscal year (root/fy=2023/batch-<id>-0.parquet).
+
+    Tag, unit, form, fp and accession columns are dictionary-encoded, so a
+    year of the whole universe stays compact and a tag filter compares
+    integer codes. Within each file rows are sorted by tag, so row-group
+    statistics let scans skip most of a partition.
+
+    Each write is a new batch of files; manifest.json records which batch
+    currently owns each CIK. Re-ingesting a filer drops its rows from the
+    batch that owned it before, and compact() merges accumulated batches
+    back into one file per partition.
+
+    Same read interface as FactStore (``cik in store``, ``load``, ``ciks``,
+    ``manifest``), plus cross-company ``scan`` and ``scan_annual``.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._manifest_path = self.root / "manifest.json"
+        self._lock = threading.Lock()
+        self._manifest = None       # (stat signature, parsed manifest)
+
+    # ---------------------------------------------
+    # READ: ONE FILER
+    # ---------------------------------------------
+    def __contains__(self, cik) -> bool:
+        return _cik10(cik) in self._read_manifest()
+
+    def ciks(self) -> list:
+        return sorted(self._read_manifest())
+
+    def load(self, cik) -> FactIndex:
+        """
+        FactIndex for ``cik`` (KeyError if the filer was never ingested)
+        """
+        try:
+            return self._load(cik)
+        except FileNotFoundError:
+            # A file was replaced after the manifest was read: use the current one
+            self._manifest = None
+            return self._load(cik)
+
+    def _load(self, cik) -> FactIndex:
+        entry = self._read_manifest().get(_cik10(cik))
+        if entry is None:
+            raise KeyError(f"CIK {_cik10(cik)} not in fact store {self.root}")
+
+        files = self._batch_files(entry["batch"])
+        table = ds.dataset(files, schema=SCHEMA, format="parquet", partitioning=_PARTITIONING).to_table(
+            filter=(pc.field("cik") == int(cik)) & (pc.field("batch") == entry["batch"])
+        )
+        table = table.sort_by("row")
+
+        df = table.drop_columns(["cik", "row", "batch"]).to_pandas(date_as_object=False)
+        return FactIndex.from_table(df, cik=int(cik), entity_name=entry.get("entity_name"))
+
+    def manifest(self) -> dict:
+        return dict(self._read_manifest())
+
+    def _read_manifest(self) -> dict:
+        """
+        Parsed manifest.json, re-read only when the file changes (another
+        process may ingest); treat as read-only
+        """
+        try:
+            st = self._manifest_path.stat()
+            signature = (st.st_mtime_ns, st.st_size, st.st_ino)
+        except FileNotFoundError:
+            signature = None
+
+        cached = self._manifest
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        try:
+            manifest = json.loads(self._manifest_path.read_text()) if signature else {}
+        except (FileNotFoundError, ValueError):
+            manifest = {}
+        self._manifest = (signature, manifest)
+        return manifest
+
+    # ---------------------------------------------
+    # READ: ACROSS FILERS
+    # ---------------------------------------------
+    def scan(
+        self,
+        tags,
+        fy=None,
+        form: str = "10-K",
+        unit: str = "USD",
+        ciks=None,
+        taxonomy: str = "us-gaap",
+    ) -> pd.DataFrame:
+        """
+        Every fact for ``tags`` across filers, e.g.
+        scan(["OperatingIncomeLoss"], fy=2023)
+
+        ``fy`` and ``ciks`` may be a single value or a list; None means all.
+        Only partitions for the requested years are opened.
+        """
+        try:
+            return self._scan(tags, fy, form, unit, ciks, taxonomy)
+        except FileNotFoundError:
+            self._manifest = None
+            return self._scan(tags, fy, form, unit, ciks, taxonomy)
+
+    def _scan(self, tags, fy, form, unit, ciks, taxonomy) -> pd.DataFrame:
+        expr = pc.field("tag").isin(list(tags)) & (pc.field("taxonomy") == taxonomy)
+        if fy is not None:
+            expr &= pc.field("fy").isin(_as_list(fy))
+        if form is not None:
+            expr &= pc.field("form") == form
+        if unit is not None:
+            expr &= pc.field("unit") == unit
+        if ciks is not None:
+            expr &= pc.field("cik").isin([int(c) for c in _as_list(ciks)])
+
+        table = self.dataset().to_table(
+            columns=["cik", "tag", "fy", "fp", "form", "end", "filed", "accn", "val", "row", "batch"],
+            filter=expr,
+        )
+        df = table.to_pandas(date_as_object=False)
+
+        # Keep only rows from the batch that currently owns each filer
+        owners = {int(k): v["batch"] for k, v in self._read_manifest().items()}
+        owner = df["cik"].map(owners)
+        return df[df["batch"] == owner].drop(columns="batch").reset_index(drop=True)
+
+    def scan_annual(self, tags, col_name: str = "val", fy=None, ciks=None, form: str = "10-K") -> pd.DataFrame:
+        """
+        One value per (CIK, fiscal year), latest year first, with
+        extract_series tie-breaking: earlier tags win, then earlier facts
+        """
+        tags = list(tags)
+        df = self.scan(tags, fy=fy, form=form, ciks=ciks)
+        df = df[df["fy"].notna()]
+
+        priority = pd.Categorical(df["tag"].astype(object), categories=tags).codes
+        df = (
+            df.assign(_priority=priority)
+            .sort_values(["cik", "fy", "_priority", "row"], ascending=[True, False, True, True], kind="stable")
+            .drop_duplicates(["cik", "fy"])
+        )
+
+        return pd.DataFrame({
+            "cik": df["cik"].map(_cik10).to_numpy(),
+            "Year": df["fy"].astype(np.int64).to_numpy(),
+            col_name: df["val"].to_numpy(),
+        })
+
+    def dataset(self) -> ds.Dataset:
+        return ds.dataset(
+            self.root,
+            schema=SCHEMA,
+            format="parquet",
+            partitioning=_PARTITIONING,
+            ignore_prefixes=[".", "_", "manifest"],
+        )
+
+    # ---------------------------------------------
+    # WRITE
+    # ---------------------------------------------
+    def write(self, cik, index: FactIndex, source: str = None) -> dict:
+        """
+        Persist ``index`` for ``cik``; returns its manifest entry
+        """
+        return self.write_batch({cik: index}, source=source)[_cik10(cik)]
+
+    def write_batch(self, indexes: dict, source: str = None) -> dict:
+        """
+        Persist {cik: FactIndex} as one new batch; returns {cik: entry}
+
+        Safe to call from several processes at once: each batch writes its
+        own files. The rows become visible once update_manifest records
+        the batch as owner.
+        """
+        batch = secrets.randbits(62)
+        tables = [_to_arrow(int(cik), index, batch) for cik, index in indexes.items()]
+        if not tables:
+            return {}
+
+        self._write_table(pa.concat_tables(tables), batch)
+
+        now = time.time()
+        return {
+            _cik10(cik): {
+                "entity_name": index.entity_name,
+                "n_facts": len(index),
+                "batch": batch,
+                "source": source,
+                "ingested_at": now,
+            }
+            for cik, index in indexes.items()
+        }
+
+    def update_manifest(self, entries: dict) -> None:
+        """
+        Merge {cik: entry} into manifest.json and drop the rows those
+        filers had in older batches (single writer: the caller)
+        """
+        with self._lock:
+            manifest = dict(self._read_manifest())
+            superseded = {}
+            for k, v in entries.items():
+                old = manifest.get(_cik10(k))
+                if old is not None and old["batch"] != v["batch"]:
+                    superseded.setdefault(old["batch"], set()).add(int(k))
+
+            manifest.update({_cik10(k): v for k, v in entries.items()})
+            self._save_manifest(manifest)
+
+            for batch, ciks in superseded.items():
+                self._drop_rows(batch, ciks)
+
+    def compact(self, min_batches: int = PARQUET_COMPACT_BATCHES) -> int:
+        """
+        Rewrite every filer's current rows as one new batch (one file per
+        fiscal-year partition) once more than ``min_batches`` batches have
+        accumulated (single writer: the caller)
+
+        Works one partition at a time, and the new batch only becomes
+        visible when the manifest switches to it, so readers never see a
+        half-compacted store. The files it supersedes are only deleted by
+        the next call, so readers still using the previous manifest can
+        finish; returns the number of files deleted.
+        """
+        with self._lock:
+            manifest = dict(self._read_manifest())
+            owned = {str(v["batch"]) for v in manifest.values()}
+            files, superseded = [], []
+            for path in sorted(self.root.glob("fy=*/batch-*.parquet")):
+                (files if path.name.split("-")[1] in owned else superseded).append(path)
+
+            for path in superseded:
+                os.remove(path)
+
+            batches = {p.name.split("-")[1] for p in files}
+            if not manifest or len(batches) <= min_batches:
+                return len(superseded)
+
+            batch = secrets.randbits(62)
+            owners = {int(k): v["batch"] for k, v in manifest.items()}
+            for partition in sorted({p.parent for p in files}):
+                table = ds.dataset(
+                    [str(p) for p in files if p.parent == partition],
+                    schema=SCHEMA, format="parquet", partitioning=_PARTITIONING,
+                ).to_table()
+                if table.num_rows == 0:
+                    continue
+
+                # Only rows still owned by their filer's current batch
+                ciks, inverse = np.unique(table["cik"].to_numpy(), return_inverse=True)
+                owner = np.array([owners.get(int(c), -1) for c in ciks], dtype=np.int64)[inverse]
+                table = table.filter(pa.array(table["batch"].to_numpy() == owner))
+                if table.num_rows:
+                    table = table.set_column(
+                        table.schema.get_field_index("batch"), "batch",
+                        pa.array(np.full(table.num_rows, batch, dtype=np.int64))
+                    )
+                    self._write_table(table, batch)
+
+            self._save_manifest({k: {**v, "batch": batch} for k, v in manifest.items()})
+            return len(superseded)
+
+    def _write_table(self, table: pa.Table, batch: int) -> None:
+        table = table.unify_dictionaries().combine_chunks()
+
+        # Arrow cannot sort dictionary columns; order by tag label, CIK, row
+        tag = table["tag"].chunk(0)
+        tag_rank = np.argsort(np.argsort(tag.dictionary.to_numpy(zero_copy_only=False)))
+        order = np.lexsort((
+            table["row"].to_numpy(),
+            table["cik"].to_numpy(),
+            tag_rank[tag.indices.to_numpy()],
+        ))
+
+        ds.write_dataset(
+            table.take(order),
+            self.root,
+            format="parquet",
+            partitioning=_PARTITIONING,
+            basename_template=f"batch-{batch}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+        )
+
+    def _save_manifest(self, manifest: dict) -> None:
+        tmp = self._manifest_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(manifest))
+        os.replace(tmp, self._manifest_path)
+        self._manifest = None
+
+    def _batch_files(self, batch) -> list:
+        return sorted(str(p) for p in self.root.glob(f"fy=*/batch-{batch}-*.parquet"))
+
+    def _drop_rows(self, batch, ciks: set) -> None:
+        """
+        Rewrite one batch's files without ``ciks`` (deleting emptied files)
+        """
+        for path in self._batch_files(batch):
+            table = pq.read_table(path, schema=SCHEMA.remove(SCHEMA.get_field_index("fy")))
+            keep = pc.invert(pc.is_in(table["cik"], value_set=pa.array(list(ciks), pa.int32())))
+            kept = table.filter(keep)
+
+            if kept.num_rows == table.num_rows:
+                continue
+            if kept.num_rows == 0:
+                os.remove(path)
+                continue
+            # Dot-prefixed, so scans never pick up a half-written file
+            tmp = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.{os.getpid()}.tmp")
+            pq.write_table(kept, tmp)
+            os.replace(tmp, path)
+
+
+def _to_arrow(cik: int, index: FactIndex, batch: int) -> pa.Table:
+    """
+    FactIndex arrays as an Arrow table in SCHEMA layout
+    """
+    n = len(index)
+    keys = list(index.ranges.items())
+
+    # One dictionary entry per distinct key, repeated over its row range
+    key_codes = {}
+    for part, name in enumerate(("taxonomy", "tag", "unit")):
+        labels = list(dict.fromkeys(k[part] for k, _ in keys))
+        lookup = {label: i for i, label in enumerate(labels)}
+        codes = np.empty(n, dtype=np.int32)
+        for k, (a, b) in keys:
+            codes[a:b] = lookup[k[part]]
+        key_codes[name] = pa.DictionaryArray.from_arrays(codes, pa.array(labels, pa.string()))
+
+    accn = pd.Categorical(index.accn)
+
+    fy = index.fy
+    return pa.table({
+        "cik": pa.array(np.full(n, cik, dtype=np.int32)),
+        "taxonomy": key_codes["taxonomy"],
+        "tag": key_codes["tag"],
+        "unit": key_codes["unit"],
+        "form": _dictionary(index.form, index.forms),
+        "fp": _dictionary(index.fp, index.fps),
+        "start": pa.array(index.start, pa.date32()),
+        "end": pa.array(index.end, pa.date32()),
+        "filed": pa.array(index.filed, pa.date32()),
+        "accn": _dictionary(accn.codes, accn.categories),
+        "val": pa.array(index.val, pa.float64()),
+        "row": pa.array(np.arange(n, dtype=np.int32)),
+        "batch": pa.array(np.full(n, batch, dtype=np.int64)),
+        "fy": pa.array(np.nan_to_num(fy, nan=0).astype(np.int16), mask=np.isnan(fy)),
+    }, schema=SCHEMA)
+
+
+def _dictionary(codes, labels) -> pa.DictionaryArray:
+    # Categorical codes use -1 for missing values
+    codes = np.asarray(codes, dtype=np.int32)
+    return pa.DictionaryArray.from_arrays(
+        pa.array(codes, mask=codes < 0),
+        pa.array([str(v) for v in labels], pa.string()),
+    )
+
+
+def _as_list(value) -> list:
+    if isinstance(value, (list, tuple, set, np.ndarray, pd.Index)):
+        return list(value)
+    return [value]
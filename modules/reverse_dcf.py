@@ -0,0 +1,278 @@
+"""
+Reverse DCF: what the market price implies.
+
+Solves, for many companies or scenarios at once, the revenue growth, WACC
+or terminal growth at which a valuation model's value per share equals
+the market price, holding every other assumption fixed.
+
+    implied_parameter("growth", price, inputs)             # FCFF / dcf_valuation
+    implied_parameter("wacc", price, inputs, model="multi")  # run_multi_valuation
+    implied_expectations(frame)                            # all three, one screen
+
+Roots are found by bisection over arrays: every company iterates in
+lockstep, so a universe costs a few dozen vectorized model evaluations
+rather than one scalar root-finder call per ticker.
+"""
+
+import numpy as np
+import pandas as pd
+
+from modules.dcf import dcf_valuation_batch
+from modules.fcff_projection import project_fcff_batch
+from modules.instrumentation import timed
+from modules.valuation_engine import _ev_grid, _stage1_fcff
+
+
+# -------------------------------------------------
+# GLOBAL SETTINGS
+# -------------------------------------------------
+SOLVE_FOR = ("growth", "wacc", "terminal_growth")
+
+# Per-company inputs of each model (broadcast to one value per company)
+MODEL_FIELDS = {
+    # project_fcff + dcf_valuation, in dollars
+    "fcff": [
+        "base_revenue", "operating_margin", "tax_rate", "sales_to_capital",
+        "growth", "wacc", "terminal_growth", "net_debt", "shares_outstanding",
+    ],
+    # run_multi_valuation, in $M and M shares
+    "multi": [
+        "revenue", "ebit", "tax_rate", "shares", "debt", "cash",
+        "growth", "wacc", "terminal_growth",
+    ],
+}
+
+# Default search intervals; WACC and terminal growth are kept apart
+GROWTH_BRACKET = (-0.50, 1.00)
+WACC_MAX = 1.00
+TERMINAL_GROWTH_MIN = -0.10
+_SPREAD = 1e-6
+
+# Grid points tried per interval before bisecting (values need not be monotone)
+SCAN_POINTS = 32
+
+
+# -------------------------------------------------
+# MODELS: implied value -> value per share
+# -------------------------------------------------
+def _fcff_pricer(p: dict, solve_for: str, n_years: int):
+    """
+    Value per share from project_fcff_batch + dcf_valuation_batch
+    """
+    def stage1(growth):
+        if growth.ndim == 1:
+            growth = np.broadcast_to(growth[:, None], growth.shape + (n_years,))
+        return project_fcff_batch(
+            p["base_revenue"],
+            p["operating_margin"][:, None],
+            p["tax_rate"][:, None],
+            growth,
+            sales_to_capital=p["sales_to_capital"][:, None]
+        )["FCFF"]
+
+    # Only the growth solve changes the projection
+    fixed = None if solve_for == "growth" else stage1(p["growth"])
+
+    def price(x):
+        q = {**p, solve_for: x}
+        return dcf_valuation_batch(
+            stage1(x) if fixed is None else fixed,
+            q["wacc"],
+            q["terminal_growth"],
+            net_debt=q["net_debt"],
+            shares_outstanding=q["shares_outstanding"]
+        )["FairValuePerShare"]
+
+    return price
+
+
+def _multi_pricer(p: dict, solve_for: str, n_years: int):
+    """
+    DCF price per share of run_multi_valuation (NaN where it returns 0)
+    """
+    revenue = p["revenue"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        margin = np.where(revenue > 0, p["ebit"] / revenue, 0.10)
+    valid = (revenue > 0) & (p["shares"] > 0)
+
+    def stage1(growth):
+        return _stage1_fcff(revenue, margin, p["tax_rate"][:, None], growth, n_years)
+
+    fixed = None if solve_for == "growth" else stage1(p["growth"])
+
+    def price(x):
+        q = {**p, solve_for: x}
+        ev = _ev_grid(stage1(x) if fixed is None else fixed, q["wacc"], q["terminal_growth"])
+        return np.where(valid, (ev - q["debt"] + q["cash"]) / q["shares"], np.nan)
+
+    return price
+
+
+_PRICERS = {"fcff": _fcff_pricer, "multi": _multi_pricer}
+
+
+def _default_bracket(solve_for: str, p: dict) -> tuple:
+    if solve_for == "growth":
+        return GROWTH_BRACKET
+    if solve_for == "wacc":
+        return p["terminal_growth"] + _SPREAD, WACC_MAX
+    return TERMINAL_GROWTH_MIN, p["wacc"] - _SPREAD
+
+
+# -------------------------------------------------
+# SOLVER
+# -------------------------------------------------
+def bisect(
+    f, target, lo, hi, guess=None, tol: float = 1e-8, max_iter: int = 100, scan: int = SCAN_POINTS
+) -> dict:
+    """
+    Vectorized bisection: roots of f(x) = target for every element at once
+
+    ``f`` maps an array of x to an array of values; ``lo`` / ``hi`` bound
+    each element's search. Values need not be monotone in x: each interval
+    is first scanned at ``scan`` + 1 evenly spaced points and the
+    sub-interval with a sign change nearest ``guess`` (the lowest one when
+    no guess is given) is bisected. Elements with no sign change (NaN
+    values never count as one) get NaN.
+    """
+    target = np.asarray(target, dtype=np.float64)
+    lo, hi = np.broadcast_arrays(
+        np.asarray(lo, dtype=np.float64), np.asarray(hi, dtype=np.float64), target
+    )[:2]
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        xs = lo + (hi - lo) * np.linspace(0.0, 1.0, scan + 1).reshape((-1,) + (1,) * lo.ndim)
+        fs = np.stack([f(x) - target for x in xs])
+
+        change = np.sign(fs[:-1]) * np.sign(fs[1:]) <= 0
+        bracketed = (lo < hi) & change.any(axis=0)
+        if guess is None:
+            first = change.argmax(axis=0)[None]
+        else:
+            centre = 0.5 * (xs[:-1] + xs[1:])
+            distance = np.where(change, np.abs(centre - guess), np.inf)
+            first = np.nan_to_num(distance, nan=np.inf).argmin(axis=0)[None]
+
+        lo = np.take_along_axis(xs, first, axis=0)[0]
+        hi = np.take_along_axis(xs, first + 1, axis=0)[0]
+        f_lo = np.take_along_axis(fs, first, axis=0)[0]
+
+        iterations = 0
+        while iterations < max_iter and np.any(bracketed & (hi - lo > tol)):
+            iterations += 1
+            mid = 0.5 * (lo + hi)
+            f_mid = f(mid) - target
+
+            # Keep the half whose ends still straddle the target
+            right = np.sign(f_mid) == np.sign(f_lo)
+            lo = np.where(right, mid, lo)
+            f_lo = np.where(right, f_mid, f_lo)
+            hi = np.where(right, hi, mid)
+
+    converged = bracketed & (hi - lo <= tol)
+    return {
+        "root": np.where(bracketed, 0.5 * (lo + hi), np.nan),
+        "bracketed": bracketed,
+        "converged": converged,
+        "iterations": iterations,
+    }
+
+
+@timed
+def implied_parameter(
+    solve_for: str,
+    price,
+    inputs,
+    model: str = "fcff",
+    bracket: tuple = None,
+    n_years: int = 5,
+    tol: float = 1e-8,
+    max_iter: int = 100,
+    scan: int = SCAN_POINTS,
+) -> dict:
+    """
+    Value of ``solve_for`` ("growth", "wacc" or "terminal_growth") at which
+    each company's value per share equals ``price``
+
+    Parameters
+    ----------
+    price : float or array (n,)
+    inputs : dict or DataFrame with the model's MODEL_FIELDS; scalars
+        apply to every company ("growth" may also be an (n, n_years) path
+        when it is not the unknown; a value for ``solve_for`` itself, if
+        present, is only used as the starting guess)
+    model : "fcff" (project_fcff + dcf_valuation) or "multi"
+        (run_multi_valuation's DCF price)
+    bracket : (lo, hi), scalars or arrays; defaults to GROWTH_BRACKET for
+        growth, (terminal growth, WACC_MAX] for WACC and
+        [TERMINAL_GROWTH_MIN, WACC) for terminal growth
+
+    Where several values reach the price (growth can destroy value when
+    reinvestment outruns NOPAT) the one nearest the guess is returned, or
+    the lowest without one. Returns {"implied",
+    "bracketed", "converged", "iterations"}; implied is NaN where the price
+    cannot be reached inside the bracket.
+    """
+    if solve_for not in SOLVE_FOR:
+        raise ValueError(f"solve_for must be one of {SOLVE_FOR}, got {solve_for!r}")
+    if model not in MODEL_FIELDS:
+        raise ValueError(f"Unknown model: {model!r}")
+
+    fields = [f for f in MODEL_FIELDS[model] if f != solve_for]
+    missing = [f for f in fields if f not in inputs]
+    if missing:
+        raise ValueError(f"Missing inputs for the {model} model: {', '.join(missing)}")
+
+    values = {f: np.asarray(inputs[f], dtype=np.float64) for f in fields}
+    price = np.asarray(price, dtype=np.float64)
+    (n,) = np.broadcast_shapes(
+        price.shape, *(v.shape[:1] if f == "growth" and v.ndim == 2 else v.shape for f, v in values.items())
+    ) or (1,)
+
+    p = {
+        f: v if f == "growth" and v.ndim == 2 else np.broadcast_to(v, (n,))
+        for f, v in values.items()
+    }
+    p[solve_for] = np.full(n, np.nan)
+
+    lo, hi = bracket if bracket is not None else _default_bracket(solve_for, p)
+    guess = None
+    if solve_for in inputs:
+        guess = np.asarray(inputs[solve_for], dtype=np.float64)
+        if guess.ndim == 2:
+            guess = guess.mean(axis=1)       # a growth path: its average rate
+        guess = np.broadcast_to(guess, (n,))
+    result = bisect(
+        _PRICERS[model](p, solve_for, n_years),
+        np.broadcast_to(price, (n,)),
+        np.broadcast_to(lo, (n,)),
+        np.broadcast_to(hi, (n,)),
+        guess=guess,
+        tol=tol,
+        max_iter=max_iter,
+        scan=scan
+    )
+
+    return {
+        "implied": result["root"],
+        "bracketed": result["bracketed"],
+        "converged": result["converged"],
+        "iterations": result["iterations"],
+    }
+
+
+def implied_expectations(frame: pd.DataFrame, price_col: str = "price", model: str = "fcff", **kwargs) -> pd.DataFrame:
+    """
+    Implied growth, WACC and terminal growth for every row of ``frame``
+    (one company per row, columns as in MODEL_FIELDS plus ``price_col``),
+    each solved with the other two held at their row values
+    """
+    return pd.DataFrame(
+        {
+            f"implied_{solve_for}": implied_parameter(
+                solve_for, frame[price_col].to_numpy(), frame, model=model, **kwargs
+            )["implied"]
+            for solve_for in SOLVE_FOR
+        },
+        index=frame.index
+    )
@@ -0,0 +1,446 @@
+import atexit
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:         # Windows: index merges are only serialized in-process
+    fcntl = None
+
+import requests
+
+from modules.edgar_client import SEC_HEADERS, get_edgar_client
+from modules.instrumentation import count
+
+
+# -------------------------------------------------
+# GLOBAL SETTINGS
+# -------------------------------------------------
+SEC_CACHE_DIR = Path(
+    os.environ.get(
+        "SEC_CACHE_DIR",
+        Path.home() / ".cache" / "mountain_path" / "sec"
+    )
+)
+SEC_CACHE_TTL = int(os.environ.get("SEC_CACHE_TTL", 24 * 3600))          # seconds
+SEC_CACHE_MAX_BYTES = int(os.environ.get("SEC_CACHE_MAX_BYTES", 2 * 1024 ** 3))
+SEC_CACHE_OFFLINE = os.environ.get("SEC_CACHE_OFFLINE", "0") == "1"
+# Index changes are written out at most this often (flush() forces a write)
+SEC_CACHE_SAVE_INTERVAL = float(os.environ.get("SEC_CACHE_SAVE_INTERVAL", 5))   # seconds
+
+# Re-writing the index on every hit is wasteful; access times are only
+# persisted when they move by more than this many seconds.
+_TOUCH_RESOLUTION = 60
+
+
+class CacheMiss(LookupError):
+    """Raised in offline mode when a URL has never been cached"""
+
+
+# -------------------------------------------------
+# CONTENT-ADDRESSED HTTP CACHE
+# -------------------------------------------------
+class SECCache:
+    """
+    On-disk cache for SEC documents.
+
+    Bodies are stored once under their SHA-256 digest (blobs/ab/abcd...),
+    and index.json maps each URL to its digest plus the validators needed
+    for conditional requests (ETag / Last-Modified).
+
+    - Fresh entries (younger than ``ttl``) are served without any request.
+    - Stale entries are revalidated; a 304 only refreshes the timestamp.
+    - If EDGAR is unreachable, a stale copy is served rather than failing.
+    - ``offline=True`` never touches the network.
+    - Total blob size is kept under ``max_bytes`` by evicting the least
+      recently used URLs.
+
+    Several processes may share one directory: index.json is re-read when
+    it changes on disk, and this process's changes are merged into the
+    latest copy under a file lock. Changes are written at most every
+    ``save_interval`` seconds; flush() writes them immediately.
+    """
+
+    def __init__(
+        self,
+        cache_dir=SEC_CACHE_DIR,
+        ttl: int = SEC_CACHE_TTL,
+        max_bytes: int = SEC_CACHE_MAX_BYTES,
+        offline: bool = SEC_CACHE_OFFLINE,
+        client=None,
+        save_interval: float = SEC_CACHE_SAVE_INTERVAL,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.client = client or get_edgar_client()
+        self.save_interval = save_interval
+
+        self._blob_dir = self.cache_dir / "blobs"
+        self._index_path = self.cache_dir / "index.json"
+        self._lock_path = self.cache_dir / "index.lock"
+        self._lock = threading.RLock()
+
+        self._blob_dir.mkdir(parents=True, exist_ok=True)
+        self._index = {}
+        self._refs = {}            # digest -> number of URLs pointing at it
+        self._bytes = 0            # total size of distinct blobs
+        self._signature = None     # stat of index.json when last read / written
+        self._dirty = {}           # url -> entry (None: dropped) not yet saved
+        self._saved_at = 0.0
+        self._refresh()
+
+    # ---------------------------------------------
+    # PUBLIC API
+    # ---------------------------------------------
+    def get(self, url: str, headers: dict = None, ttl: int = None, offline: bool = None) -> bytes:
+        """
+        Return the body for ``url``, from disk when possible
+        """
+        with self.open(url, headers=headers, ttl=ttl, offline=offline) as f:
+            return f.read()
+
+    def open(self, url: str, headers: dict = None, ttl: int = None, offline: bool = None):
+        """
+        Same freshness rules as get(), but return an open binary file so
+        large documents can be memory-mapped instead of read into memory
+
+        Cached blobs are opened under the cache lock, so a concurrent
+        eviction cannot remove them before the caller reads; bodies too
+        large to cache come back as an in-memory file.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        offline = self.offline if offline is None else offline
+
+        with self._lock:
+            self._refresh()
+            entry = self._index.get(url)
+            if entry is not None and (offline or time.time() - entry["fetched_at"] < ttl):
+                f = self._open_cached(url)
+                if f is not None:
+                    count("sec_cache.hits")
+                    return f
+            entry = self._index.get(url)
+            if entry is not None and not self._blob_path(entry["sha256"]).exists():
+                self._drop(url)
+                entry = None
+
+        if offline:
+            count("sec_cache.misses")
+            raise CacheMiss(f"Not cached (offline mode): {url}")
+
+        request_headers = dict(headers or {})
+        if entry is not None:
+            if entry.get("etag"):
+                request_headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                request_headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            r = self.client.get(url, headers=request_headers)
+        except requests.RequestException:
+            f = self._open_cached(url) if entry is not None else None
+            if f is None:
+                raise
+            count("sec_cache.stale_served")
+            return f
+
+        if r.status_code == 304 and entry is not None:
+            count("sec_cache.revalidated")
+            with self._lock:
+                self._refresh()
+                current = self._index.get(url)
+                if current is not None and current["sha256"] == entry["sha256"]:
+                    current["fetched_at"] = time.time()
+                    self._changed(url)
+                    self._save()
+                f = self._open_cached(url)
+            # Evicted while revalidating: fetch it again unconditionally
+            return f if f is not None else self.open(url, headers=headers, ttl=ttl, offline=offline)
+
+        if r.status_code >= 500 and entry is not None:
+            f = self._open_cached(url)
+            if f is not None:
+                count("sec_cache.stale_served")
+                return f
+
+        r.raise_for_status()
+        count("sec_cache.misses")
+        with self._lock:
+            self.put(url, r.content, etag=r.headers.get("ETag"), last_modified=r.headers.get("Last-Modified"))
+            f = self._open_cached(url)
+        return f if f is not None else io.BytesIO(r.content)
+
+    def get_path(self, url: str, headers: dict = None, ttl: int = None, offline: bool = None) -> Path:
+        """
+        Same freshness rules as get(), but return the blob's path
+
+        The path is only valid until the URL is evicted; prefer open() when
+        other threads or processes share the cache. Raises ValueError for a
+        body too large to cache.
+        """
+        with self._lock:
+            self.open(url, headers=headers, ttl=ttl, offline=offline).close()
+            path = self.path(url)
+        if path is None:
+            raise ValueError(f"Too large to cache ({self.max_bytes} bytes max): {url}")
+        return path
+
+    def put(self, url: str, body: bytes, etag: str = None, last_modified: str = None) -> bool:
+        """
+        Store ``body`` for ``url`` and enforce the size bound by evicting
+        other URLs; a body larger than the whole cache is not stored
+        (any older copy is dropped). Returns whether it was stored.
+        """
+        if len(body) > self.max_bytes:
+            count("sec_cache.oversize")
+            with self._lock:
+                self._refresh()
+                if url in self._index:
+                    self._drop(url)
+                    self._save()
+            return False
+
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._blob_path(digest)
+
+        with self._lock:
+            if not path.exists():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+                tmp.write_bytes(body)
+                os.replace(tmp, path)
+
+            self._refresh()
+            now = time.time()
+            old = self._index.get(url)
+            self._add(url, {
+                "sha256": digest,
+                "size": len(body),
+                "etag": etag,
+                "last_modified": last_modified,
+                "fetched_at": now,
+                "last_access": now,
+            })
+            self._changed(url)
+            if old is not None:
+                # After _add, so a re-stored identical body keeps its blob
+                self._release(old)
+            self._evict(keep=url)
+            self._save()
+        return True
+
+    def path(self, url: str):
+        """
+        Path of the cached blob for ``url`` (None if not cached)
+        """
+        with self._lock:
+            self._refresh()
+            entry = self._index.get(url)
+        if entry is None:
+            return None
+        path = self._blob_path(entry["sha256"])
+        return path if path.exists() else None
+
+    def invalidate(self, url: str) -> None:
+        """
+        Forget ``url`` so the next get() re-downloads it
+        """
+        with self._lock:
+            self._refresh()
+            if url in self._index:
+                self._drop(url)
+                self.flush()
+
+    def mark_fresh(self, urls: list) -> int:
+        """
+        Restart the TTL of cached ``urls`` known to be current by other
+        means (e.g. no new filing since they were fetched); returns how
+        many were cached
+        """
+        now = time.time()
+        with self._lock:
+            self._refresh()
+            cached = [url for url in urls if url in self._index]
+            for url in cached:
+                self._index[url]["fetched_at"] = now
+                self._changed(url)
+            self.flush()
+        return len(cached)
+
+    def flush(self) -> None:
+        """
+        Write unsaved index changes now
+        """
+        self._save(force=True)
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            self._refresh()
+            return self._bytes
+
+    # ---------------------------------------------
+    # INTERNALS
+    # ---------------------------------------------
+    def _blob_path(self, digest: str) -> Path:
+        return self._blob_dir / digest[:2] / f"{digest}.json"
+
+    def _open_cached(self, url: str):
+        """
+        Open the blob cached for ``url`` (None if absent or gone from disk)
+        """
+        with self._lock:
+            entry = self._index.get(url)
+            if entry is None:
+                return None
+            try:
+                f = open(self._blob_path(entry["sha256"]), "rb")
+            except FileNotFoundError:
+                self._drop(url)
+                self._save()
+                return None
+            self._touch(url, entry)
+            return f
+
+    def _touch(self, url: str, entry: dict) -> None:
+        now = time.time()
+        if now - entry.get("last_access", 0) > _TOUCH_RESOLUTION:
+            with self._lock:
+                entry["last_access"] = now
+                self._changed(url)
+                self._save()
+
+    def _changed(self, url: str) -> None:
+        self._dirty[url] = self._index.get(url)
+
+    def _add(self, url: str, entry: dict) -> None:
+        # Several URLs may share one blob; count each blob once
+        digest = entry["sha256"]
+        if self._refs.get(digest, 0) == 0:
+            self._bytes += entry["size"]
+        self._refs[digest] = self._refs.get(digest, 0) + 1
+        self._index[url] = entry
+
+    def _evict(self, keep: str = None) -> None:
+        if self._bytes <= self.max_bytes:
+            return
+
+        for url, _ in sorted(self._index.items(), key=lambda kv: kv[1]["last_access"]):
+            if self._bytes <= self.max_bytes:
+                break
+            if url != keep:
+                self._drop(url)
+
+    def _drop(self, url: str) -> None:
+        self._release(self._index.pop(url))
+        self._dirty[url] = None
+
+    def _release(self, entry: dict) -> None:
+        digest = entry["sha256"]
+        self._refs[digest] -= 1
+        if self._refs[digest] > 0:
+            return
+
+        del self._refs[digest]
+        self._bytes -= entry["size"]
+        try:
+            self._blob_path(digest).unlink()
+        except FileNotFoundError:
+            pass
+
+    def _refresh(self) -> None:
+        """
+        Pick up index.json if another process (or instance) rewrote it
+        """
+        with self._lock:
+            signature = self._index_signature()
+            if signature != self._signature:
+                self._merge(self._load_index())
+                self._signature = signature
+
+    def _save(self, force: bool = False) -> None:
+        """
+        Merge unsaved changes into the latest index.json and write it, at
+        most every ``save_interval`` seconds unless forced
+        """
+        with self._lock:
+            if not self._dirty or (not force and time.time() - self._saved_at < self.save_interval):
+                return
+            with _file_lock(self._lock_path):
+                self._merge(self._load_index())
+                tmp = self._index_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+                tmp.write_text(json.dumps(self._index))
+                os.replace(tmp, self._index_path)
+                self._signature = self._index_signature()
+            self._dirty = {}
+            self._saved_at = time.time()
+
+    def _merge(self, index: dict) -> None:
+        """
+        Rebuild from ``index`` (as read from disk) with this process's
+        unsaved changes on top
+        """
+        for url, entry in self._dirty.items():
+            if entry is None:
+                index.pop(url, None)
+                continue
+            other = index.get(url)
+            if other is not None and other["sha256"] == entry["sha256"]:
+                # Same body: keep the later validation / access of either writer
+                entry["fetched_at"] = max(entry["fetched_at"], other["fetched_at"])
+                entry["last_access"] = max(entry["last_access"], other.get("last_access", 0))
+            index[url] = entry
+
+        self._index, self._refs, self._bytes = {}, {}, 0
+        for url, entry in index.items():
+            self._add(url, entry)
+
+    def _index_signature(self):
+        try:
+            st = self._index_path.stat()
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size, st.st_ino
+
+    def _load_index(self) -> dict:
+        try:
+            return json.loads(self._index_path.read_text())
+        except (FileNotFoundError, ValueError):
+            return {}
+
+
+@contextmanager
+def _file_lock(path: Path):
+    """
+    Exclusive lock shared with other processes using the same cache
+    """
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        yield
+
+
+# -------------------------------------------------
+# SHARED INSTANCE
+# -------------------------------------------------
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_sec_cache() -> SECCache:
+    """
+    Process-wide cache configured from the SEC_CACHE_* environment variables
+    """
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = SECCache()
+            atexit.register(_default_cache.flush)
+        return _default_cache
@@ -0,0 +1,201 @@
+import bisect
+import hashlib
+import json
+import threading
+import time
+
+from modules.edgar_client import SEC_WWW_URL
+from modules.sec_cache import SEC_HEADERS, CacheMiss, get_sec_cache
+
+
+# -------------------------------------------------
+# GLOBAL SETTINGS
+# -------------------------------------------------
+SEC_TICKER_URL = SEC_WWW_URL + "/files/company_tickers.json"
+
+TICKER_REFRESH_SECONDS = 24 * 3600
+
+
+def _normalise_ticker(ticker: str) -> str:
+    # SEC lists share classes with a dash (BRK-B); users often type BRK.B
+    return ticker.strip().upper().replace(".", "-")
+
+
+def _normalise_name(name: str) -> str:
+    return " ".join(name.upper().replace(",", " ").replace(".", " ").split())
+
+
+# -------------------------------------------------
+# IMMUTABLE SNAPSHOT OF company_tickers.json
+# -------------------------------------------------
+class _Snapshot:
+    """
+    Dict indexes over one version of company_tickers.json
+    """
+
+    def __init__(self, raw: dict):
+        self.by_ticker = {}     # ticker -> (cik, title)
+        self.by_cik = {}        # cik -> [tickers]
+        self.by_name = {}       # normalised title -> cik
+
+        for item in raw.values():
+            ticker = _normalise_ticker(item["ticker"])
+            cik = str(item["cik_str"]).zfill(10)
+            title = item.get("title", "")
+
+            # First listing wins, matching the old linear scan
+            self.by_ticker.setdefault(ticker, (cik, title))
+            self.by_cik.setdefault(cik, []).append(ticker)
+            self.by_name.setdefault(_normalise_name(title), cik)
+
+        # Sorted keys double as prefix indexes for autocomplete
+        self.tickers = sorted(self.by_ticker)
+        self.names = sorted(self.by_name)
+
+
+# -------------------------------------------------
+# RESOLVER
+# -------------------------------------------------
+class TickerIndex:
+    """
+    Loaded-once ticker / CIK / company-name resolver.
+
+    The mapping is read from the on-disk SEC cache (stale copies are fine
+    for the hot path) and refreshed by a daemon thread every
+    ``refresh_seconds``. Lookups are plain dict reads against an immutable
+    snapshot, so they never block on the network or on a refresh.
+    """
+
+    def __init__(self, cache=None, refresh_seconds: int = TICKER_REFRESH_SECONDS):
+        self._cache = cache or get_sec_cache()
+        self.refresh_seconds = refresh_seconds
+        self.loaded_at = None
+
+        self._snapshot = None
+        self._digest = None
+        self._lock = threading.Lock()
+        self._refresher = None
+
+    # ---------------------------------------------
+    # LOOKUPS
+    # ---------------------------------------------
+    def cik(self, ticker: str):
+        """
+        Zero-padded CIK for ``ticker`` (None if unknown)
+        """
+        hit = self._data().by_ticker.get(_normalise_ticker(ticker))
+        return hit[0] if hit else None
+
+    def name(self, ticker: str):
+        hit = self._data().by_ticker.get(_normalise_ticker(ticker))
+        return hit[1] if hit else None
+
+    def tickers_for_cik(self, cik) -> list:
+        return list(self._data().by_cik.get(str(cik).zfill(10), []))
+
+    def cik_for_name(self, name: str):
+        return self._data().by_name.get(_normalise_name(name))
+
+    def suggest(self, prefix: str, limit: int = 10) -> list:
+        """
+        Autocomplete: tickers starting with ``prefix``, then company names
+        """
+        data = self._data()
+        results = []
+
+        key = _normalise_ticker(prefix)
+        if key:
+            i = bisect.bisect_left(data.tickers, key)
+            while i < len(data.tickers) and data.tickers[i].startswith(key) and len(results) < limit:
+                ticker = data.tickers[i]
+                results.append((ticker, data.by_ticker[ticker][1]))
+                i += 1
+
+        key = _normalise_name(prefix)
+        seen = {ticker for ticker, _ in results}
+        if key:
+            i = bisect.bisect_left(data.names, key)
+            while i < len(data.names) and data.names[i].startswith(key) and len(results) < limit:
+                for ticker in data.by_cik.get(data.by_name[data.names[i]], [])[:1]:
+                    if ticker not in seen:
+                        results.append((ticker, data.by_ticker[ticker][1]))
+                        seen.add(ticker)
+                i += 1
+
+        return results
+
+    def __len__(self) -> int:
+        return len(self._data().by_ticker)
+
+    # ---------------------------------------------
+    # LOADING & REFRESH
+    # ---------------------------------------------
+    def refresh(self) -> None:
+        """
+        Revalidate company_tickers.json against SEC and swap in the result
+        """
+        body = self._cache.get(SEC_TICKER_URL, headers=SEC_HEADERS, ttl=0)
+        self._install(body)
+
+    def start_background_refresh(self) -> None:
+        with self._lock:
+            if self._refresher is not None:
+                return
+            self._refresher = threading.Thread(
+                target=self._refresh_loop,
+                name="ticker-index-refresh",
+                daemon=True
+            )
+            self._refresher.start()
+
+    def _data(self) -> _Snapshot:
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+
+        with self._lock:
+            if self._snapshot is None:
+                try:
+                    # Any cached copy, however old, beats a blocking download
+                    body = self._cache.get(SEC_TICKER_URL, headers=SEC_HEADERS, offline=True)
+                except CacheMiss:
+                    body = self._cache.get(SEC_TICKER_URL, headers=SEC_HEADERS)
+                self._install(body)
+        self.start_background_refresh()
+        return self._snapshot
+
+    def _install(self, body: bytes) -> None:
+        digest = hashlib.sha256(body).hexdigest()
+        if digest != self._digest:
+            self._snapshot = _Snapshot(json.loads(body))
+            self._digest = digest
+        self.loaded_at = time.time()
+
+    def _refresh_loop(self) -> None:
+        while True:
+            try:
+                # Revalidates only once the cached copy is older than the schedule
+                body = self._cache.get(SEC_TICKER_URL, headers=SEC_HEADERS, ttl=self.refresh_seconds)
+                self._install(body)
+            except Exception:
+                # Keep serving the current snapshot; retry on the next cycle
+                pass
+            time.sleep(self.refresh_seconds)
+
+
+# -------------------------------------------------
+# SHARED INSTANCE
+# -------------------------------------------------
+_default_index = None
+_default_lock = threading.Lock()
+
+
+def get_ticker_index() -> TickerIndex:
+    """
+    Process-wide resolver shared by every caller (and Streamlit session)
+    """
+    global _default_index
+    with _default_lock:
+        if _default_index is None:
+            _default_index = TickerIndex()
+        return _default_index
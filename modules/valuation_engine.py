@@ -2,6 +2,8 @@
 import pandas as pd
 import numpy as np
 
+from modules.fcff_projection import project_fcff_batch
+
 
 def run_multi_valuation(inputs, growth_rate, wacc, t_growth, market_data):
     """
@@ -47,35 +49,27 @@ def run_multi_valuation(inputs, growth_rate, wacc, t_growth, market_data):
     reinvestment_rate = min(max(growth_rate / assumed_roc, 0), 0.80) if assumed_roc > 0 else 0
 
     # --- 1. 5-YEAR PROJECTION (STAGE 1) ---
-    projections = []
-    current_rev = rev
-    
-    for i in range(5):
-        current_rev *= (1 + growth_rate)
-        
-        # Use EBIT margin from base year
-        ebit_margin = (ebit / rev) if rev > 0 else 0.10
-        year_ebit = current_rev * ebit_margin
-        year_nopat = year_ebit * (1 - tax_rate)
-        
-        # FCFF = NOPAT * (1 - Reinvestment Rate)
-        fcff = year_nopat * (1 - reinvestment_rate)
-        
-        pv_factor = 1 / (1 + wacc)**(i + 1)
-        pv_fcff = fcff * pv_factor
-        
-        projections.append({
-            'Year': 2026 + i,
-            'Revenue': current_rev,
-            'FCFF': fcff,
-            'PV_FCFF': pv_fcff
-        })
-    
-    df = pd.DataFrame(projections)
+    # Use EBIT margin from base year; FCFF = NOPAT * (1 - Reinvestment Rate)
+    ebit_margin = (ebit / rev) if rev > 0 else 0.10
+    projection = project_fcff_batch(
+        rev,
+        ebit_margin,
+        tax_rate,
+        np.full(5, growth_rate),
+        reinvestment_rate=reinvestment_rate
+    )
+
+    pv_factor = 1 / (1 + wacc) ** np.arange(1, 6)
+    df = pd.DataFrame({
+        'Year': 2025 + projection['Year'],
+        'Revenue': projection['Revenue'],
+        'FCFF': projection['FCFF'],
+        'PV_FCFF': projection['FCFF'] * pv_factor
+    })
 
     # --- 2. TERMINAL VALUE (STAGE 2) ---
     stable_wacc = max(wacc, t_growth + 0.01)
-    last_fcff = projections[-1]['FCFF']
+    last_fcff = projection['FCFF'][-1]
     
     if stable_wacc > t_growth:
         terminal_value = (last_fcff * (1 + t_growth)) / (stable_wacc - t_growth)
@@ -108,17 +102,171 @@ def run_multi_valuation(inputs, growth_rate, wacc, t_growth, market_data):
     }
 
 
+def _stage1_fcff(rev, ebit_margin, tax_rate, growth_rate, n_years=5):
+    """
+    Stage-1 FCFF path of run_multi_valuation, broadcast over any array
+    shapes of growth_rate / ebit_margin. Returns shape (..., n_years).
+    """
+    growth_rate = np.asarray(growth_rate, dtype=np.float64)[..., None]
+    ebit_margin = np.asarray(ebit_margin, dtype=np.float64)[..., None]
+
+    assumed_roc = 0.15
+    reinvestment_rate = np.clip(growth_rate / assumed_roc, 0, 0.80)
+
+    return project_fcff_batch(
+        rev,
+        ebit_margin,
+        tax_rate,
+        np.broadcast_to(growth_rate, growth_rate.shape[:-1] + (n_years,)),
+        reinvestment_rate=reinvestment_rate
+    )["FCFF"]
+
+
+def _ev_grid(fcff, wacc, t_growth):
+    """
+    Enterprise value ($M) for FCFF paths (..., n_years) against broadcastable
+    WACC / terminal-growth arrays, mirroring run_multi_valuation's stage 2
+    """
+    n_years = fcff.shape[-1]
+    years = np.arange(1, n_years + 1)
+
+    discount = (1 + wacc[..., None]) ** years
+    pv_fcff = (fcff / discount).sum(axis=-1)
+
+    stable_wacc = np.maximum(wacc, t_growth + 0.01)
+    terminal_value = fcff[..., -1] * (1 + t_growth) / (stable_wacc - t_growth)
+    pv_terminal = terminal_value / discount[..., -1]
+
+    return pv_fcff + pv_terminal
+
+
+def valuation_sensitivities(inputs, growth_rate, wacc, t_growth, n_years=5):
+    """
+    run_multi_valuation's DCF with closed-form sensitivities, batched
+
+    growth_rate, wacc and t_growth broadcast against each other (e.g. one
+    value per scenario). Returns "ev" ($M) and "dcf_price" ($) arrays plus
+    "dEV" and "dPrice": dicts of their partial derivatives with respect to
+    growth_rate, ebit_margin, tax_rate, wacc and t_growth. Derivatives are
+    one-sided at the kinks of the model (reinvestment clipped to 0-80%,
+    WACC floored at terminal growth + 1%).
+    """
+    rev = inputs.get('revenue', 0)
+    ebit = inputs.get('ebit', 0)
+    shares_m = inputs.get('shares', 1)
+    tax_rate = inputs.get('tax_rate', 0.21)
+    net_debt = inputs.get('debt', 0) - inputs.get('cash', 0)
+
+    growth, wacc, t_growth = np.broadcast_arrays(
+        *(np.asarray(x, dtype=np.float64) for x in (growth_rate, wacc, t_growth))
+    )
+    names = ("growth_rate", "ebit_margin", "tax_rate", "wacc", "t_growth")
+
+    if rev <= 0 or shares_m <= 0:
+        nan = np.full(growth.shape, np.nan)
+        return {
+            "ev": nan, "dcf_price": nan,
+            "dEV": dict.fromkeys(names, nan), "dPrice": dict.fromkeys(names, nan),
+        }
+
+    ebit_margin = ebit / rev
+    fcff = _stage1_fcff(rev, ebit_margin, tax_rate, growth, n_years)
+    ev = _ev_grid(fcff, wacc, t_growth)
+
+    # -------------------------------
+    # dEV / dFCFF, WACC AND g
+    # -------------------------------
+    years = np.arange(1, n_years + 1)
+    discount = (1 + wacc[..., None]) ** years
+    floored = wacc < t_growth + 0.01
+    spread = np.maximum(wacc, t_growth + 0.01) - t_growth
+    pv_terminal = fcff[..., -1] * (1 + t_growth) / spread / discount[..., -1]
+
+    d_fcff = 1 / discount
+    d_fcff[..., -1] *= 1 + (1 + t_growth) / spread
+
+    d_wacc = (
+        -(years * fcff / discount).sum(axis=-1) / (1 + wacc)
+        - pv_terminal * (n_years / (1 + wacc) + np.where(floored, 0.0, 1 / spread))
+    )
+    d_t_growth = (
+        fcff[..., -1] / discount[..., -1]
+        * (1 / spread + np.where(floored, 0.0, (1 + t_growth) / spread ** 2))
+    )
+
+    # -------------------------------
+    # dFCFF / d(OPERATING INPUTS)
+    # -------------------------------
+    # FCFF_t = rev (1 + g)^t * margin * (1 - tax) * (1 - reinvestment(g))
+    g = growth[..., None]
+    assumed_roc = 0.15
+    retained = 1 - np.clip(g / assumed_roc, 0, 0.80)
+    d_reinvestment = np.where((g > 0) & (g < 0.80 * assumed_roc), 1 / assumed_roc, 0.0)
+    revenue = rev * (1 + g) ** years
+    nopat = revenue * ebit_margin * (1 - tax_rate)
+
+    d_ev = {
+        "growth_rate": (d_fcff * (years * fcff / (1 + g) - nopat * d_reinvestment)).sum(axis=-1),
+        "ebit_margin": (d_fcff * revenue * (1 - tax_rate) * retained).sum(axis=-1),
+        "tax_rate": -(d_fcff * revenue * ebit_margin * retained).sum(axis=-1),
+        "wacc": d_wacc,
+        "t_growth": d_t_growth,
+    }
+
+    return {
+        "ev": ev,
+        "dcf_price": (ev - net_debt) / shares_m,
+        "dEV": d_ev,
+        "dPrice": {name: grad / shares_m for name, grad in d_ev.items()},
+    }
+
+
 def calculate_sensitivity(inputs, growth_rate, wacc_range, g_range):
     """Generates Enterprise Value sensitivity matrix in Billions"""
-    matrix = np.zeros((len(wacc_range), len(g_range)))
-    market_data = {'rf': 0.045, 'erp': 0.055}
-    
-    for i, w in enumerate(wacc_range):
-        for j, g in enumerate(g_range):
-            if w <= g:
-                matrix[i, j] = np.nan
-            else:
-                res = run_multi_valuation(inputs, growth_rate, w, g, market_data)
-                matrix[i, j] = res['ev'] / 1000 if res['ev'] > 0 else np.nan
-                
-    return matrix
+    grid = calculate_sensitivity_grid(
+        inputs,
+        wacc_range=wacc_range,
+        g_range=g_range,
+        growth_range=[growth_rate]
+    )
+    return grid[0, 0]
+
+
+def calculate_sensitivity_grid(inputs, wacc_range, g_range, growth_range=None, margin_range=None):
+    """
+    Enterprise Value sensitivity (in Billions) over growth x margin x WACC x g
+
+    The stage-1 projection is computed once per (growth, margin) pair and
+    every WACC / terminal-growth cell is filled by broadcasting. Omitted
+    growth / margin ranges default to the base-year values, leaving a
+    singleton axis. Returns shape (n_growth, n_margin, n_wacc, n_g);
+    cells with WACC <= g or non-positive EV are NaN.
+    """
+    rev = inputs.get('revenue', 0)
+    ebit = inputs.get('ebit', 0)
+    shares_m = inputs.get('shares', 1)
+    tax_rate = inputs.get('tax_rate', 0.21)
+
+    growth = np.asarray(growth_range if growth_range is not None else [0.0], dtype=np.float64)
+    margin = np.asarray(
+        margin_range if margin_range is not None else [(ebit / rev) if rev > 0 else 0.10],
+        dtype=np.float64
+    )
+    wacc = np.asarray(wacc_range, dtype=np.float64)
+    t_growth = np.asarray(g_range, dtype=np.float64)
+
+    shape = (len(growth), len(margin), len(wacc), len(t_growth))
+    if rev <= 0 or shares_m <= 0:
+        return np.full(shape, np.nan)
+
+    # (n_growth, n_margin, 1, 1, n_years): independent of WACC and g
+    fcff = _stage1_fcff(rev, margin[None, :], tax_rate, growth[:, None])[:, :, None, None, :]
+
+    w = wacc[:, None]
+    g = t_growth[None, :]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ev = _ev_grid(fcff, w, g)
+
+    ev = np.where((w > g) & (ev > 0), ev / 1000, np.nan)
+    return np.broadcast_to(ev, shape).copy()
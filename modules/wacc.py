@@ -1,12 +1,16 @@
-import yfinance as yf
+from modules.instrumentation import timed
+from modules.market_data import get_market_data
 
 
+@timed
 def calculate_wacc(
     ticker: str,
     risk_free_rate: float = 0.045,
     equity_risk_premium: float = 0.055,
     cost_of_debt: float = 0.04,
     tax_rate: float = 0.21,
+    provider=None,
+    shares_outstanding: float = None,
 ):
     """
     Calculate WACC using CAPM for cost of equity.
@@ -23,17 +27,22 @@ def calculate_wacc(
         Pre-tax cost of debt
     tax_rate : float
         Corporate tax rate
+    provider : MarketDataProvider, optional
+        Quote source (default: shared cached provider, see modules.market_data)
+    shares_outstanding : float, optional
+        Used for market cap (price x shares) when the provider has none
     """
 
-    stock = yf.Ticker(ticker)
+    quote = (provider or get_market_data()).get_quote(ticker)
 
-    info = stock.info or {}
+    beta = quote["beta"] if quote["beta"] is not None else 1.0
+    market_cap = quote["market_cap"]
 
-    beta = info.get("beta", 1.0)
-    market_cap = info.get("marketCap", None)
+    if market_cap is None and shares_outstanding and quote["price"]:
+        market_cap = quote["price"] * shares_outstanding
 
     if market_cap is None:
-        raise ValueError("Market cap not available from Yahoo Finance")
+        raise ValueError("Market cap not available from market data provider")
 
     # Capital structure weights
     equity_value = market_cap
@@ -0,0 +1,195 @@
+import io
+import json
+import mmap
+from pathlib import Path
+
+import numpy as np
+
+
+# Bytes scanned per numpy pass when matching a taxonomy's braces
+_SCAN_CHUNK = 8 * 1024 * 1024
+
+_QUOTE, _BACKSLASH, _OPEN, _CLOSE = (ord(c) for c in '"\\{}')
+
+# First guess for how much of a tag's JSON to decode at once
+_WINDOW = 256 * 1024
+
+_decoder = json.JSONDecoder()
+
+
+def load_selected_facts(source, tags) -> dict:
+    """
+    Parse only ``tags`` out of a companyfacts document
+
+    ``source`` is a file path or an open binary file (memory-mapped, so the
+    document itself is never loaded into Python memory) or a bytes-like
+    object. ``tags`` is a
+    list of us-gaap tag names or a {taxonomy: [tags]} mapping.
+
+    Returns a companyfacts-shaped dict containing only those tags, which
+    extract_series and every module downstream accept unchanged.
+
+    Each tag is located with a C-level byte search for its key and only
+    that value is decoded; everything else stays as raw bytes. This relies
+    on JSON escaping: a quote inside a string is always written \\", so
+    a '"Tag": {' key cannot occur inside a label or description.
+    """
+    if isinstance(source, (str, Path)):
+        with open(source, "rb") as f:
+            return load_selected_facts(f, tags)
+    if hasattr(source, "read"):
+        try:
+            fileno = source.fileno()
+        except (OSError, io.UnsupportedOperation):
+            return _select(source.read(), tags)
+        with mmap.mmap(fileno, 0, access=mmap.ACCESS_READ) as buf:
+            return _select(buf, tags)
+    return _select(source, tags)
+
+
+def _select(buf, tags) -> dict:
+    if not isinstance(tags, dict):
+        tags = {"us-gaap": list(tags)}
+
+    result = {
+        "cik": _scalar(buf, "cik"),
+        "entityName": _scalar(buf, "entityName"),
+        "facts": {},
+    }
+
+    for taxonomy, names in tags.items():
+        lo, hi = _taxonomy_span(buf, taxonomy)
+        if lo < 0:
+            continue
+
+        found = {}
+        for name in names:
+            pos = _find_key(buf, name, b"{", lo, hi)
+            if pos >= 0:
+                found[name] = _decode_at(buf, pos, hi)
+
+        result["facts"][taxonomy] = found
+
+    return result
+
+
+def _taxonomy_span(buf, taxonomy: str) -> tuple:
+    """
+    Byte range of one taxonomy's object inside "facts", ending at its
+    matching close brace
+    """
+    facts = _find_key(buf, "facts", b"{", 0, len(buf))
+    if facts < 0:
+        return -1, -1
+
+    lo = _find_key(buf, taxonomy, b"{", facts, len(buf))
+    if lo < 0:
+        return -1, -1
+    return lo, _matching_brace(buf, lo) + 1
+
+
+def _matching_brace(buf, start: int) -> int:
+    """
+    Position of the '}' closing the object that opens at ``start``
+
+    Scans SCAN_CHUNK bytes at a time with numpy: unescaped quotes toggle
+    string state, and only braces outside strings change the depth.
+    """
+    depth = 0
+    in_string = False
+    backslashes = 0             # run of backslashes ending the previous chunk
+
+    for chunk_lo in range(start, len(buf), _SCAN_CHUNK):
+        a = np.frombuffer(buf, dtype=np.uint8, count=min(_SCAN_CHUNK, len(buf) - chunk_lo), offset=chunk_lo)
+
+        quotes = np.flatnonzero(a == _QUOTE)
+        # A quote is escaped by an odd run of backslashes before it (only
+        # possible inside strings, and rare)
+        escaped = np.zeros(len(quotes), dtype=bool)
+        for i in np.flatnonzero(a[np.maximum(quotes - 1, 0)] == _BACKSLASH) if len(quotes) else ():
+            j = quotes[i] - 1
+            run = 0
+            while j >= 0 and a[j] == _BACKSLASH:
+                run += 1
+                j -= 1
+            escaped[i] = (run + (backslashes if j < 0 else 0)) % 2 == 1
+        if len(quotes) and quotes[0] == 0 and backslashes % 2 == 1:
+            escaped[0] = True
+        quotes = quotes[~escaped]
+
+        braces = np.flatnonzero((a == _OPEN) | (a == _CLOSE))
+        outside = (np.searchsorted(quotes, braces) + in_string) % 2 == 0
+        braces = braces[outside]
+        levels = depth + np.cumsum(np.where(a[braces] == _OPEN, 1, -1))
+
+        closed = np.flatnonzero(levels == 0)
+        if len(closed):
+            return chunk_lo + int(braces[closed[0]])
+
+        if len(levels):
+            depth = int(levels[-1])
+        in_string ^= len(quotes) % 2 == 1
+        tail = 0
+        while tail < len(a) and a[-1 - tail] == _BACKSLASH:
+            tail += 1
+        backslashes = backslashes + tail if tail == len(a) else tail
+
+    raise json.JSONDecodeError("Unterminated object", "", start)
+
+
+def _find_key(buf, name: str, opener: bytes, lo: int, hi: int) -> int:
+    """
+    Position of the value (starting with ``opener``, or any value if None)
+    of the first '"name": <value>' between lo and hi; -1 if absent.
+    Tolerates whitespace around the colon.
+    """
+    key = b'"' + name.encode() + b'"'
+    pos = buf.find(key, lo, hi)
+    while pos >= 0:
+        i = pos + len(key)
+        while i < hi and buf[i:i + 1] in b" \t\r\n":
+            i += 1
+        if buf[i:i + 1] == b":":
+            i += 1
+            while i < hi and buf[i:i + 1] in b" \t\r\n":
+                i += 1
+            if opener is None or buf[i:i + 1] == opener:
+                return i
+        pos = buf.find(key, pos + 1, hi)
+    return -1
+
+
+def _decode_at(buf, start: int, limit: int):
+    """
+    Decode the JSON value starting at ``start``, widening the window until
+    the value is complete
+    """
+    window = _WINDOW
+    while True:
+        stop = min(start + window, limit)
+        raw = bytes(buf[start:stop])
+        try:
+            text = raw.decode("utf-8")
+        except UnicodeDecodeError as e:
+            # Only a character cut by the window edge is worth widening for
+            if stop >= limit or e.start < len(raw) - 3:
+                raise
+            window *= 4
+            continue
+        try:
+            value, _ = _decoder.raw_decode(text)
+            return value
+        except json.JSONDecodeError:
+            if stop >= limit:
+                raise
+            window *= 4
+
+
+def _scalar(buf, name: str):
+    pos = _find_key(buf, name, None, 0, len(buf))
+    if pos < 0:
+        return None
+    try:
+        return _decode_at(buf, pos, min(pos + 4096, len(buf)))
+    except json.JSONDecodeError:
+        return None
@@ -37,6 +37,27 @@ def print_step(num, text):
     """Print a step header"""
     print(f"\n{BOLD}[{num}]{RESET} {text}")
 
+def measure_import(module, cwd):
+    """Import ``module`` in a fresh interpreter; return (ms, top-level packages loaded, error)"""
+    import subprocess
+
+    code = f"import sys, {module}; print(' '.join(sorted({{m.split('.')[0] for m in sys.modules}})))"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=cwd, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        lines = result.stderr.strip().splitlines()
+        return None, set(), lines[-1] if lines else f"exit code {result.returncode}"
+
+    # importtime lines: "import time: self [us] | cumulative | name"
+    cumulative = 0
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            cumulative = int(parts[1])
+    return cumulative / 1000, set(result.stdout.split()), None
+
 def main():
     """Run all verification checks"""
     
@@ -200,7 +221,44 @@ def main():
         except ImportError:
             print_check(package, False, "NOT INSTALLED")
             all_passed = False
-    
+
+    # =========================================================================
+    # STEP 6: Import-Time Budget
+    # =========================================================================
+    print_step(6, "IMPORT-TIME BUDGET (fresh interpreter)")
+
+    # Optional/heavy packages that must only load when a feature uses them
+    lazy_packages = ['streamlit', 'scipy', 'yfinance', 'plotly', 'fpdf', 'pyinstrument']
+    budget_ms = float(os.environ.get("IMPORT_BUDGET_MS", 1000))
+
+    entry_points = [
+        'modules',
+        'modules.data_fetcher',
+        'modules.data_fetcher_SIMPLE',
+        'modules.wacc',
+        'modules.valuation_engine',
+        'modules.monte_carlo',
+        'modules.bulk_ingest',
+        'modules.filing_refresh',
+        'batch_valuation',
+    ]
+
+    for module in entry_points:
+        ms, loaded, error = measure_import(module, cwd)
+        if error:
+            print_check(module, False, error)
+            all_passed = False
+            continue
+        eager = [p for p in lazy_packages if p in loaded]
+        ok = not eager and ms <= budget_ms
+        message = f"{ms:,.0f} ms"
+        if eager:
+            message += f" - imports {', '.join(eager)} eagerly"
+        elif ms > budget_ms:
+            message += f" - over {budget_ms:,.0f} ms budget"
+        print_check(module, ok, message)
+        all_passed = all_passed and ok
+
     # =========================================================================
     # FINAL RESULT
     # =========================================================================